@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_HOST: str = "mensa_chroma"
     CHROMA_PORT: int = 8000
+    # "http" talks to the Chroma server; "embedded" opens CHROMA_PERSIST_DIR in-process
+    # (single-node deployments with the Chroma volume mounted and the server stopped).
+    CHROMA_MODE: str = "http"
+    CHROMA_PERSIST_DIR: str = "/chroma/chroma"
 
     # Production: comma-separated origins, e.g. https://mensa.example.com
     CORS_ALLOWED_ORIGINS: str | None = None
@@ -212,14 +216,19 @@ GAME_PREDICTION_FORMATS = {
     },
 }
 
+# Draw schedule per game. Weekdays use datetime.weekday() (0 = Monday);
+# `draw_times` are local times (PREDICTION_TIMEZONE, New York) of each draw
+# of a draw day, used by the ingest poller. `rolling` games draw continuously.
 GAME_PREDICTION_SCHEDULES = {
     "take5": {
         "daily_draws": 2,
         "weekday_draws": {},
+        "draw_times": ["14:30", "22:30"],
     },
     "pick3": {
         "daily_draws": 2,
         "weekday_draws": {},
+        "draw_times": ["14:30", "22:30"],
     },
     "powerball": {
         "daily_draws": 0,
@@ -228,6 +237,7 @@ GAME_PREDICTION_SCHEDULES = {
             2: 1,
             5: 1,
         },
+        "draw_times": ["22:59"],
     },
     "megamillions": {
         "daily_draws": 0,
@@ -235,19 +245,23 @@ GAME_PREDICTION_SCHEDULES = {
             1: 1,
             4: 1,
         },
+        "draw_times": ["23:00"],
     },
     "pick10": {
         "daily_draws": 1,
         "weekday_draws": {},
+        "draw_times": ["20:30"],
     },
     "cash4life": {
         "daily_draws": 1,
         "weekday_draws": {},
+        "draw_times": ["21:00"],
     },
     "quickdraw": {
         "daily_draws": 360,
         "suggestion_session_draws": 1,
         "weekday_draws": {},
+        "rolling": True,
     },
     "nylotto": {
         "daily_draws": 0,
@@ -255,6 +269,7 @@ GAME_PREDICTION_SCHEDULES = {
             2: 1,
             5: 1,
         },
+        "draw_times": ["20:15"],
     },
 }
 
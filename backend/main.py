@@ -33,11 +33,35 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Mensa Project backend starting up...")
     asyncio.create_task(_deferred_lm_audit())
+    try:
+        from state.manual_ingest_worker import resume_interrupted_ingests
+
+        resume_interrupted_ingests()
+    except Exception as exc:
+        print(f"⚠ Could not resume interrupted ingests: {exc}")
+    try:
+        from state.ingest_poller import ingest_poller
+
+        ingest_poller.start()
+    except Exception as exc:
+        print(f"⚠ Could not start ingest poller: {exc}")
     
     yield
     
     # Shutdown
     print("👋 Mensa Project backend shutting down...")
+    try:
+        from state.ingest_poller import ingest_poller
+
+        ingest_poller.stop()
+    except Exception:
+        pass
+    try:
+        from services.chroma_client import chroma_client
+
+        await chroma_client.aclose()
+    except Exception:
+        pass
 
 
 # Create FastAPI application
@@ -1,4 +1,4 @@
-"""Convert Chroma metadata or raw lists into Draw sequences."""
+"""Convert the local draw store, Chroma metadata or raw lists into Draw sequences."""
 
 from __future__ import annotations
 
@@ -7,6 +7,7 @@ from typing import Any
 
 from prediction.config.loader import game_rules_from_config
 from prediction.core.types import Draw, GameRules
+from utils.draw_numbers import COUNT_FIELD, typed_sequence
 
 
 def _parse_numbers(raw_value: Any) -> list[int]:
@@ -67,6 +68,16 @@ def metadata_to_draw(metadata: dict, game: str, draw_id: str | None = None) -> D
     """Parse one Chroma metadata record into a Draw."""
     _ensure_bonus_keys()
     rules = game_rules_from_config(game)
+    if COUNT_FIELD in (metadata or {}):
+        numbers = typed_sequence(metadata, {"primary_count": rules.primary_count})
+        if len(numbers) < rules.primary_count:
+            return None
+        return Draw(
+            primary=numbers[: rules.primary_count],
+            bonus=numbers[rules.primary_count :],
+            draw_id=draw_id,
+            metadata=dict(metadata),
+        )
     winning = _extract_primary_candidate(metadata)
     if not winning:
         return None
@@ -156,13 +167,49 @@ def draws_from_lists(rows: list[list[int]], game: str) -> list[Draw]:
     return draws
 
 
+def from_store(game: str, limit: int = 500) -> list[Draw] | None:
+    """Latest `limit` draws from the local draw store (oldest-first), or None when unavailable."""
+    from state.draw_store import load_draw_store
+
+    store = load_draw_store(game)
+    if store is None:
+        return None
+    numbers, dates, ids = store.read(limit)
+    primary_count = store.primary_count
+    draws: list[Draw] = []
+    for row, timestamp, draw_id in zip(numbers.tolist(), dates.tolist(), ids.tolist()):
+        draws.append(
+            Draw(
+                primary=row[:primary_count],
+                bonus=[value for value in row[primary_count:] if value >= 0],
+                draw_id=draw_id,
+                metadata={"draw_timestamp": timestamp},
+            )
+        )
+    return draws
+
+
 def from_chroma(game: str, limit: int = 500) -> list[Draw]:
-    """Load draw history from ChromaDB (newest first in DB, returned oldest-first)."""
+    """
+    Load the latest `limit` draws, oldest-first.
+
+    Served from the local draw store when available; otherwise metadata is
+    read from ChromaDB (by `draw_ordinal` range when the collection has
+    ordinals) and parsed here.
+    """
+    draws = from_store(game, limit=limit)
+    if draws is not None:
+        return draws
+
     from services.chroma_client import chroma_client
 
     collection = chroma_client.client.get_collection(game)
+    latest = chroma_client.get_latest_draws(game, limit, collection=collection)
+    if latest is not None:
+        metadatas, ids = latest
+        return draws_from_metadatas(metadatas, game, ids)
     data = collection.get(limit=limit, include=["metadatas"])
     metadatas = data.get("metadatas") or []
     ids = data.get("ids") or []
     draws = draws_from_metadatas(list(reversed(metadatas)), game, list(reversed(ids)))
-    return draws
\ No newline at end of file
+    return draws
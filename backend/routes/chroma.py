@@ -1,8 +1,6 @@
 """
 ChromaDB API routes.
 """
-import asyncio
-
 from fastapi import APIRouter
 from services.chroma_client import chroma_client
 
@@ -18,7 +16,7 @@ async def get_chroma_status():
     Returns ChromaDB connection status.
     """
     try:
-        status = await asyncio.to_thread(chroma_client.get_chroma_status)
+        status = await chroma_client.async_get_chroma_status()
         is_ok = status.get("status") == "ok"
         return {
             "status": "connected" if is_ok else "disconnected",
@@ -39,8 +37,7 @@ async def get_chroma_collections():
     try:
         from config import GAME_CONFIGS
         game_names = list(GAME_CONFIGS.keys())
-        snapshots = await asyncio.to_thread(
-            chroma_client.get_collections_snapshot,
+        snapshots = await chroma_client.async_get_collections_snapshot(
             game_names,
             CHROMA_QUERY_TIMEOUT,
         )
@@ -41,8 +41,7 @@ async def get_all_game_summaries(refresh: bool = False):
     game_names = list(GAME_CONFIGS.keys())
     try:
         snapshots = await asyncio.wait_for(
-            asyncio.to_thread(
-                chroma_client.get_collections_snapshot,
+            chroma_client.async_get_collections_snapshot(
                 game_names,
                 CHROMA_QUERY_TIMEOUT,
                 refresh,
@@ -74,7 +73,7 @@ async def get_game_summary(game: str):
     game_key = _require_game_key(game)
     try:
         draw_count = await asyncio.wait_for(
-            asyncio.to_thread(chroma_client.count_documents, game_key),
+            chroma_client.async_count_documents(game_key),
             timeout=CHROMA_QUERY_TIMEOUT,
         )
     except asyncio.TimeoutError:
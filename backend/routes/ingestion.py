@@ -6,7 +6,12 @@ import os
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from services.ingest import ingest_service
-from state.ingest_state import get_manual_ingest_state, enqueue_manual_ingest, set_manual_ingest_state
+from state.ingest_state import (
+    cancel_manual_ingest,
+    enqueue_manual_ingest,
+    get_manual_ingest_state,
+    set_manual_ingest_state,
+)
 from state.manual_ingest_worker import _start_manual_ingest_worker_if_needed
 from utils.validation import _require_game_key
 from typing import Optional
@@ -21,6 +26,10 @@ class IngestRequest(BaseModel):
     force: bool = False
 
 
+class CancelIngestRequest(BaseModel):
+    game: str
+
+
 def _fast_complete_populated_game(game_key: str) -> dict | None:
     """Return an immediate completed payload when data exists and force is off."""
     if os.getenv("INGEST_FAST_COMPLETE_POPULATED", "1") == "0":
@@ -66,9 +75,21 @@ async def trigger_ingestion(request: IngestRequest):
             if fast_result:
                 return fast_result
 
-        # Enqueue the ingestion job
-        seq = enqueue_manual_ingest(game_key, request.force)
-        
+        # Enqueue the ingestion job (duplicates merge into the queued/running one)
+        job = enqueue_manual_ingest(game_key, request.force)
+        seq = job["seq"]
+
+        if job["state"] == "running":
+            # Reported as "queued" so clients keep polling progress as for any accepted request.
+            return {
+                "status": "queued",
+                "game": game_key,
+                "sequence": seq,
+                "merged": True,
+                "running": True,
+                "message": f"Ingestion already running for {game_key}"
+            }
+
         # Start worker if needed
         _start_manual_ingest_worker_if_needed()
         
@@ -76,14 +97,20 @@ async def trigger_ingestion(request: IngestRequest):
         set_manual_ingest_state(game_key, {
             "status": "queued",
             "queued": True,
-            "seq": seq
+            "seq": seq,
+            "force": job["force"],
         })
         
         return {
             "status": "queued",
             "game": game_key,
             "sequence": seq,
-            "message": f"Ingestion queued for {game_key}"
+            "merged": job["merged"],
+            "force": job["force"],
+            "message": (
+                f"Ingestion already queued for {game_key}" if job["merged"]
+                else f"Ingestion queued for {game_key}"
+            )
         }
         
     except ValueError as e:
@@ -95,6 +122,55 @@ async def trigger_ingestion(request: IngestRequest):
         }
 
 
+@router.post("/api/ingest/cancel")
+async def cancel_ingestion(request: CancelIngestRequest):
+    """
+    Cancel a game's queued ingestion, or stop its running one at the next batch boundary.
+    """
+    try:
+        game_key = _require_game_key(request.game)
+        outcome = cancel_manual_ingest(game_key)
+        if outcome is None:
+            return {
+                "status": "not_running",
+                "game": game_key,
+                "message": f"No queued or running ingestion for {game_key}"
+            }
+
+        if outcome == "cancelled":
+            set_manual_ingest_state(game_key, {"status": "cancelled", "queued": False})
+            message = f"Queued ingestion cancelled for {game_key}"
+        else:
+            set_manual_ingest_state(game_key, {
+                **get_manual_ingest_state(game_key),
+                "cancel_requested": True,
+            })
+            message = f"Ingestion for {game_key} will stop after the current batch"
+        return {
+            "status": outcome,
+            "game": game_key,
+            "message": message
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+@router.get("/api/ingest/poller")
+async def get_ingest_poller_status():
+    """
+    Schedule-aware poller state: next draw, next attempt and last sync per game.
+    """
+    from state.ingest_poller import ingest_poller
+
+    return ingest_poller.status()
+
+
 @router.get("/api/ingest_progress")
 async def get_ingest_progress(game: str):
     """
@@ -167,7 +243,7 @@ async def get_ingest_stream(game: Optional[str] = None):
                         yield f"data: {serialized}\n\n"
                         yield f"event: progress\ndata: {serialized}\n\n"
 
-                        if status in ["completed", "error"]:
+                        if status in ["completed", "error", "cancelled"]:
                             yield f"event: complete\ndata: {serialized}\n\n"
                             break
 
@@ -14,6 +14,12 @@ from utils.training_params import extract_training_params, merge_training_params
 from utils.validation import _require_game_key
 from config import GAME_CONFIGS
 from services.chroma_client import chroma_client
+from state.training_jobs import (
+    cancel_training_job,
+    get_training_job,
+    list_training_jobs,
+    submit_training_job,
+)
 from utils.timestamps import normalize_experiment_record, runtime_timestamp_fields
 
 
@@ -32,6 +38,7 @@ class TrainingRequest(BaseModel):
     window_size: int = Field(default=3, ge=1, le=8)
     auto_tune: bool = True
     blend_step: float | None = Field(default=None, ge=0.01, le=0.5)
+    time_budget_s: float | None = Field(default=None, gt=0, le=86400)
 
     @field_validator("target_accuracy", mode="before")
     @classmethod
@@ -265,159 +272,187 @@ async def get_train_settings_by_path(game: str):
     return await get_train_settings(game=game)
 
 
-@router.post("/api/train")
-async def train_model(request: TrainingRequest):
+def _execute_training(
+    request: TrainingRequest,
+    game_key: str,
+    progress_callback=None,
+    cancel_event=None,
+) -> dict:
     """
-    Train a suggestion model for a specific game.
+    Train one game and record the experiment; blocking, shared by /api/train and training jobs.
+
+    Jobs (called with a progress callback or cancel event) train on their own
+    copy of the trainer, so a concurrent /api/train cannot reset their hooks,
+    budget or hyperparameters.
     """
-    try:
-        game_key = _require_game_key(request.game)
+    trainer = trainer_service
+    if progress_callback is not None or cancel_event is not None:
+        trainer = trainer_service._isolated_copy()
 
-        def _run_training():
-            if hasattr(trainer_service, "train"):
-                return trainer_service.train(
-                    game_key,
-                    target_accuracy=request.target_accuracy,
-                    max_iterations=request.max_iterations,
-                    train_size=request.train_size,
-                    n_estimators=request.n_estimators,
-                    max_depth=request.max_depth,
-                    random_state=request.random_state,
-                    blend_step=request.blend_step,
-                    window_size=request.window_size,
-                    auto_tune=request.auto_tune,
-                )
-            if hasattr(trainer_service, "train_model"):
-                trainer_service.configure_training(
-                    target_accuracy=request.target_accuracy,
-                    max_iterations=request.max_iterations,
-                    train_size=request.train_size,
-                    n_estimators=request.n_estimators,
-                    max_depth=request.max_depth,
-                    random_state=request.random_state,
-                    window_size=request.window_size,
-                    auto_tune=request.auto_tune,
-                    blend_step=request.blend_step,
-                )
-                return trainer_service.train_model(game_key)
-            raise RuntimeError("TrainerService is missing train/train_model methods")
-
-        result = await asyncio.to_thread(_run_training)
-
-        if result.get("status") == "error":
-            return {
-                "status": "error",
-                "game": game_key,
-                "message": result.get("message", "Training failed."),
-                "accuracy": result.get("highest_accuracy") or result.get("record_accuracy"),
-                "highest_accuracy": result.get("highest_accuracy"),
-                "record_accuracy": result.get("record_accuracy"),
-                "baseline_accuracy": result.get("baseline_accuracy"),
-                "candidate_accuracy": result.get("candidate_accuracy"),
-                "previous_accuracy": result.get("previous_accuracy"),
-                "training_target": result.get("training_target"),
-                "target_accuracy": result.get("target_accuracy"),
-                "retained_previous_model": result.get("retained_previous_model"),
-                "used_previous_training": result.get("used_previous_training"),
-                "training_time": result.get("training_time"),
-                "leaderboard": result.get("leaderboard", []),
-                "accuracy_history": result.get("accuracy_history", []),
-                "optimal_config_applied": result.get("optimal_config_applied", False),
-                "optimal_config": result.get("optimal_config", {}),
-            }
-
-        accuracy = (
-            result.get("highest_accuracy")
-            or result.get("record_accuracy")
-            or result.get("accuracy")
-        )
-        runtime_ts = runtime_timestamp_fields()
-        experiment_id = f"train-{game_key}-{runtime_ts['timestamp_seconds']}"
-        dataset = _dataset_snapshot(game_key)
-
-        scored_params = merge_training_params(
-            result.get("best_training_params"),
-            result.get("training_params"),
-            extract_training_params(request.model_dump()),
-            {
-                "train_size": result.get("train_size", request.train_size),
-                "validation_size": result.get("validation_size"),
-                "n_estimators": request.n_estimators,
-                "max_depth": request.max_depth,
-                "random_state": request.random_state,
-                "window_size": request.window_size,
-                "auto_tune": request.auto_tune,
-                "blend_step": request.blend_step,
-                "max_iterations": request.max_iterations,
-                "target_accuracy": result.get("target_accuracy", request.target_accuracy),
-                "training_target": result.get("training_target"),
-                "model_strategy": result.get("model_strategy"),
-                "blend_weight": result.get("blend_weight"),
-            },
-        )
-        exp_store.save_experiment(normalize_experiment_record({
-            "experiment_id": experiment_id,
+    def _run_training():
+        if hasattr(trainer, "train"):
+            return trainer.train(
+                game_key,
+                target_accuracy=request.target_accuracy,
+                max_iterations=request.max_iterations,
+                train_size=request.train_size,
+                n_estimators=request.n_estimators,
+                max_depth=request.max_depth,
+                random_state=request.random_state,
+                blend_step=request.blend_step,
+                window_size=request.window_size,
+                auto_tune=request.auto_tune,
+                time_budget_s=request.time_budget_s,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
+            )
+        if hasattr(trainer, "train_model"):
+            trainer.configure_training(
+                target_accuracy=request.target_accuracy,
+                max_iterations=request.max_iterations,
+                train_size=request.train_size,
+                n_estimators=request.n_estimators,
+                max_depth=request.max_depth,
+                random_state=request.random_state,
+                window_size=request.window_size,
+                auto_tune=request.auto_tune,
+                blend_step=request.blend_step,
+                time_budget_s=request.time_budget_s or 0,
+            )
+            return trainer.train_model(game_key)
+        raise RuntimeError("TrainerService is missing train/train_model methods")
+
+    result = _run_training()
+    if result.get("status") == "cancelled":
+        return {
+            "status": "cancelled",
             "game": game_key,
-            **runtime_ts,
-            "status": "COMPLETED",
-            "type": "training",
-            "target_accuracy": result.get("target_accuracy", request.target_accuracy),
-            "training_target": result.get("training_target"),
+            "message": result.get("message", "Training cancelled."),
+        }
+
+    if result.get("status") == "error":
+        return {
+            "status": "error",
+            "game": game_key,
+            "message": result.get("message", "Training failed."),
+            "accuracy": result.get("highest_accuracy") or result.get("record_accuracy"),
+            "highest_accuracy": result.get("highest_accuracy"),
+            "record_accuracy": result.get("record_accuracy"),
             "baseline_accuracy": result.get("baseline_accuracy"),
-            "final_accuracy": accuracy,
-            "highest_accuracy": result.get("highest_accuracy", accuracy),
-            "record_accuracy": result.get("record_accuracy", result.get("highest_accuracy", accuracy)),
-            "score": result.get("highest_accuracy", accuracy),
-            "accuracy": result.get("highest_accuracy", accuracy),
-            "iterations": result.get("attempts"),
-            "max_iterations": scored_params.get("max_iterations", request.max_iterations),
-            "training_time": result.get("training_time"),
-            "model_strategy": result.get("model_strategy"),
-            "blend_weight": result.get("blend_weight"),
             "candidate_accuracy": result.get("candidate_accuracy"),
             "previous_accuracy": result.get("previous_accuracy"),
+            "training_target": result.get("training_target"),
+            "target_accuracy": result.get("target_accuracy"),
             "retained_previous_model": result.get("retained_previous_model"),
             "used_previous_training": result.get("used_previous_training"),
-            "message": result.get("message"),
-            "train_size": scored_params.get("train_size", result.get("train_size", request.train_size)),
-            "validation_size": scored_params.get("validation_size", result.get("validation_size")),
-            "n_estimators": scored_params.get("n_estimators", request.n_estimators),
-            "max_depth": scored_params.get("max_depth", request.max_depth),
-            "random_state": scored_params.get("random_state", request.random_state),
-            "window_size": scored_params.get("window_size", request.window_size),
-            "auto_tune": scored_params.get("auto_tune", request.auto_tune),
-            "blend_step": scored_params.get("blend_step", request.blend_step),
-            "data_limit": scored_params.get("data_limit"),
-            "training_params": scored_params,
-            "best_training_params": result.get("best_training_params") or scored_params,
+            "training_time": result.get("training_time"),
             "leaderboard": result.get("leaderboard", []),
             "accuracy_history": result.get("accuracy_history", []),
             "optimal_config_applied": result.get("optimal_config_applied", False),
             "optimal_config": result.get("optimal_config", {}),
-            "record_count": dataset.get("record_count"),
-            "dataset_hash": dataset.get("dataset_hash"),
-        }))
+        }
 
-        return {
-            **result,
-            "status": "COMPLETED",
-            "game": game_key,
-            "experiment_id": experiment_id,
-            "record_count": dataset.get("record_count"),
-            "dataset_hash": dataset.get("dataset_hash"),
-            "training_data": _training_data_status(
+    accuracy = (
+        result.get("highest_accuracy")
+        or result.get("record_accuracy")
+        or result.get("accuracy")
+    )
+    runtime_ts = runtime_timestamp_fields()
+    experiment_id = f"train-{game_key}-{runtime_ts['timestamp_seconds']}"
+    dataset = _dataset_snapshot(game_key)
+
+    scored_params = merge_training_params(
+        result.get("best_training_params"),
+        result.get("training_params"),
+        extract_training_params(request.model_dump()),
+        {
+            "train_size": result.get("train_size", request.train_size),
+            "validation_size": result.get("validation_size"),
+            "n_estimators": request.n_estimators,
+            "max_depth": request.max_depth,
+            "random_state": request.random_state,
+            "window_size": request.window_size,
+            "auto_tune": request.auto_tune,
+            "blend_step": request.blend_step,
+            "max_iterations": request.max_iterations,
+            "target_accuracy": result.get("target_accuracy", request.target_accuracy),
+            "training_target": result.get("training_target"),
+            "model_strategy": result.get("model_strategy"),
+            "blend_weight": result.get("blend_weight"),
+        },
+    )
+    exp_store.save_experiment(normalize_experiment_record({
+        "experiment_id": experiment_id,
+        "game": game_key,
+        **runtime_ts,
+        "status": "COMPLETED",
+        "type": "training",
+        "target_accuracy": result.get("target_accuracy", request.target_accuracy),
+        "training_target": result.get("training_target"),
+        "baseline_accuracy": result.get("baseline_accuracy"),
+        "final_accuracy": accuracy,
+        "highest_accuracy": result.get("highest_accuracy", accuracy),
+        "record_accuracy": result.get("record_accuracy", result.get("highest_accuracy", accuracy)),
+        "score": result.get("highest_accuracy", accuracy),
+        "accuracy": result.get("highest_accuracy", accuracy),
+        "iterations": result.get("attempts"),
+        "max_iterations": scored_params.get("max_iterations", request.max_iterations),
+        "training_time": result.get("training_time"),
+        "model_strategy": result.get("model_strategy"),
+        "blend_weight": result.get("blend_weight"),
+        "candidate_accuracy": result.get("candidate_accuracy"),
+        "previous_accuracy": result.get("previous_accuracy"),
+        "retained_previous_model": result.get("retained_previous_model"),
+        "used_previous_training": result.get("used_previous_training"),
+        "message": result.get("message"),
+        "train_size": scored_params.get("train_size", result.get("train_size", request.train_size)),
+        "validation_size": scored_params.get("validation_size", result.get("validation_size")),
+        "n_estimators": scored_params.get("n_estimators", request.n_estimators),
+        "max_depth": scored_params.get("max_depth", request.max_depth),
+        "random_state": scored_params.get("random_state", request.random_state),
+        "window_size": scored_params.get("window_size", request.window_size),
+        "auto_tune": scored_params.get("auto_tune", request.auto_tune),
+        "blend_step": scored_params.get("blend_step", request.blend_step),
+        "data_limit": scored_params.get("data_limit"),
+        "training_params": scored_params,
+        "best_training_params": result.get("best_training_params") or scored_params,
+        "leaderboard": result.get("leaderboard", []),
+        "accuracy_history": result.get("accuracy_history", []),
+        "optimal_config_applied": result.get("optimal_config_applied", False),
+        "optimal_config": result.get("optimal_config", {}),
+        "record_count": dataset.get("record_count"),
+        "dataset_hash": dataset.get("dataset_hash"),
+    }))
+
+    return {
+        **result,
+        "status": "COMPLETED",
+        "game": game_key,
+        "experiment_id": experiment_id,
+        "record_count": dataset.get("record_count"),
+        "dataset_hash": dataset.get("dataset_hash"),
+        "training_data": _training_data_status(
+            game_key,
+            incremental=trainer_service.get_incremental_training_context(
                 game_key,
-                incremental=trainer_service.get_incremental_training_context(
-                    game_key,
-                    requested_target=result.get("target_accuracy", request.target_accuracy),
-                ),
+                requested_target=result.get("target_accuracy", request.target_accuracy),
             ),
-            "score": accuracy,
-            "accuracy": accuracy,
-            "highest_accuracy": result.get("highest_accuracy", accuracy),
-            "record_accuracy": result.get("record_accuracy", accuracy),
-        }
+        ),
+        "score": accuracy,
+        "accuracy": accuracy,
+        "highest_accuracy": result.get("highest_accuracy", accuracy),
+        "record_accuracy": result.get("record_accuracy", accuracy),
+    }
+
 
+@router.post("/api/train")
+async def train_model(request: TrainingRequest):
+    """
+    Train a suggestion model for a specific game.
+    """
+    try:
+        game_key = _require_game_key(request.game)
+        return await asyncio.to_thread(_execute_training, request, game_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -428,6 +463,105 @@ async def train_model(request: TrainingRequest):
         }
 
 
+@router.post("/api/train/jobs")
+async def submit_training(request: TrainingRequest):
+    """
+    Start training in the background and return its job id at once.
+
+    Follow it with GET /api/train/jobs/{job_id}/stream (server-sent events) or
+    poll GET /api/train/jobs/{job_id}.
+    """
+    try:
+        game_key = _require_game_key(request.game)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def _run(progress_callback, cancel_event):
+        return _execute_training(request, game_key, progress_callback, cancel_event)
+
+    job = submit_training_job(game_key, _run, params=request.model_dump())
+    return {"status": "queued", "job_id": job["job_id"], "game": game_key, "job": job}
+
+
+@router.get("/api/train/jobs")
+async def get_training_jobs(game: str = None):
+    try:
+        game_key = _require_game_key(game) if game else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"jobs": list_training_jobs(game_key)}
+
+
+@router.get("/api/train/jobs/{job_id}")
+async def get_training_job_status(job_id: str):
+    job = get_training_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+    return job
+
+
+@router.get("/api/train/jobs/{job_id}/stream")
+async def get_training_job_stream(job_id: str):
+    """
+    Server-sent events stream for a training job: phase, attempt, best accuracy and ETA.
+    """
+    from fastapi.responses import StreamingResponse
+
+    if get_training_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+
+    async def job_event_stream():
+        while True:
+            job = get_training_job(job_id)
+            if job is None:
+                break
+            status = job.get("status")
+            if status not in ("completed", "error", "cancelled"):
+                job.pop("result", None)
+            serialized = json.dumps(job, default=str)
+            yield f"data: {serialized}\n\n"
+            yield f"event: progress\ndata: {serialized}\n\n"
+
+            if status in ("completed", "error", "cancelled"):
+                yield f"event: complete\ndata: {serialized}\n\n"
+                break
+
+            await asyncio.sleep(1)
+
+    return StreamingResponse(
+        job_event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
+    )
+
+
+@router.post("/api/train/jobs/{job_id}/cancel")
+async def cancel_training(job_id: str):
+    """
+    Stop a training job at its next attempt boundary; the best candidate so far is kept.
+    """
+    outcome = cancel_training_job(job_id)
+    if outcome == "not_found":
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+    if outcome == "finished":
+        job = get_training_job(job_id) or {}
+        return {
+            "status": job.get("status"),
+            "job_id": job_id,
+            "cancel_requested": False,
+            "message": f"Training job {job_id} already finished",
+        }
+    return {
+        "status": "cancelling",
+        "job_id": job_id,
+        "cancel_requested": True,
+        "message": f"Training job {job_id} will stop at its next attempt",
+    }
+
+
 @router.post("/api/train_all")
 async def train_all_models(request: TrainAllRequest):
     try:
@@ -446,13 +580,19 @@ async def train_all_models(request: TrainAllRequest):
         if request.games:
             game_keys = [_require_game_key(game) for game in request.games]
 
-        results = await asyncio.to_thread(trainer_service.train_all_games, game_keys)
+        report = await asyncio.to_thread(trainer_service.train_all_games, game_keys)
+        results = report["results"]
         completed = [item for item in results if str(item.get("status", "")).lower() in ("success", "completed")]
         return {
             "status": "COMPLETED",
             "trained": len(completed),
             "total": len(results),
             "results": results,
+            "finish_order": report["finish_order"],
+            "workers": report["workers"],
+            "wall_time_s": report["wall_time_s"],
+            "cpu_time_s": report["cpu_time_s"],
+            "parallelism": report["parallelism"],
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Migrate stored draws to typed number fields (n1..nK, bonus1.., draw_ordinal).
+
+Usage: python scripts/backfill_draw_fields.py [game ...] [--workers N] [--page-size N]
+Without games every configured game is migrated.
+"""
+import argparse
+import json
+
+from config import GAME_CONFIGS
+from services.draw_fields_backfill import backfill_draw_fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("games", nargs="*", default=list(GAME_CONFIGS.keys()))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--page-size", type=int, default=None)
+    args = parser.parse_args()
+
+    for game in args.games:
+        try:
+            result = backfill_draw_fields(game, page_size=args.page_size, workers=args.workers)
+            print('RESULT', json.dumps(result, ensure_ascii=False), flush=True)
+        except Exception as e:
+            print('ERROR', game, str(e), flush=True)
+
+
+if __name__ == '__main__':
+    main()
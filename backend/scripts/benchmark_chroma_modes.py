@@ -0,0 +1,96 @@
+"""
+Compare Chroma read latency over HTTP and with the embedded persistent client.
+
+Usage: python scripts/benchmark_chroma_modes.py [game ...] [--mode http|embedded] [--repeat N] [--limit N]
+Times the trainer's history read (`TrainerService._load_sequences`) and
+`draw_loader.from_chroma` in one mode, with the local draw store disabled so
+every read goes to Chroma. The two modes need opposite server states, so
+compare them with two runs:
+
+    python scripts/benchmark_chroma_modes.py --mode http      # Chroma server running
+    python scripts/benchmark_chroma_modes.py --mode embedded  # Chroma server stopped
+
+Embedded mode opens CHROMA_PERSIST_DIR directly and refuses to run while the
+server answers its heartbeat, since the server may be writing to that volume.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+os.environ["DRAW_STORE"] = "0"
+
+from config import GAME_CONFIGS
+from prediction.core import draw_loader
+from services import chroma_client as chroma_module
+from services.trainer import TrainerService
+
+
+def _time_call(fn, repeat: int) -> tuple[float, int]:
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+        rows = len(result or [])
+    return statistics.median(timings), rows
+
+
+def _server_running(client) -> bool:
+    try:
+        return requests.get(f"{client.rest_base}/api/v1/heartbeat", timeout=2).ok
+    except requests.RequestException:
+        return False
+
+
+def benchmark(game: str, mode: str, repeat: int, limit: int) -> dict:
+    client = chroma_module.ChromaClient(mode=mode)
+    # Trainer and draw loader import the module-level client at call time.
+    chroma_module.chroma_client = client
+    trainer = TrainerService()
+    trainer.data_limit = 0
+
+    load_s, load_rows = _time_call(lambda: trainer._load_sequences(game), repeat)
+    chroma_s, chroma_rows = _time_call(lambda: draw_loader.from_chroma(game, limit=limit), repeat)
+    return {
+        "game": game,
+        "mode": mode,
+        "load_sequences_s": round(load_s, 4),
+        "load_sequences_rows": load_rows,
+        "from_chroma_s": round(chroma_s, 4),
+        "from_chroma_rows": chroma_rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("games", nargs="*", default=list(GAME_CONFIGS.keys()))
+    parser.add_argument("--mode", choices=("http", "embedded"), default="http")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.mode == "embedded" and _server_running(chroma_module.chroma_client):
+        print("ERROR embedded mode needs the Chroma server stopped; it answers at "
+              f"{chroma_module.chroma_client.rest_base}", flush=True)
+        sys.exit(2)
+
+    original = chroma_module.chroma_client
+    try:
+        for game in args.games:
+            try:
+                result = benchmark(game, args.mode, max(1, args.repeat), args.limit)
+                print('RESULT', json.dumps(result, ensure_ascii=False), flush=True)
+            except Exception as e:
+                print('ERROR', args.mode, game, str(e), flush=True)
+    finally:
+        chroma_module.chroma_client = original
+
+
+if __name__ == '__main__':
+    main()
@@ -1,60 +1,230 @@
+"""
+Chroma access for counts, the collection catalog and draw reads.
+
+REST count and catalog calls share one pooled keep-alive `requests.Session`
+and are collapsed per key by a single-flight: concurrent callers asking for
+the same collection's count (or the catalog) wait for one in-flight request
+instead of queueing behind a process-wide lock, and different collections
+are counted in parallel. The `async_*` methods do the same over a pooled
+aiohttp session so FastAPI handlers can await them without a worker thread.
+
+With `CHROMA_MODE=embedded` the client is a `chromadb.PersistentClient` on
+the Chroma data directory instead: reads skip HTTP serialization entirely and
+counts/catalog lookups go through the SDK.
+"""
+import asyncio
+import math
+import os
 import threading
 import time
 
+import aiohttp
 import chromadb
 import requests
 from chromadb.config import Settings
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from requests.adapters import HTTPAdapter
 
 from config import settings
+from services.embedding_service import shared_embedding_function
 from state.draw_counts import get_all_draw_counts, get_draw_count, set_draw_count
+from state.ingest_watermarks import get_draw_ordinals
+from utils.draw_numbers import ORDINAL_DAY, ORDINAL_FIELD, draws_per_day
 
 CHROMA_REST_TIMEOUT = 4.0
-CHROMA_COUNT_WORKERS = 1
-CHROMA_REST_LOCK = threading.Lock()
+CHROMA_CATALOG_TTL = 30.0
+CATALOG_KEY = "*catalog"
 
 
-class ChromaClient:
+class _Call:
     def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class _SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._tasks: dict[str, asyncio.Future] = {}
+
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(self, key: str, factory):
+        task = self._tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._tasks.pop(key, None) if self._tasks.get(key) is done else None)
+        # A caller that times out or is cancelled must not cancel the shared request.
+        return await asyncio.shield(task)
+
+
+class ChromaClient:
+    def __init__(self, mode: str | None = None):
+        self.mode = str(mode or settings.CHROMA_MODE or "http").strip().lower()
+        if self.mode not in ("http", "embedded"):
+            print(f"⚠ Unknown CHROMA_MODE={self.mode!r}; using http")
+            self.mode = "http"
         self._client = None
         self._collection_ids: dict[str, str] = {}
         self._collection_names: set[str] = set()
         self._catalog_loaded_at = 0.0
+        self.rest_pool_size = max(1, int(os.getenv("CHROMA_REST_POOL_SIZE", "16")))
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._async_session: aiohttp.ClientSession | None = None
+        self._async_loop = None
+        self._flights = _SingleFlight()
 
     @property
     def rest_base(self) -> str:
         return f"http://{settings.CHROMA_HOST}:{settings.CHROMA_PORT}"
 
+    @property
+    def embedded(self) -> bool:
+        return self.mode == "embedded"
+
     @property
     def client(self):
         if self._client is None:
-            self._client = chromadb.HttpClient(
-                host=settings.CHROMA_HOST,
-                port=settings.CHROMA_PORT,
-                settings=Settings(anonymized_telemetry=False),
-            )
+            if self.embedded:
+                self._client = chromadb.PersistentClient(
+                    path=settings.CHROMA_PERSIST_DIR,
+                    settings=Settings(anonymized_telemetry=False),
+                )
+            else:
+                self._client = chromadb.HttpClient(
+                    host=settings.CHROMA_HOST,
+                    port=settings.CHROMA_PORT,
+                    settings=Settings(anonymized_telemetry=False),
+                )
         return self._client
 
-    def _refresh_collection_catalog(self, timeout_seconds: float = CHROMA_REST_TIMEOUT, force: bool = False) -> None:
-        now = time.time()
-        if not force and self._collection_ids and (now - self._catalog_loaded_at) < 30:
-            return
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.rest_pool_size,
+                        max_retries=0,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
 
-        with CHROMA_REST_LOCK:
-            response = requests.get(
-                f"{self.rest_base}/api/v1/collections",
-                timeout=timeout_seconds,
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions are bound to the loop that created them.
+        loop = asyncio.get_running_loop()
+        session = self._async_session
+        if session is None or session.closed or self._async_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.rest_pool_size, keepalive_timeout=30),
             )
+            self._async_session = session
+            self._async_loop = loop
+        return session
+
+    async def aclose(self) -> None:
+        session, self._async_session = self._async_session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _rest_get(self, path: str, timeout_seconds: float):
+        response = self.session.get(f"{self.rest_base}{path}", timeout=timeout_seconds)
+        response.raise_for_status()
+        return response.json()
+
+    async def _async_rest_get(self, path: str, timeout_seconds: float):
+        timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        async with self._get_async_session().get(f"{self.rest_base}{path}", timeout=timeout) as response:
             response.raise_for_status()
-            payload = response.json()
-            ids = {
-                item["name"]: item["id"]
-                for item in payload
-                if item.get("name") and item.get("id")
-            }
-            self._collection_ids = ids
-            self._collection_names = set(ids.keys())
-            self._catalog_loaded_at = time.time()
+            return await response.json(content_type=None)
+
+    def _fetch_catalog(self, timeout_seconds: float):
+        if self.embedded:
+            return [{"name": item.name, "id": str(item.id)} for item in self.client.list_collections()]
+        return self._rest_get("/api/v1/collections", timeout_seconds)
+
+    async def _async_fetch_catalog(self, timeout_seconds: float):
+        if self.embedded:
+            return await asyncio.to_thread(self._fetch_catalog, timeout_seconds)
+        return await self._async_rest_get("/api/v1/collections", timeout_seconds)
+
+    def _fetch_count(self, collection_name: str, collection_id: str, timeout_seconds: float) -> int:
+        if self.embedded:
+            return int(self.client.get_collection(collection_name).count() or 0)
+        return self._parse_count(self._rest_get(f"/api/v1/collections/{collection_id}/count", timeout_seconds))
+
+    async def _async_fetch_count(self, collection_name: str, collection_id: str, timeout_seconds: float) -> int:
+        if self.embedded:
+            return await asyncio.to_thread(self._fetch_count, collection_name, collection_id, timeout_seconds)
+        return self._parse_count(
+            await self._async_rest_get(f"/api/v1/collections/{collection_id}/count", timeout_seconds)
+        )
+
+    def _catalog_fresh(self) -> bool:
+        return bool(self._collection_ids) and (time.time() - self._catalog_loaded_at) < CHROMA_CATALOG_TTL
+
+    def _store_catalog(self, payload) -> None:
+        ids = {
+            item["name"]: item["id"]
+            for item in payload
+            if item.get("name") and item.get("id")
+        }
+        self._collection_ids = ids
+        self._collection_names = set(ids.keys())
+        self._catalog_loaded_at = time.time()
+
+    @staticmethod
+    def _parse_count(payload) -> int:
+        if isinstance(payload, dict):
+            return int(payload.get("count") or 0)
+        return int(payload or 0)
+
+    def _refresh_collection_catalog(self, timeout_seconds: float = CHROMA_REST_TIMEOUT, force: bool = False) -> None:
+        if not force and self._catalog_fresh():
+            return
+        self._flights.do(
+            CATALOG_KEY,
+            lambda: self._store_catalog(self._fetch_catalog(timeout_seconds)),
+        )
+
+    async def _async_refresh_collection_catalog(self, timeout_seconds: float = CHROMA_REST_TIMEOUT,
+                                                force: bool = False) -> None:
+        if not force and self._catalog_fresh():
+            return
+
+        async def fetch():
+            self._store_catalog(await self._async_fetch_catalog(timeout_seconds))
+
+        await self._flights.do_async(CATALOG_KEY, fetch)
 
     def collection_exists(self, collection_name: str, timeout_seconds: float = CHROMA_REST_TIMEOUT) -> bool:
         try:
@@ -64,24 +234,39 @@ class ChromaClient:
             print(f"Error checking collection existence for {collection_name}: {exc}")
             return False
 
+    async def async_collection_exists(self, collection_name: str,
+                                      timeout_seconds: float = CHROMA_REST_TIMEOUT) -> bool:
+        try:
+            await self._async_refresh_collection_catalog(timeout_seconds=timeout_seconds)
+            return collection_name in self._collection_names
+        except Exception as exc:
+            print(f"Error checking collection existence for {collection_name}: {exc}")
+            return False
+
     def _rest_count(self, collection_name: str, timeout_seconds: float = CHROMA_REST_TIMEOUT) -> int:
-        with CHROMA_REST_LOCK:
+        collection_id = self._collection_ids.get(collection_name)
+        if not collection_id:
+            self._refresh_collection_catalog(timeout_seconds=timeout_seconds, force=True)
             collection_id = self._collection_ids.get(collection_name)
-            if not collection_id:
-                self._refresh_collection_catalog(timeout_seconds=timeout_seconds, force=True)
-                collection_id = self._collection_ids.get(collection_name)
-            if not collection_id:
-                return 0
-
-            response = requests.get(
-                f"{self.rest_base}/api/v1/collections/{collection_id}/count",
-                timeout=timeout_seconds,
-            )
-            response.raise_for_status()
-            payload = response.json()
-            if isinstance(payload, dict):
-                return int(payload.get("count") or 0)
-            return int(payload or 0)
+        if not collection_id:
+            return 0
+        return self._flights.do(
+            f"count:{collection_name}",
+            lambda: self._fetch_count(collection_name, collection_id, timeout_seconds),
+        )
+
+    async def _async_rest_count(self, collection_name: str, timeout_seconds: float = CHROMA_REST_TIMEOUT) -> int:
+        collection_id = self._collection_ids.get(collection_name)
+        if not collection_id:
+            await self._async_refresh_collection_catalog(timeout_seconds=timeout_seconds, force=True)
+            collection_id = self._collection_ids.get(collection_name)
+        if not collection_id:
+            return 0
+
+        async def fetch():
+            return await self._async_fetch_count(collection_name, collection_id, timeout_seconds)
+
+        return await self._flights.do_async(f"count:{collection_name}", fetch)
 
     def _sdk_count(self, collection_name: str) -> int:
         try:
@@ -98,28 +283,85 @@ class ChromaClient:
             print(f"REST count failed for {collection_name}: {exc}")
             return self._sdk_count(collection_name)
 
+    async def _async_live_count(self, collection_name: str, timeout_seconds: float = CHROMA_REST_TIMEOUT) -> int:
+        try:
+            return await self._async_rest_count(collection_name, timeout_seconds=timeout_seconds)
+        except Exception as exc:
+            print(f"REST count failed for {collection_name}: {exc}")
+            return await asyncio.to_thread(self._sdk_count, collection_name)
+
     def get_chroma_status(self):
         try:
             self.client.heartbeat()
-            return {"status": "ok"}
+            return {"status": "ok", "mode": self.mode} if self.embedded else {"status": "ok"}
         except Exception as e:
+            if self.embedded:
+                return {"status": "error", "mode": self.mode, "message": str(e)}
             try:
                 url = f"{self.rest_base}/api/v1/pre-flight-checks"
-                response = requests.get(url, timeout=3)
+                response = self.session.get(url, timeout=3)
                 if response.status_code == 200:
                     return {"status": "ok", "http_status": response.status_code}
                 return {"status": "error", "message": f"http_status={response.status_code}", "body": response.text[:200]}
             except Exception as http_exc:
                 return {"status": "error", "message": str(e), "http_error": str(http_exc)}
 
+    async def async_get_chroma_status(self):
+        if self.embedded:
+            return await asyncio.to_thread(self.get_chroma_status)
+        try:
+            await self._async_rest_get("/api/v1/heartbeat", 3)
+            return {"status": "ok"}
+        except Exception as e:
+            try:
+                timeout = aiohttp.ClientTimeout(total=3)
+                url = f"{self.rest_base}/api/v1/pre-flight-checks"
+                async with self._get_async_session().get(url, timeout=timeout) as response:
+                    if response.status == 200:
+                        return {"status": "ok", "http_status": response.status}
+                    body = await response.text()
+                    return {"status": "error", "message": f"http_status={response.status}", "body": body[:200]}
+            except Exception as http_exc:
+                return {"status": "error", "message": str(e), "http_error": str(http_exc)}
+
     def list_collections(self):
         return self.client.list_collections()
 
     def get_collection(self, collection_name: str):
-        return self.client.get_collection(collection_name)
+        return self.client.get_collection(collection_name, embedding_function=shared_embedding_function)
 
     def get_or_create_collection(self, collection_name: str):
-        return self.client.get_or_create_collection(collection_name)
+        return self.client.get_or_create_collection(collection_name, embedding_function=shared_embedding_function)
+
+    def get_latest_draws(self, game: str, limit: int, collection=None) -> tuple[list[dict], list[str]] | None:
+        """
+        (metadatas, ids) of the newest `limit` draws, oldest first.
+
+        Issues `draw_ordinal >= lower` range queries below the game's ordinal
+        high-water mark, starting from a window sized by its draw schedule and
+        doubling it until `limit` rows are found or the window covers the
+        lowest stored ordinal. Returns None when the collection's rows do not
+        all carry ordinals; callers then fall back to a full read.
+        """
+        ordinals = get_draw_ordinals(game)
+        if not ordinals["complete"] or ordinals["max"] is None:
+            return None
+        collection = collection if collection is not None else self.client.get_collection(game)
+        high_day = int(ordinals["max"]) // ORDINAL_DAY
+        low = int(ordinals["min"]) if ordinals["min"] is not None else int(ordinals["max"])
+        days = math.ceil(max(1, int(limit)) / draws_per_day(game)) + 1
+        while True:
+            lower = (high_day - days) * ORDINAL_DAY
+            page = collection.get(where={ORDINAL_FIELD: {"$gte": lower}}, include=["metadatas"])
+            ids = page.get("ids") or []
+            if len(ids) >= limit or lower <= low:
+                break
+            days *= 2
+        rows = sorted(
+            zip(page.get("metadatas") or [], ids),
+            key=lambda row: (row[0] or {}).get(ORDINAL_FIELD, 0),
+        )[-limit:]
+        return [meta for meta, _ in rows], [record_id for _, record_id in rows]
 
     def count_documents(
         self,
@@ -144,15 +386,32 @@ class ChromaClient:
             print(f"Error counting documents for {collection_name}: {exc}")
             return get_draw_count(collection_name, default=0)
 
-    def get_collections_snapshot(
+    async def async_count_documents(
         self,
-        collection_names: list[str],
-        timeout_seconds: float = 10.0,
-        refresh: bool = False,
-    ) -> list[dict]:
-        cached_counts = get_all_draw_counts(collection_names)
-        snapshots: list[dict] = []
+        collection_name: str,
+        timeout_seconds: float = CHROMA_REST_TIMEOUT,
+        *,
+        allow_refresh: bool = True,
+    ) -> int:
+        cached = get_draw_count(collection_name, default=-1)
+        if cached >= 0:
+            return cached
+
+        if not allow_refresh:
+            return 0
+
+        try:
+            count = await self._async_live_count(collection_name, timeout_seconds=timeout_seconds)
+            if count > 0:
+                set_draw_count(collection_name, count)
+            return count
+        except Exception as exc:
+            print(f"Error counting documents for {collection_name}: {exc}")
+            return get_draw_count(collection_name, default=0)
 
+    @staticmethod
+    def _initial_snapshots(collection_names: list[str], cached_counts: dict) -> list[dict]:
+        snapshots: list[dict] = []
         for idx, name in enumerate(collection_names, start=1):
             count = int(cached_counts.get(name, 0))
             state = "cached" if name in cached_counts else "unknown"
@@ -165,34 +424,83 @@ class ChromaClient:
                     "state": state,
                 }
             )
+        return snapshots
 
-        try:
-            self._refresh_collection_catalog(timeout_seconds=min(timeout_seconds, CHROMA_REST_TIMEOUT))
-        except Exception as exc:
-            print(f"Error listing Chroma collections: {exc}")
-            return snapshots
-
+    def _snapshots_to_count(self, snapshots: list[dict], refresh: bool) -> list[dict]:
+        """Mark snapshots against the catalog and return the ones needing a live count."""
+        pending = []
         for snapshot in snapshots:
-            name = snapshot["name"]
-            if name not in self._collection_names:
+            if snapshot["name"] not in self._collection_names:
                 if snapshot["state"] == "unknown":
                     snapshot["state"] = "empty"
                 continue
             if snapshot["state"] == "unknown":
                 snapshot["state"] = "exists"
             if refresh or (snapshot["state"] == "exists" and snapshot["count"] <= 0):
-                live_count = self._live_count(name, timeout_seconds=min(timeout_seconds, CHROMA_REST_TIMEOUT))
-                if live_count > 0:
-                    snapshot["count"] = int(live_count)
-                    snapshot["state"] = "refreshed"
-                    set_draw_count(name, live_count)
-                elif int(cached_counts.get(name, 0)) > 0:
-                    snapshot["count"] = int(cached_counts[name])
-                    snapshot["state"] = "cached"
-                else:
-                    snapshot["count"] = 0
-                    snapshot["state"] = "refreshed"
+                pending.append(snapshot)
+        return pending
+
+    @staticmethod
+    def _apply_live_count(snapshot: dict, live_count: int, cached_counts: dict) -> None:
+        name = snapshot["name"]
+        if live_count > 0:
+            snapshot["count"] = int(live_count)
+            snapshot["state"] = "refreshed"
+            set_draw_count(name, live_count)
+        elif int(cached_counts.get(name, 0)) > 0:
+            snapshot["count"] = int(cached_counts[name])
+            snapshot["state"] = "cached"
+        else:
+            snapshot["count"] = 0
+            snapshot["state"] = "refreshed"
+
+    def get_collections_snapshot(
+        self,
+        collection_names: list[str],
+        timeout_seconds: float = 10.0,
+        refresh: bool = False,
+    ) -> list[dict]:
+        cached_counts = get_all_draw_counts(collection_names)
+        snapshots = self._initial_snapshots(collection_names, cached_counts)
+
+        rest_timeout = min(timeout_seconds, CHROMA_REST_TIMEOUT)
+        try:
+            self._refresh_collection_catalog(timeout_seconds=rest_timeout)
+        except Exception as exc:
+            print(f"Error listing Chroma collections: {exc}")
+            return snapshots
+
+        for snapshot in self._snapshots_to_count(snapshots, refresh):
+            live_count = self._live_count(snapshot["name"], timeout_seconds=rest_timeout)
+            self._apply_live_count(snapshot, live_count, cached_counts)
 
         return snapshots
 
-chroma_client = ChromaClient()
\ No newline at end of file
+    async def async_get_collections_snapshot(
+        self,
+        collection_names: list[str],
+        timeout_seconds: float = 10.0,
+        refresh: bool = False,
+    ) -> list[dict]:
+        """`get_collections_snapshot` for the event loop; live counts run concurrently."""
+        cached_counts = get_all_draw_counts(collection_names)
+        snapshots = self._initial_snapshots(collection_names, cached_counts)
+
+        rest_timeout = min(timeout_seconds, CHROMA_REST_TIMEOUT)
+        try:
+            await self._async_refresh_collection_catalog(timeout_seconds=rest_timeout)
+        except Exception as exc:
+            print(f"Error listing Chroma collections: {exc}")
+            return snapshots
+
+        pending = self._snapshots_to_count(snapshots, refresh)
+        live_counts = await asyncio.gather(
+            *(self._async_live_count(snapshot["name"], timeout_seconds=rest_timeout) for snapshot in pending)
+        )
+        for snapshot, live_count in zip(pending, live_counts):
+            self._apply_live_count(snapshot, live_count, cached_counts)
+
+        return snapshots
+
+
+chroma_client = ChromaClient()
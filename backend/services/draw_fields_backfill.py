@@ -0,0 +1,90 @@
+"""
+Bulk migration of stored draws to typed number fields.
+
+Records ingested before typed fields existed are re-parsed from strings on
+every read and carry no `draw_ordinal` for range queries. The backfill pages
+through a collection on a thread pool, computes `typed_fields` for records
+that lack them and writes just those keys back with `collection.update`
+(documents and embeddings are untouched). Once every page has been migrated
+the collection's ordinal range is recorded and marked complete, which enables
+`ChromaClient.get_latest_draws`.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from state.ingest_watermarks import update_draw_ordinals
+from utils.draw_numbers import COUNT_FIELD, ORDINAL_FIELD, game_rules, typed_fields
+
+
+def backfill_draw_fields(game: str, collection=None, *, page_size: int | None = None,
+                         workers: int | None = None) -> dict:
+    """Add typed fields to every record of `game` that lacks them. Returns a summary dict."""
+    page_size = max(1, page_size or int(os.getenv("DRAW_FIELDS_BACKFILL_PAGE", "2000")))
+    workers = max(1, workers or int(os.getenv("DRAW_FIELDS_BACKFILL_WORKERS", "4")))
+    if collection is None:
+        from .chroma_client import chroma_client
+
+        collection = chroma_client.client.get_collection(game)
+    rules = game_rules(game)
+    total = int(collection.count() or 0)
+    started = time.perf_counter()
+
+    def migrate(offset: int) -> dict:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        ids = page.get("ids") or []
+        ordinals = []
+        pending_ids, pending_fields = [], []
+        for record_id, meta in zip(ids, page.get("metadatas") or []):
+            meta = meta or {}
+            fields = {ORDINAL_FIELD: meta.get(ORDINAL_FIELD)} if COUNT_FIELD in meta else typed_fields(meta, game, rules)
+            if any(meta.get(key) != value for key, value in fields.items()):
+                pending_ids.append(record_id)
+                pending_fields.append(fields)
+            if fields.get(ORDINAL_FIELD) is not None:
+                ordinals.append(int(fields[ORDINAL_FIELD]))
+        if pending_ids:
+            collection.update(ids=pending_ids, metadatas=pending_fields)
+        return {
+            "scanned": len(ids),
+            "updated": len(pending_ids),
+            "ordinals": (min(ordinals), max(ordinals)) if ordinals else None,
+        }
+
+    scanned = updated = failed = 0
+    low = high = None
+    offsets = list(range(0, total, page_size))
+    with ThreadPoolExecutor(max_workers=min(workers, max(1, len(offsets))),
+                            thread_name_prefix=f"draw-fields-{game}") as pool:
+        futures = [pool.submit(migrate, offset) for offset in offsets]
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"⚠ [{game.upper()}] Typed-field backfill page failed: {exc}")
+                continue
+            scanned += result["scanned"]
+            updated += result["updated"]
+            if result["ordinals"]:
+                page_low, page_high = result["ordinals"]
+                low = page_low if low is None else min(low, page_low)
+                high = page_high if high is None else max(high, page_high)
+
+    complete = failed == 0 and scanned >= total
+    update_draw_ordinals(game, low=low, high=high, complete=True if complete else None)
+    elapsed = time.perf_counter() - started
+    print(
+        f"✓ [{game.upper()}] Typed-field backfill: scanned={scanned}, updated={updated}, "
+        f"failed_pages={failed} in {elapsed:.1f}s"
+    )
+    return {
+        "game": game,
+        "scanned": scanned,
+        "updated": updated,
+        "failed_pages": failed,
+        "complete": complete,
+        "elapsed_s": round(elapsed, 3),
+    }
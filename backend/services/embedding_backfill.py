@@ -0,0 +1,126 @@
+"""
+Deferred embeddings for ingested draw collections.
+
+Training and prediction only read metadatas, so by default ingest stores draws
+with cheap placeholder vectors and tags them `embedding_pending=True`
+(INGEST_EMBEDDING_MODE=deferred). Real embeddings are computed later, in a
+background thread, only for collections that RAG actually queries.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+PENDING_KEY = "embedding_pending"
+DEFAULT_EMBEDDING_DIM = 384  # all-MiniLM-L6-v2, chromadb's DefaultEmbeddingFunction
+
+
+def placeholder_embeddings(ids: list[str], dim: int) -> list[list[float]]:
+    """
+    Tiny deterministic vectors standing in for real embeddings.
+
+    Identical (e.g. all-zero) vectors degrade HNSW inserts, so each id gets its
+    own low-norm pseudo-random vector instead.
+    """
+    vectors = np.empty((len(ids), dim), dtype=np.float32)
+    for row, record_id in enumerate(ids):
+        seed = int.from_bytes(hashlib.blake2b(str(record_id).encode(), digest_size=8).digest(), "big")
+        vectors[row] = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+    vectors *= 1e-3
+    return vectors.tolist()
+
+
+class EmbeddingBackfill:
+    def __init__(self):
+        self.batch_size = max(1, int(os.getenv("EMBEDDING_BACKFILL_BATCH", "256")))
+        self._threads: dict[str, threading.Thread] = {}
+        self._status: dict[str, dict] = {}
+        self._dims: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._embedding_function = None
+
+    def _embed(self, documents: list[str]):
+        if self._embedding_function is None:
+            from .embedding_service import embedding_service
+
+            self._embedding_function = embedding_service.embed
+        return self._embedding_function(documents)
+
+    def embedding_dim(self, game: str, collection) -> int:
+        """Dimension of vectors already stored in `collection` (default 384 when empty)."""
+        with self._lock:
+            if game in self._dims:
+                return self._dims[game]
+        dim = DEFAULT_EMBEDDING_DIM
+        try:
+            sample = collection.get(limit=1, include=["embeddings"])
+            embeddings = sample.get("embeddings")
+            if embeddings is not None and len(embeddings) and len(embeddings[0]):
+                dim = len(embeddings[0])
+        except Exception as exc:
+            print(f"⚠ Could not detect embedding dimension for {game}: {exc}")
+        with self._lock:
+            self._dims[game] = dim
+        return dim
+
+    def status(self, game: str) -> dict:
+        with self._lock:
+            return dict(self._status.get(game) or {})
+
+    def ensure(self, game: str) -> bool:
+        """Start backfilling `game` in the background unless it is already running."""
+        with self._lock:
+            thread = self._threads.get(game)
+            if thread is not None and thread.is_alive():
+                return False
+            thread = threading.Thread(
+                target=self._run, args=(game,), daemon=True, name=f"EmbeddingBackfill-{game}"
+            )
+            self._threads[game] = thread
+            self._status[game] = {"status": "running", "embedded": 0, "started_at": time.time()}
+        thread.start()
+        return True
+
+    def _run(self, game: str) -> None:
+        from .chroma_client import chroma_client
+
+        embedded = 0
+        try:
+            collection = chroma_client.get_or_create_collection(game)
+            while True:
+                page = collection.get(
+                    where={PENDING_KEY: True},
+                    include=["documents"],
+                    limit=self.batch_size,
+                )
+                ids = page.get("ids") or []
+                if not ids:
+                    break
+                documents = [doc or "" for doc in (page.get("documents") or [""] * len(ids))]
+                collection.update(
+                    ids=ids,
+                    embeddings=self._embed(documents),
+                    metadatas=[{PENDING_KEY: False} for _ in ids],
+                )
+                embedded += len(ids)
+                with self._lock:
+                    self._status.setdefault(game, {})["embedded"] = embedded
+            if embedded:
+                print(f"✓ [{game.upper()}] Backfilled {embedded} deferred embeddings")
+            status = "completed"
+            error = None
+        except Exception as exc:
+            print(f"⚠ [{game.upper()}] Embedding backfill failed: {exc}")
+            status = "error"
+            error = str(exc)
+        with self._lock:
+            self._status.setdefault(game, {}).update(
+                {"status": status, "embedded": embedded, "error": error, "completed_at": time.time()}
+            )
+
+
+embedding_backfill = EmbeddingBackfill()
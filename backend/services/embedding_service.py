@@ -0,0 +1,284 @@
+"""
+Process-wide embedding service for draw documents.
+
+- One warm model: worker processes load chromadb's default ONNX model once and
+  keep it for the life of the pool. Each worker holds its own copy of the
+  ~80 MB model plus the ONNX runtime, so the pool defaults to
+  DEFAULT_WORKERS (capped at the available cores) rather than one per core;
+  override with EMBEDDING_WORKERS. 0 or 1 embeds on the calling process.
+- Cross-caller batching: requests from every game/ingest thread go through a
+  single dispatcher that groups them into EMBEDDING_BATCH_SIZE chunks and
+  drops duplicates that are already being embedded.
+- Content-hash cache: vectors are stored in a SQLite file under DATA_DIR keyed
+  by a hash of the model name and document text, so identical rows (force
+  reingests, pick3 midday/evening expansion) are never embedded twice.
+
+`shared_embedding_function` adapts the service to Chroma's EmbeddingFunction
+interface and is used for every collection we open.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+DEFAULT_WORKERS = 2
+
+_worker_model = None
+
+
+def _worker_init() -> None:
+    # The pool already provides parallelism; keep each ONNX session single-threaded.
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    global _worker_model
+    from chromadb.utils import embedding_functions
+
+    _worker_model = embedding_functions.DefaultEmbeddingFunction()
+
+
+def _worker_embed(documents: list[str]) -> np.ndarray:
+    if _worker_model is None:
+        _worker_init()
+    return np.asarray(_worker_model(documents), dtype=np.float32)
+
+
+def _available_cores() -> int:
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+class EmbeddingCache:
+    """SQLite-backed map of document hash -> float32 vector."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        conn = self._conn()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            for key, blob in conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            ):
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+        with self._write_lock:
+            conn = self._conn()
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            conn.commit()
+
+
+class EmbeddingService:
+    def __init__(self, workers: int | None = None, cache_path: str | Path | None = None,
+                 embed_fn: Callable[[list[str]], list] | None = None):
+        if workers is None:
+            workers = int(os.getenv("EMBEDDING_WORKERS", str(min(DEFAULT_WORKERS, _available_cores()))))
+        self.workers = max(0, workers)
+        self.batch_size = max(1, int(os.getenv("EMBEDDING_BATCH_SIZE", "64")))
+        self.batch_wait_s = max(0.0, float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "20")) / 1000.0)
+        default_cache = Path(os.environ.get("DATA_DIR", "/data")) / "embedding_cache.sqlite3"
+        cache_enabled = os.getenv("EMBEDDING_CACHE", "1") != "0"
+        self.cache = EmbeddingCache(cache_path or os.getenv("EMBEDDING_CACHE_PATH", str(default_cache))) \
+            if cache_enabled else None
+        self._embed_fn = embed_fn
+        self._local_model = None
+        self._pool: ProcessPoolExecutor | None = None
+        self._requests: queue.Queue = queue.Queue()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._dispatcher: threading.Thread | None = None
+        self.stats = {"requested": 0, "cache_hits": 0, "embedded": 0, "batches": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **deltas: int) -> None:
+        # Callers, the dispatcher and pool callbacks all update stats.
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    # -- model / pool ------------------------------------------------------
+
+    def _embed_local(self, documents: list[str]) -> np.ndarray:
+        if self._embed_fn is not None:
+            return np.asarray(self._embed_fn(documents), dtype=np.float32)
+        if self._local_model is None:
+            from chromadb.utils import embedding_functions
+
+            self._local_model = embedding_functions.DefaultEmbeddingFunction()
+        return np.asarray(self._local_model(documents), dtype=np.float32)
+
+    def _ensure_started(self) -> None:
+        if self._dispatcher is not None:
+            return
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            if self.workers > 1 and self._embed_fn is None:
+                import multiprocessing
+
+                # Load (and, on first run, download) the model once before the
+                # workers start so they never race on the model cache.
+                self._embed_local(["warmup"])
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_worker_init,
+                )
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True, name="EmbeddingDispatcher")
+            self._dispatcher.start()
+
+    def shutdown(self) -> None:
+        pool = self._pool
+        self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # -- batching ----------------------------------------------------------
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            key, document = self._requests.get()
+            batch = {key: document}
+            deadline = time.monotonic() + self.batch_wait_s
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    key, document = self._requests.get(timeout=max(remaining, 0.0)) if remaining > 0 \
+                        else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                batch[key] = document
+            self._submit(batch)
+
+    def _submit(self, batch: dict[str, str]) -> None:
+        keys = list(batch)
+        documents = [batch[key] for key in keys]
+        self._count(batches=1)
+        if self._pool is not None:
+            try:
+                future = self._pool.submit(_worker_embed, documents)
+            except Exception as exc:
+                self._resolve(keys, error=exc)
+                return
+            future.add_done_callback(lambda done: self._on_done(keys, done))
+            return
+        try:
+            self._resolve(keys, vectors=self._embed_local(documents))
+        except Exception as exc:
+            self._resolve(keys, error=exc)
+
+    def _on_done(self, keys: list[str], done: Future) -> None:
+        try:
+            self._resolve(keys, vectors=done.result())
+        except Exception as exc:
+            self._resolve(keys, error=exc)
+
+    def _resolve(self, keys: list[str], vectors=None, error: Exception | None = None) -> None:
+        if error is None and self.cache is not None:
+            try:
+                self.cache.put_many(dict(zip(keys, vectors)))
+            except Exception as exc:
+                print(f"⚠ Failed to write embedding cache: {exc}")
+        with self._lock:
+            futures = [self._inflight.pop(key, None) for key in keys]
+        if error is None:
+            self._count(embedded=len(keys))
+        for index, future in enumerate(futures):
+            if future is None:
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(vectors[index])
+
+    # -- public API --------------------------------------------------------
+
+    @staticmethod
+    def document_key(document: str) -> str:
+        return hashlib.blake2b(f"{MODEL_NAME}\0{document}".encode(), digest_size=16).hexdigest()
+
+    def embed(self, documents: list[str]) -> list[list[float]]:
+        """Embed `documents`, reusing cached vectors and batching misses with other callers."""
+        if not documents:
+            return []
+        keys = [self.document_key(str(document)) for document in documents]
+        vectors: dict[str, np.ndarray] = self.cache.get_many(list(set(keys))) if self.cache is not None else {}
+        self._count(requested=len(keys), cache_hits=sum(1 for key in keys if key in vectors))
+
+        waiting: dict[str, Future] = {}
+        to_send: list[tuple[str, str]] = []
+        with self._lock:
+            for key, document in zip(keys, documents):
+                if key in vectors or key in waiting:
+                    continue
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    to_send.append((key, str(document)))
+                waiting[key] = future
+        if waiting:
+            try:
+                self._ensure_started()
+            except Exception as exc:
+                # e.g. the model could not be loaded; fail our requests instead of leaving them pending
+                self._resolve([key for key, _ in to_send], error=exc)
+                raise
+            for item in to_send:
+                self._requests.put(item)
+            for key, future in waiting.items():
+                vectors[key] = future.result()
+        return [vectors[key].tolist() for key in keys]
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {**stats, "workers": self.workers if self._pool is not None else 0}
+
+
+class SharedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma EmbeddingFunction backed by the process-wide EmbeddingService."""
+
+    def __init__(self, service: EmbeddingService):
+        self.service = service
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self.service.embed(list(input))
+
+
+embedding_service = EmbeddingService()
+shared_embedding_function = SharedEmbeddingFunction(embedding_service)
+atexit.register(embedding_service.shutdown)
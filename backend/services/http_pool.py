@@ -0,0 +1,100 @@
+"""
+Shared keep-alive HTTP pool for outbound dataset downloads.
+
+All Socrata traffic (dataset rows, catalog lookups) goes through one pooled
+`requests.Session` so connections are reused across endpoints and games. A
+global semaphore caps concurrent requests process-wide and a per-host
+semaphore keeps any single origin from being hammered, regardless of how many
+games or endpoints are ingesting at the same time.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpPool:
+    def __init__(self, max_concurrency: int | None = None, max_per_host: int | None = None):
+        self.max_concurrency = max(1, int(max_concurrency or os.getenv("INGEST_HTTP_MAX_CONCURRENCY", "6")))
+        self.max_per_host = max(1, int(max_per_host or os.getenv("INGEST_HTTP_MAX_PER_HOST", "4")))
+        self._global_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._active = 0
+        self._active_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.max_concurrency,
+                        pool_maxsize=self.max_concurrency,
+                        max_retries=0,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_slots.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one global and one per-host request slot for `url`."""
+        host_slots = self._host_semaphore(url)
+        with self._global_slots:
+            with host_slots:
+                with self._active_lock:
+                    self._active += 1
+                try:
+                    yield
+                finally:
+                    with self._active_lock:
+                        self._active -= 1
+
+    @contextmanager
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Perform a pooled request and yield the response.
+
+        The concurrency slot is held until the block exits, which matters for
+        `stream=True` downloads whose body is consumed inside the block.
+        """
+        with self.slot(url):
+            response = self.session.request(method, url, **kwargs)
+            try:
+                yield response
+            finally:
+                response.close()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> dict:
+        with self._active_lock:
+            active = self._active
+        return {
+            "active": active,
+            "max_concurrency": self.max_concurrency,
+            "max_per_host": self.max_per_host,
+        }
+
+
+http_pool = HttpPool()
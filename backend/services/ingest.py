@@ -1,17 +1,52 @@
 import requests
 import hashlib
+import json
 import time
 import signal
 import os
+import threading
 import re
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
 from functools import wraps
-from config import DATASET_ENDPOINTS, GAME_TITLES, GAME_ALIASES, resolve_game_key
-from chromadb.utils import embedding_functions
+from config import DATASET_ENDPOINTS, GAME_CONFIGS, GAME_TITLES, GAME_ALIASES, resolve_game_key
+from state.draw_store import draw_store_enabled, get_draw_store
+from state.id_index import KnownIds, get_id_index
+from state.ingest_state import (
+    clear_ingest_checkpoints,
+    get_ingest_checkpoint,
+    has_ingest_checkpoint,
+    set_ingest_checkpoint,
+)
+from state.ingest_watermarks import (
+    clear_watermarks,
+    get_row_id_scheme,
+    get_watermark,
+    set_row_id_scheme,
+    update_draw_ordinals,
+    update_watermark,
+)
+from utils.draw_numbers import ORDINAL_FIELD, game_rules, typed_fields
+from .embedding_backfill import PENDING_KEY, embedding_backfill, placeholder_embeddings
+from .embedding_service import shared_embedding_function
+from .http_pool import http_pool
+from .ingest_pipeline import IngestPipeline
+from .ingest_tuning import AimdController
+from .payload_cache import payload_cache
+from . import batch_normalizer, socrata_delta
+from .batch_normalizer import ROW_ID_FAST, ROW_ID_LEGACY
+from .socrata_stream import SocrataRowStream
 
 class TimeoutError(Exception):
     """Raised when an operation exceeds the time limit."""
     pass
 
+
+class IngestCancelled(Exception):
+    """Raised at a batch boundary when an ingest's cancel event is set."""
+    pass
+
 def timeout_handler(signum, frame):
     raise TimeoutError("Operation timed out")
 
@@ -35,6 +70,75 @@ def with_timeout(seconds):
         return wrapper
     return decorator
 
+class _IngestRun:
+    """Thread-safe row counters shared by the endpoints of one ingest run."""
+
+    def __init__(self, *, rows_before: int, existing_ids: set[str], progress_callback=None,
+                 progress_interval_s: float = 0.5, row_id_scheme: str = ROW_ID_FAST,
+                 tuner: AimdController | None = None, cancel_event: threading.Event | None = None,
+                 draw_store=None):
+        self.rows_before = rows_before
+        self.row_id_scheme = row_id_scheme
+        self.tuner = tuner
+        self.cancel_event = cancel_event
+        self.draw_store = draw_store
+        self.existing_ids = existing_ids
+        self.progress_callback = progress_callback
+        self.progress_interval_s = progress_interval_s
+        self.rows_processed = 0
+        self.rows_added = 0
+        self.discovered_total_rows = 0
+        self.ordinal_range: tuple[int, int] | None = None
+        self.rows_without_ordinal = 0
+        self._last_progress_at = 0.0
+        self._lock = threading.Lock()
+
+    def add_discovered(self, count: int) -> None:
+        with self._lock:
+            self.discovered_total_rows += count
+
+    def add_processed(self, count: int) -> None:
+        with self._lock:
+            self.rows_processed += count
+
+    def add_ordinals(self, metadatas: list[dict]) -> None:
+        ordinals = [meta[ORDINAL_FIELD] for meta in metadatas if ORDINAL_FIELD in meta]
+        if len(ordinals) < len(metadatas):
+            with self._lock:
+                self.rows_without_ordinal += len(metadatas) - len(ordinals)
+        if not ordinals:
+            return
+        with self._lock:
+            low, high = min(ordinals), max(ordinals)
+            if self.ordinal_range is not None:
+                low, high = min(low, self.ordinal_range[0]), max(high, self.ordinal_range[1])
+            self.ordinal_range = (low, high)
+
+    def add_stored(self, ids: list[str]) -> None:
+        # Concurrent endpoints may upsert the same row id; count it once.
+        with self._lock:
+            known = IngestService._known_flags(self.existing_ids, ids)
+            new_ids = [row_id for row_id, hit in zip(ids, known) if not hit]
+            self.existing_ids.update(new_ids)
+            self.rows_added += len(new_ids)
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise IngestCancelled("ingest cancelled")
+
+    def emit_progress(self) -> None:
+        if not self.progress_callback:
+            return
+        with self._lock:
+            rows_fetched = self.rows_before + self.rows_processed
+            total_rows = self.rows_before + max(self.discovered_total_rows, self.rows_processed, 1)
+            now = time.time()
+            if rows_fetched < total_rows and now - self._last_progress_at < self.progress_interval_s:
+                return
+            self._last_progress_at = now
+        self.progress_callback(rows_fetched, total_rows)
+
+
 class IngestService:
     def __init__(self):
         self.request_timeout = int(os.getenv("INGEST_REQUEST_TIMEOUT", "20"))
@@ -45,10 +149,29 @@ class IngestService:
         self.enable_catalog_fallback = os.getenv("INGEST_ENABLE_CATALOG_FALLBACK", "1") == "1"
         self.fallback_on_empty = os.getenv("INGEST_FALLBACK_ON_EMPTY", "1") == "1"
         self.max_catalog_candidates = int(os.getenv("INGEST_MAX_CATALOG_CANDIDATES", "3"))
-        self.max_id_preload = int(os.getenv("INGEST_MAX_ID_PRELOAD", "15000"))
+        self.id_index_page_size = max(1, int(os.getenv("INGEST_ID_INDEX_PAGE_SIZE", "10000")))
         self.skip_fetch_threshold = int(os.getenv("INGEST_SKIP_FETCH_THRESHOLD", "50000"))
         self.batch_max_retries = int(os.getenv("INGEST_BATCH_MAX_RETRIES", "2"))
         self.progress_interval_s = float(os.getenv("INGEST_PROGRESS_INTERVAL_S", "0.5"))
+        self.streaming = os.getenv("INGEST_STREAMING", "1") != "0"
+        self.stream_chunk_size = int(os.getenv("INGEST_STREAM_CHUNK_BYTES", str(256 * 1024)))
+        self.pipeline_enabled = os.getenv("INGEST_PIPELINE", "1") != "0"
+        self.pipeline_queue_depth = max(1, int(os.getenv("INGEST_PIPELINE_QUEUE_DEPTH", "2")))
+        self.pipeline_writers = max(1, int(os.getenv("INGEST_PIPELINE_WRITERS", "2")))
+        self.endpoint_concurrency = max(1, int(os.getenv("INGEST_ENDPOINT_CONCURRENCY", "4")))
+        self.catalog_cache_ttl_s = float(os.getenv("INGEST_CATALOG_CACHE_TTL_S", "86400"))
+        self.delta_enabled = os.getenv("INGEST_DELTA", "1") != "0"
+        self.checkpoints_enabled = os.getenv("INGEST_CHECKPOINTS", "1") != "0"
+        # Collections keep the id scheme they were created with; see _resolve_row_id_scheme.
+        self.legacy_row_ids = os.getenv("INGEST_LEGACY_ROW_IDS", "0") == "1"
+        self.row_id_scheme = ROW_ID_LEGACY if self.legacy_row_ids else ROW_ID_FAST
+        self.defer_embeddings = os.getenv("INGEST_EMBEDDING_MODE", "deferred").lower() != "inline"
+        self.delta_page_size = max(1, int(os.getenv("INGEST_DELTA_PAGE_SIZE", "5000")))
+        self.watermark_scan_page_size = max(1, int(os.getenv("INGEST_WATERMARK_SCAN_PAGE_SIZE", "5000")))
+        self._pipeline_stats: dict[str, dict] = {}
+        self._pipeline_stats_lock = threading.Lock()
+        # Last settled AIMD settings per game; the next sync starts from them.
+        self._tuning: dict[str, dict] = {}
         self.socrata_catalog_url = os.getenv("SOCRATA_CATALOG_URL", "https://api.us.socrata.com/api/catalog/v1")
         self.socrata_domain = os.getenv("SOCRATA_DOMAIN", "data.ny.gov")
         self.game_search_hints = {
@@ -56,6 +179,35 @@ class IngestService:
             for key in DATASET_ENDPOINTS.keys()
         }
 
+    def _publish_pipeline_stats(self, game: str, stats: dict) -> None:
+        with self._pipeline_stats_lock:
+            self._pipeline_stats[game] = stats
+
+    def get_pipeline_stats(self, game: str) -> dict:
+        """Latest per-stage throughput snapshot for a game's running (or last) ingest."""
+        with self._pipeline_stats_lock:
+            return dict(self._pipeline_stats.get(game) or {})
+
+    def _new_tuner(self, game: str) -> AimdController:
+        """Upsert controller for one sync, warm-started from the game's last run."""
+        with self._pipeline_stats_lock:
+            last = dict(self._tuning.get(game) or {})
+        tuner = AimdController(batch_size=self.batch_size, writers=self.pipeline_writers)
+        if tuner.adaptive and last:
+            tuner.batch_size = min(max(last["batch_size"], tuner.min_batch_size), tuner.max_batch_size)
+            tuner.writers = min(max(last["writers"], tuner.min_writers), tuner.max_writers)
+        return tuner
+
+    def _remember_tuning(self, game: str, tuner: AimdController) -> None:
+        snapshot = tuner.snapshot()
+        with self._pipeline_stats_lock:
+            self._tuning[game] = snapshot
+
+    def get_tuning(self, game: str) -> dict:
+        """Batch size / writer settings chosen by the last sync of a game."""
+        with self._pipeline_stats_lock:
+            return dict(self._tuning.get(game) or {})
+
     def _normalize_text(self, value: str) -> str:
         return re.sub(r"[^a-z0-9]+", " ", (value or "").lower()).strip()
 
@@ -94,11 +246,16 @@ class IngestService:
         if not self.enable_catalog_fallback:
             return []
 
+        cache_key = f"catalog:{self.socrata_domain}:{game}"
+        cached = payload_cache.load_json(cache_key, self.catalog_cache_ttl_s)
+        if isinstance(cached, list):
+            return list(cached)
+
         hint = self.game_search_hints.get(game, GAME_TITLES.get(game, game))
         query = hint
 
         try:
-            response = requests.get(
+            with http_pool.get(
                 self.socrata_catalog_url,
                 params={
                     "domains": self.socrata_domain,
@@ -107,9 +264,9 @@ class IngestService:
                     "limit": 20,
                 },
                 timeout=self.request_timeout,
-            )
-            response.raise_for_status()
-            payload = response.json()
+            ) as response:
+                response.raise_for_status()
+                payload = response.json()
             results = payload.get("results", [])
         except Exception as exc:
             print(f"⚠ Catalog lookup failed for {game}: {exc}")
@@ -167,6 +324,7 @@ class IngestService:
             if len(deduped_endpoints) >= self.max_catalog_candidates:
                 break
 
+        payload_cache.store_json(cache_key, deduped_endpoints)
         return deduped_endpoints
 
     def _resolve_game_endpoints(self, game: str):
@@ -224,180 +382,701 @@ class IngestService:
 
         return expanded if expanded else [(row_id_base, metadata_item)]
 
-    def _process_endpoints(self, game: str, endpoints: list[str], collection, column_names: list[str],
-                           total_rows_processed: int, progress_callback=None, existing_ids: set[str] | None = None):
-        """Process a list of endpoints and return (rows_processed, rows_added, updated_column_names)."""
-        batch_size = self.batch_size
-        rows_before = total_rows_processed
-        rows_added = 0
-        discovered_total_rows = 0
-        existing_ids = existing_ids or set()
-        last_progress_at = 0.0
-
-        def _emit_progress(rows_fetched: int, total_rows: int):
-            nonlocal last_progress_at
-            if not progress_callback:
-                return
-            now = time.time()
-            if (
-                rows_fetched >= total_rows
-                or now - last_progress_at >= self.progress_interval_s
-            ):
-                progress_callback(rows_fetched, total_rows)
-                last_progress_at = now
+    def _row_to_metadata(self, row, column_names: list[str]) -> dict | None:
+        """Stringify one Socrata row into a Chroma metadata dict."""
+        normalize_value = socrata_delta.normalize_value
+        if isinstance(row, dict):
+            return {key: normalize_value(value) for key, value in row.items()}
+        if isinstance(row, list):
+            if column_names:
+                return {col_name: normalize_value(value) for col_name, value in zip(column_names, row)}
+            return {f"col_{idx}": normalize_value(val) for idx, val in enumerate(row)}
+        return None
+
+    def _build_batch_records(self, game: str, batch: list, column_names: list[str],
+                             existing_ids: set[str], row_offset: int = 0, *,
+                             row_id_fn=None, watermark_field: str | None = None,
+                             row_id_scheme: str | None = None, content_columns: list[str] | None = None):
+        """
+        Normalize one batch of raw rows. Returns (metadatas, ids, rows_seen, max_watermark).
 
-        for endpoint_idx, endpoint in enumerate(endpoints):
-            success = False
-            last_error = None
+        Every record gets its numbers pre-parsed into typed fields and an
+        integer `draw_ordinal` (see utils.draw_numbers.typed_fields), so
+        loaders read fields instead of re-parsing and can range-query the
+        newest draws.
 
-            print(f"[{game.upper()}] Endpoint {endpoint_idx + 1}/{len(endpoints)}: {endpoint}")
+        rows.json batches go through the columnar `batch_normalizer`; other
+        shapes are normalized row by row. `row_id_fn(metadata)` overrides the
+        scheme-based row id (delta rows use content digests); `max_watermark`
+        is the largest value of `watermark_field` seen in the batch, or None.
 
-            for attempt in range(self.max_retries):
+        Full downloads pass the delta `content_columns`: a row whose scheme id
+        is unknown is still skipped when its content digest is stored, so
+        draws first ingested by a delta sync are not added again.
+        """
+        row_id_scheme = row_id_scheme or self.row_id_scheme
+        if row_id_fn is None and batch_normalizer.is_columnar_batch(batch):
+            metadatas, ids, max_watermark = batch_normalizer.normalize_batch(
+                game, batch, column_names, row_id_scheme=row_id_scheme, watermark_field=watermark_field
+            )
+            rows_seen = len(batch)
+        else:
+            metadatas, ids, rows_seen, max_watermark = self._build_row_records(
+                game, batch, column_names, row_offset, row_id_fn, watermark_field, row_id_scheme
+            )
+
+        if ids and existing_ids:
+            known = self._known_flags(existing_ids, ids)
+            if content_columns and row_id_fn is None and game != "pick3":
+                # pick3 ids are already content-derived (date|session|digits) on both paths.
+                unknown = [idx for idx, hit in enumerate(known) if not hit]
+                if unknown:
+                    digests = [socrata_delta.content_digest(game, metadatas[idx], content_columns) for idx in unknown]
+                    for idx, hit in zip(unknown, self._known_flags(existing_ids, digests)):
+                        known[idx] = hit
+            metadatas = [meta for meta, hit in zip(metadatas, known) if not hit]
+            ids = [record_id for record_id, hit in zip(ids, known) if not hit]
+        rules = game_rules(game)
+        for meta in metadatas:
+            meta.update(typed_fields(meta, game, rules))
+        return metadatas, ids, rows_seen, max_watermark
+
+    def _build_row_records(self, game: str, batch: list, column_names: list[str], row_offset: int,
+                           row_id_fn, watermark_field: str | None, row_id_scheme: str):
+        """Row-by-row fallback of `_build_batch_records` for dict or ragged rows."""
+        metadatas = []
+        ids = []
+        rows_seen = 0
+        max_watermark = None
+        for row_idx, row in enumerate(batch):
+            metadata_item = self._row_to_metadata(row, column_names)
+            if metadata_item is None:
+                print(f"  ⚠ Skipping row {row_offset + row_idx}: unsupported row type {type(row)}")
+                continue
+            if row_id_fn is not None:
+                row_id = row_id_fn(metadata_item)
+            elif row_id_scheme == ROW_ID_LEGACY:
+                row_id = hashlib.md5(str(row).encode()).hexdigest()
+            else:
+                row_id = batch_normalizer.row_digest(metadata_item.values())
+            rows_seen += 1
+            if watermark_field:
+                value = metadata_item.get(watermark_field)
+                if value and (max_watermark is None or value > max_watermark):
+                    max_watermark = value
+
+            for record_id, record_meta in self._normalize_game_records(
+                game, metadata_item, row_id
+            ):
+                metadatas.append(record_meta)
+                ids.append(record_id)
+        return metadatas, ids, rows_seen, max_watermark
+
+    @staticmethod
+    def _known_flags(existing_ids, ids: list[str]) -> list[bool]:
+        """Batched membership test against a set or an IdIndex-backed view."""
+        contains_many = getattr(existing_ids, "contains_many", None)
+        if contains_many is not None:
+            return contains_many(ids)
+        return [record_id in existing_ids for record_id in ids]
+
+    def _write_batch(self, collection, metadatas: list[dict], ids: list[str], label: str,
+                     embedding_dim: int | None = None, tuner: AimdController | None = None) -> bool:
+        """
+        Upsert one batch with retries. Returns True when the batch was stored.
+
+        With `embedding_dim` set (deferred embedding mode) rows are written with
+        placeholder vectors and flagged for the background backfill. With a
+        `tuner`, each upsert holds one of its writer slots and reports its
+        latency; rows left after a failure are retried in chunks of the
+        (possibly reduced) batch size.
+        """
+        documents = [str(item) for item in metadatas]
+        embeddings = None
+        if embedding_dim:
+            # INGEST_EMBEDDING_MODE=deferred: store placeholder vectors and embed later for RAG
+            # (inline mode leaves embeddings to the collection while ingesting).
+            metadatas = [{**item, PENDING_KEY: True} for item in metadatas]
+            embeddings = placeholder_embeddings(ids, embedding_dim)
+        write = collection.upsert if self.use_upsert and hasattr(collection, "upsert") else collection.add
+        last_batch_error = None
+        start = 0
+        batch_attempt = 0
+
+        while start < len(ids):
+            end = len(ids) if tuner is None else min(len(ids), start + tuner.current_batch_size())
+            extra = {} if embeddings is None else {"embeddings": embeddings[start:end]}
+            with tuner.writer_slot() if tuner is not None else nullcontext():
+                started = time.perf_counter()
                 try:
-                    print(f"  Fetching from {endpoint} (attempt {attempt + 1}/{self.max_retries})...")
-                    response = requests.get(endpoint, timeout=self.request_timeout)
+                    write(
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end],
+                        **extra,
+                    )
+                    ok = True
+                except Exception as batch_error:
+                    last_batch_error = batch_error
+                    ok = False
+                elapsed = time.perf_counter() - started
+            if tuner is not None:
+                tuner.record(end - start, elapsed, ok=ok)
+            if ok:
+                start = end
+                batch_attempt = 0
+                continue
+
+            batch_attempt += 1
+            if batch_attempt >= self.batch_max_retries:
+                print(
+                    f"  ⚠ Error processing batch {label} "
+                    f"after {self.batch_max_retries} attempts: {last_batch_error}"
+                )
+                return False
+            delay = 0.5 * (2 ** (batch_attempt - 1))
+            print(
+                f"  ⚠ Batch {label} failed "
+                f"(attempt {batch_attempt}/{self.batch_max_retries}): "
+                f"{last_batch_error}; retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+        return True
+
+    def _open_endpoint_rows(self, endpoint: str, stack: ExitStack):
+        """
+        Fetch an endpoint and return (rows, columns_source, total_hint, fingerprint_source).
+
+        The pooled response is registered on `stack` so its connection slot is
+        held until the caller has consumed the rows. The request is conditional
+        on the cached payload's validators; a 304 replays the cached body and a
+        fresh 200 is teed into the cache while it is consumed. In streaming mode
+        `rows` is a lazy SocrataRowStream; `columns_source()` returns the column
+        names once `meta.view.columns` has been parsed. Otherwise the payload is
+        decoded in one piece. `fingerprint_source()` identifies the payload
+        version (validators plus `meta.view.rowsUpdatedAt`) for resume
+        checkpoints; it returns None when the payload carries none of them.
+        """
+        response = stack.enter_context(
+            http_pool.get(
+                endpoint,
+                headers=payload_cache.request_headers(endpoint),
+                timeout=self.request_timeout,
+                stream=self.streaming,
+            )
+        )
+        response.raise_for_status()
+        not_modified = response.status_code == 304 and payload_cache.has_body(endpoint)
+        if not_modified:
+            print("  ✓ Not modified since last download; replaying cached payload")
+            cached_meta = payload_cache.get_meta(endpoint)
+            validators = (cached_meta.get("etag"), cached_meta.get("last_modified"))
+        else:
+            validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+        def fingerprint_of(meta):
+            rows_updated_at = ((meta or {}).get("view") or {}).get("rowsUpdatedAt") if isinstance(meta, dict) else None
+            parts = (*validators, rows_updated_at)
+            return "|".join(str(part or "") for part in parts) if any(parts) else None
+
+        if self.streaming:
+            if not_modified:
+                chunks = payload_cache.iter_body(endpoint, chunk_size=self.stream_chunk_size)
+            else:
+                chunks = payload_cache.tee(
+                    endpoint,
+                    response.headers,
+                    response.iter_content(chunk_size=self.stream_chunk_size),
+                )
+            stream = SocrataRowStream(chunks)
+            return stream, (lambda: stream.columns), (lambda: stream.row_count_hint), (lambda: fingerprint_of(stream.meta))
+
+        if not_modified:
+            body = payload_cache.read_body(endpoint)
+        else:
+            body = response.content
+            if body:
+                payload_cache.store_body(endpoint, response.headers, body)
+        if not body:
+            return None, (lambda: []), (lambda: 0), (lambda: None)
+        data = json.loads(body)
+        fetched_rows, extracted_columns = self._extract_rows_and_columns(data)
+        payload_meta = data.get("meta") if isinstance(data, dict) else None
+        return (
+            fetched_rows,
+            (lambda: extracted_columns),
+            (lambda: len(fetched_rows)),
+            (lambda: fingerprint_of(payload_meta)),
+        )
+
+    def _iter_row_batches(self, rows, batch_size):
+        """
+        Group an iterable of rows into lists of at most batch_size rows.
+
+        `batch_size` may be a callable; it is re-read before every batch so an
+        adaptive controller can resize batches mid-stream.
+        """
+        size_of = batch_size if callable(batch_size) else (lambda: batch_size)
+        if isinstance(rows, list):
+            start = 0
+            while start < len(rows):
+                end = start + max(1, size_of())
+                yield rows[start:end]
+                start = end
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size_of():
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _open_delta_rows(self, endpoint: str, plan: dict, stack: ExitStack):
+        """
+        Page newer rows of `endpoint` from the SODA resource API.
+
+        Returns the same tuple as `_open_endpoint_rows` (without a fingerprint,
+        so delta fetches are never checkpointed); rows are dicts limited to
+        `plan["select"]`.
+        Each page is a separate pooled request issued lazily while the rows are
+        consumed.
+        """
+        url = plan["resource_url"]
+        field = plan["field"]
+        params = {
+            "$select": ",".join(plan["select"]),
+            "$where": f"{field} >= {socrata_delta.soql_literal(plan['since'])}",
+            "$order": f"{field} ASC, :id ASC",
+            "$limit": self.delta_page_size,
+        }
+
+        def pages():
+            offset = 0
+            while True:
+                with http_pool.get(
+                    url,
+                    params={**params, "$offset": offset},
+                    headers={"Accept-Encoding": "gzip"},
+                    timeout=self.request_timeout,
+                ) as response:
                     response.raise_for_status()
+                    page = response.json() if response.content else []
+                if not isinstance(page, list):
+                    raise ValueError(f"unexpected SODA payload type {type(page).__name__}")
+                yield from page
+                if len(page) < self.delta_page_size:
+                    return
+                offset += len(page)
+
+        return pages(), (lambda: list(plan["select"])), (lambda: None), (lambda: None)
+
+    def _process_endpoint(self, game: str, endpoint: str, endpoint_label: str, collection,
+                          column_names: list[str], existing_ids: set[str], run: "_IngestRun",
+                          delta: dict | None = None) -> list[str]:
+        """
+        Fetch one endpoint with retries and store its rows. Returns the column names it used.
 
-                    if not response.content:
-                        last_error = "Empty response received"
-                        print(f"  ⚠ {last_error}")
-                        break
+        With a `delta` plan (see `_plan_delta`) only rows at or after the
+        watermark are requested, and their ids are content digests so rows
+        already stored on the boundary day are recognized.
 
+        Full downloads checkpoint the contiguous prefix of stored rows together
+        with the payload fingerprint (see `state.ingest_state`). If an earlier
+        run was interrupted and the payload is unchanged, rows before the
+        checkpoint are skipped without being normalized or upserted again.
+        """
+        tuner = run.tuner or AimdController(batch_size=self.batch_size, writers=self.pipeline_writers, adaptive=False)
+        success = False
+        last_error = None
+        ds_id = socrata_delta.dataset_id(endpoint)
+        embedding_dim = embedding_backfill.embedding_dim(game, collection) if self.defer_embeddings else None
+        row_id_fn = None
+        bonus_keys = (GAME_CONFIGS.get(game) or {}).get("bonus_keys") or []
+        if delta:
+            select = delta["select"]
+            row_id_fn = lambda metadata: socrata_delta.content_digest(game, metadata, select)
+            column_names = list(select)
+
+        print(f"[{game.upper()}] Endpoint {endpoint_label}: {endpoint}")
+
+        for attempt in range(self.max_retries):
+            try:
+                with ExitStack() as stack:
+                    if delta:
+                        mode = f"delta since {delta['since']}"
+                    else:
+                        mode = "streaming" if self.streaming else "buffered"
+                    print(f"  Fetching from {endpoint} ({mode}, attempt {attempt + 1}/{self.max_retries})...")
                     try:
-                        data = response.json()
+                        if delta:
+                            opened = self._open_delta_rows(endpoint, delta, stack)
+                        else:
+                            opened = self._open_endpoint_rows(endpoint, stack)
+                        fetched_rows, columns_source, total_hint, fingerprint_source = opened
                     except ValueError as json_error:
                         last_error = f"Invalid JSON response: {str(json_error)}"
                         print(f"  ⚠ {last_error}")
-                        print(f"  Response preview: {response.text[:200]}")
                         break
 
-                    fetched_rows, extracted_columns = self._extract_rows_and_columns(data)
-
-                    if not column_names and extracted_columns:
-                        column_names = extracted_columns
-                        print(f"  ✓ Extracted {len(column_names)} column names from payload")
-                    elif not column_names:
-                        print(f"  ⚠ No column metadata found, will use generic names")
-
-                    if not fetched_rows:
-                        print(f"  ⚠ No data in this endpoint (empty 'data' array)")
-                        success = True
+                    if fetched_rows is None:
+                        last_error = "Empty response received"
+                        print(f"  ⚠ {last_error}")
                         break
 
-                    discovered_total_rows += len(fetched_rows)
-                    print(f"  ✓ Fetched {len(fetched_rows)} rows. Processing in batches of {batch_size}...")
-
-                    for j in range(0, len(fetched_rows), batch_size):
-                        batch = fetched_rows[j:j + batch_size]
-
-                        metadatas = []
-                        ids = []
-                        for row_idx, row in enumerate(batch):
-                            if isinstance(row, dict):
-                                metadata_item = {
-                                    key: (str(value) if value is not None else "")
-                                    for key, value in row.items()
-                                }
-                            elif isinstance(row, list):
-                                metadata_item = (
-                                    {col_name: (str(value) if value is not None else "") for col_name, value in zip(column_names, row)}
-                                    if column_names else
-                                    {f"col_{idx}": (str(val) if val is not None else "") for idx, val in enumerate(row)}
-                                )
-                            else:
-                                print(f"  ⚠ Skipping row {j + row_idx}: unsupported row type {type(row)}")
-                                continue
-                            row_id = hashlib.md5(str(row).encode()).hexdigest()
-                            total_rows_processed += 1
-
-                            for record_id, record_meta in self._normalize_game_records(
-                                game, metadata_item, row_id
-                            ):
-                                if record_id in existing_ids:
+                    endpoint_rows = 0
+                    endpoint_parsed = 0
+                    endpoint_total_known = False
+                    watermark_field = delta["field"] if delta else socrata_delta.date_field(column_names)
+                    stored_watermark = None
+                    watermark_lock = threading.Lock()
+                    batch_offsets: dict[int, int] = {}
+                    fingerprint = None
+                    committed_offset = 0
+                    finished_batches: dict[int, int] = {}
+
+                    def resume_offset() -> int:
+                        """Offset to resume from; only known once the payload meta has been read."""
+                        nonlocal fingerprint, stored_watermark, committed_offset
+                        fingerprint = fingerprint_source() if self.checkpoints_enabled else None
+                        checkpoint = get_ingest_checkpoint(game, endpoint) if fingerprint else {}
+                        if not checkpoint:
+                            return 0
+                        if checkpoint.get("fingerprint") != fingerprint:
+                            print("  ↻ Payload changed since the interrupted run; discarding its checkpoint")
+                            clear_ingest_checkpoints(game, endpoint)
+                            return 0
+                        committed_offset = int(checkpoint.get("offset") or 0)
+                        stored_watermark = checkpoint.get("watermark")
+                        if committed_offset:
+                            print(f"  ↻ Resuming after {committed_offset} rows committed by an interrupted run")
+                        return committed_offset
+
+                    def batches():
+                        # Batch sizes vary under the tuner, so remember where each one starts.
+                        nonlocal endpoint_rows
+                        offset = 0
+                        resume_from = None
+                        index = 0
+                        for batch in self._iter_row_batches(fetched_rows, tuner.current_batch_size):
+                            run.check_cancelled()
+                            if resume_from is None:
+                                resume_from = resume_offset()
+                            if offset < resume_from:
+                                skipped = min(len(batch), resume_from - offset)
+                                offset += skipped
+                                endpoint_rows += skipped
+                                run.add_processed(skipped)
+                                batch = batch[skipped:]
+                                if not batch:
                                     continue
-                                metadatas.append(record_meta)
-                                ids.append(record_id)
-
-                        total_for_progress = max(discovered_total_rows, total_rows_processed - rows_before, 1)
-                        if not ids:
-                            _emit_progress(total_rows_processed, rows_before + total_for_progress)
-                            continue
-
-                        documents = [str(item) for item in metadatas]
-                        batch_stored = False
-                        last_batch_error = None
-
-                        for batch_attempt in range(self.batch_max_retries):
-                            try:
-                                if self.use_upsert and hasattr(collection, "upsert"):
-                                    collection.upsert(
-                                        documents=documents,
-                                        metadatas=metadatas,
-                                        ids=ids
-                                    )
-                                else:
-                                    collection.add(
-                                        documents=documents,
-                                        metadatas=metadatas,
-                                        ids=ids
-                                    )
-                                existing_ids.update(ids)
-                                rows_added += len(ids)
-                                batch_stored = True
-                                break
-                            except Exception as batch_error:
-                                last_batch_error = batch_error
-                                if batch_attempt < self.batch_max_retries - 1:
-                                    delay = 0.5 * (2 ** batch_attempt)
-                                    print(
-                                        f"  ⚠ Batch {j}-{j + len(batch)} failed "
-                                        f"(attempt {batch_attempt + 1}/{self.batch_max_retries}): "
-                                        f"{batch_error}; retrying in {delay:.1f}s"
-                                    )
-                                    time.sleep(delay)
-
-                        if not batch_stored:
-                            if last_batch_error is not None:
+                            batch_offsets[index] = offset
+                            offset += len(batch)
+                            index += 1
+                            yield batch
+
+                    def commit(row_offset: int, row_count: int) -> None:
+                        """Advance the checkpoint over the contiguous prefix of finished batches."""
+                        nonlocal committed_offset
+                        with watermark_lock:
+                            finished_batches[row_offset] = row_offset + row_count
+                            advanced = False
+                            while committed_offset in finished_batches:
+                                committed_offset = finished_batches.pop(committed_offset)
+                                advanced = True
+                            offset, watermark = committed_offset, stored_watermark
+                        if advanced and fingerprint:
+                            set_ingest_checkpoint(game, endpoint, offset=offset, fingerprint=fingerprint,
+                                                  watermark=watermark)
+
+                    def normalize(batch, batch_index):
+                        nonlocal column_names, endpoint_total_known, endpoint_rows, endpoint_parsed
+                        nonlocal watermark_field
+                        row_offset = batch_offsets.pop(batch_index, 0)
+                        if not column_names and columns_source():
+                            column_names = columns_source()
+                            watermark_field = socrata_delta.date_field(column_names)
+                            print(f"  ✓ Extracted {len(column_names)} column names from payload")
+                        elif not column_names and row_offset == 0:
+                            print(f"  ⚠ No column metadata found, will use generic names")
+
+                        if not endpoint_total_known:
+                            hint = total_hint()
+                            if hint:
+                                run.add_discovered(hint)
+                                endpoint_total_known = True
+                                adaptive = " (adaptive)" if tuner.adaptive else ""
                                 print(
-                                    f"  ⚠ Error processing batch {j}-{j + len(batch)} "
-                                    f"after {self.batch_max_retries} attempts: {last_batch_error}"
+                                    f"  ✓ Endpoint reports {hint} rows. "
+                                    f"Processing in batches of {tuner.current_batch_size()}{adaptive}..."
                                 )
-                            continue
 
-                        _emit_progress(total_rows_processed, rows_before + total_for_progress)
+                        metadatas, ids, rows_seen, batch_watermark = self._build_batch_records(
+                            game, batch, column_names, existing_ids, row_offset,
+                            row_id_fn=row_id_fn, watermark_field=watermark_field,
+                            row_id_scheme=run.row_id_scheme,
+                            content_columns=None if delta else socrata_delta.parser_columns(column_names, bonus_keys),
+                        )
+                        endpoint_rows += len(batch)
+                        endpoint_parsed += rows_seen
+                        run.add_processed(rows_seen)
+                        return row_offset, len(batch), metadatas, ids, batch_watermark
+
+                    def write(bundle, batch_index):
+                        nonlocal stored_watermark
+                        row_offset, row_count, metadatas, ids, batch_watermark = bundle
+                        stored = bool(ids) and self._write_batch(
+                            collection, metadatas, ids, f"{row_offset}-{row_offset + row_count}",
+                            embedding_dim=embedding_dim, tuner=tuner,
+                        )
+                        if stored:
+                            run.add_stored(ids)
+                            run.add_ordinals(metadatas)
+                            if run.draw_store is not None:
+                                run.draw_store.add(metadatas, ids)
+                        if stored or not ids:
+                            run.emit_progress()
+                            # Only advance the watermark over rows that are safely stored.
+                            if batch_watermark:
+                                with watermark_lock:
+                                    if stored_watermark is None or batch_watermark > stored_watermark:
+                                        stored_watermark = batch_watermark
+                            commit(row_offset, row_count)
+                        self._publish_pipeline_stats(game, pipeline.snapshot())
+
+                    # Start the most writers the tuner may allow; its slots gate how many upsert at once.
+                    pipeline = IngestPipeline(
+                        queue_depth=self.pipeline_queue_depth,
+                        writers=tuner.max_writers,
+                        threaded=self.pipeline_enabled,
+                        name=f"ingest-{game}",
+                    )
+                    pipeline_stats = pipeline.run(
+                        batches(),
+                        normalize,
+                        write,
+                    )
+                    self._publish_pipeline_stats(game, pipeline_stats)
+
+                    if getattr(fetched_rows, "empty", False):
+                        last_error = "Empty response received"
+                        print(f"  ⚠ {last_error}")
+                        break
 
-                    print(f"  ✓ Processed and stored {len(fetched_rows)} rows from endpoint.")
+                    if not endpoint_total_known:
+                        run.add_discovered(endpoint_rows)
+
+                    if not column_names and columns_source():
+                        column_names = columns_source()
+
+                    if ds_id and watermark_field:
+                        update_watermark(
+                            game,
+                            ds_id,
+                            field=watermark_field,
+                            value=stored_watermark,
+                            columns=None if delta else column_names,
+                        )
+                    # Keep the checkpoint while a failed batch leaves a gap, so the next run retries from it.
+                    if fingerprint and committed_offset >= endpoint_rows:
+                        clear_ingest_checkpoints(game, endpoint)
+
+                    if endpoint_rows == 0:
+                        if delta:
+                            print(f"  ✓ No new rows since {delta['since']}")
+                        else:
+                            print(f"  ⚠ No data in this endpoint (empty 'data' array)")
+                    else:
+                        print(
+                            f"  ✓ Processed and stored {endpoint_rows} rows from endpoint "
+                            f"({endpoint_parsed} parsed)."
+                        )
                     success = True
                     break
 
-                except requests.Timeout:
-                    last_error = f"Request timeout after {self.request_timeout}s"
-                    print(f"  ⚠ {last_error}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay * (2 ** attempt))
-
-                except requests.RequestException as req_error:
-                    last_error = f"Request error: {str(req_error)}"
-                    print(f"  ⚠ {last_error}")
-                    if hasattr(req_error, 'response') and req_error.response is not None:
-                        print(f"  Response status: {req_error.response.status_code}")
-                        print(f"  Response preview: {req_error.response.text[:200]}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay * (2 ** attempt))
-                        continue
-                    break
-                except Exception as unexpected_error:
-                    last_error = f"Unexpected error: {str(unexpected_error)}"
-                    print(f"  ✗ {last_error}")
-                    import traceback
-                    traceback.print_exc()
-                    break
+            except IngestCancelled:
+                print("  ⏹ Cancelled; rows committed so far stay checkpointed")
+                raise
+            except requests.Timeout:
+                last_error = f"Request timeout after {self.request_timeout}s"
+                print(f"  ⚠ {last_error}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay * (2 ** attempt))
+
+            except requests.RequestException as req_error:
+                last_error = f"Request error: {str(req_error)}"
+                print(f"  ⚠ {last_error}")
+                if hasattr(req_error, 'response') and req_error.response is not None:
+                    print(f"  Response status: {req_error.response.status_code}")
+                    print(f"  Response preview: {req_error.response.text[:200]}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay * (2 ** attempt))
+                    continue
+                break
+            except ValueError as json_error:
+                last_error = f"Invalid JSON response: {str(json_error)}"
+                print(f"  ⚠ {last_error}")
+                break
+            except Exception as unexpected_error:
+                last_error = f"Unexpected error: {str(unexpected_error)}"
+                print(f"  ✗ {last_error}")
+                import traceback
+                traceback.print_exc()
+                break
 
-            if not success and last_error:
-                print(f"  ✗ Failed to fetch from endpoint: {last_error}")
-                continue
+        if not success and last_error:
+            print(f"  ✗ Failed to fetch from endpoint: {last_error}")
+        return column_names
 
-        return total_rows_processed - rows_before, rows_added, column_names
+    def _process_endpoints(self, game: str, endpoints: list[str], collection, column_names: list[str],
+                           total_rows_processed: int, progress_callback=None, existing_ids: set[str] | None = None,
+                           deltas: dict[str, dict] | None = None, row_id_scheme: str | None = None,
+                           cancel_event: threading.Event | None = None):
+        """
+        Process a list of endpoints and return (rows_processed, rows_added, updated_column_names).
+
+        Endpoints are downloaded concurrently (up to INGEST_ENDPOINT_CONCURRENCY)
+        through the shared HTTP pool; each keeps its own column metadata.
+        `deltas` maps endpoints to delta plans for incremental fetches. Setting
+        `cancel_event` raises IngestCancelled before the next batch is read.
+        """
+        deltas = deltas or {}
+        existing_ids = existing_ids if existing_ids is not None else set()
+        run = _IngestRun(
+            rows_before=total_rows_processed,
+            existing_ids=existing_ids,
+            progress_callback=progress_callback,
+            progress_interval_s=self.progress_interval_s,
+            row_id_scheme=row_id_scheme or self.row_id_scheme,
+            tuner=self._new_tuner(game),
+            cancel_event=cancel_event,
+            draw_store=get_draw_store(game) if draw_store_enabled() else None,
+        )
+
+        labels = [f"{idx + 1}/{len(endpoints)}" for idx in range(len(endpoints))]
+        workers = min(len(endpoints), self.endpoint_concurrency)
+        try:
+            if workers <= 1:
+                endpoint_columns = [
+                    self._process_endpoint(
+                        game, endpoint, label, collection, list(column_names), existing_ids, run, deltas.get(endpoint)
+                    )
+                    for endpoint, label in zip(endpoints, labels)
+                ]
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"ingest-{game}-endpoint") as pool:
+                    futures = [
+                        pool.submit(
+                            self._process_endpoint,
+                            game, endpoint, label, collection, list(column_names), existing_ids, run,
+                            deltas.get(endpoint),
+                        )
+                        for endpoint, label in zip(endpoints, labels)
+                    ]
+                    endpoint_columns = [future.result() for future in futures]
+        finally:
+            # Record the ordinals of stored rows even when the run is cancelled or fails.
+            if run.ordinal_range is not None:
+                update_draw_ordinals(game, low=run.ordinal_range[0], high=run.ordinal_range[1])
+            if run.rows_without_ordinal:
+                # Range queries would miss these rows until draw_fields_backfill covers them.
+                update_draw_ordinals(game, complete=False)
+        self._remember_tuning(game, run.tuner)
+
+        if not column_names:
+            column_names = next((cols for cols in endpoint_columns if cols), [])
+        return run.rows_processed, run.rows_added, column_names
+
+    def _dataset_columns(self, endpoint: str) -> list[str]:
+        """Column field names of a Socrata dataset from its view metadata (cached)."""
+        ds_id = socrata_delta.dataset_id(endpoint)
+        parts = urlsplit(endpoint)
+        cache_key = f"columns:{parts.netloc}:{ds_id}"
+        cached = payload_cache.load_json(cache_key, self.catalog_cache_ttl_s)
+        if isinstance(cached, list):
+            return cached
+        with http_pool.get(
+            f"{parts.scheme}://{parts.netloc}/api/views/{ds_id}.json",
+            headers={"Accept-Encoding": "gzip"},
+            timeout=self.request_timeout,
+        ) as response:
+            response.raise_for_status()
+            view = response.json() or {}
+        columns = [col.get("fieldName") for col in view.get("columns") or [] if col.get("fieldName")]
+        payload_cache.store_json(cache_key, columns)
+        return columns
+
+    def _scan_max_value(self, collection, field: str) -> str | None:
+        """One-time scan of stored metadatas for the largest `field` value."""
+        best = None
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=self.watermark_scan_page_size, offset=offset)
+            metadatas = page.get("metadatas") or []
+            for metadata in metadatas:
+                value = socrata_delta.normalize_value((metadata or {}).get(field))
+                if value and (best is None or value > best):
+                    best = value
+            if len(metadatas) < self.watermark_scan_page_size:
+                return best
+            offset += len(metadatas)
+
+    def _plan_delta(self, game: str, endpoints: list[str], collection) -> dict[str, dict] | None:
+        """
+        Build per-endpoint delta plans for an incremental sync.
+
+        Returns None when any endpoint cannot be fetched incrementally (not a
+        Socrata dataset, unknown columns or date field), in which case the
+        caller falls back to a full download. Missing watermarks are bootstrapped
+        once by scanning the collection for its newest draw date.
+        """
+        plans: dict[str, dict] = {}
+        scanned: dict[str, str | None] = {}
+        bonus_keys = (GAME_CONFIGS.get(game) or {}).get("bonus_keys") or []
+        for endpoint in endpoints:
+            ds_id = socrata_delta.dataset_id(endpoint)
+            url = socrata_delta.resource_url(endpoint)
+            if not ds_id or not url:
+                return None
+            mark = get_watermark(game, ds_id)
+            columns = mark.get("columns")
+            if not columns:
+                columns = self._dataset_columns(endpoint)
+                mark = update_watermark(game, ds_id, columns=columns)
+            field = mark.get("field") or socrata_delta.date_field(columns)
+            select = socrata_delta.parser_columns(columns, bonus_keys)
+            if not field or field not in select:
+                return None
+            since = mark.get("value")
+            if not since:
+                if field not in scanned:
+                    print(f"  ↳ Bootstrapping {field} watermark for {game} from stored draws...")
+                    scanned[field] = self._scan_max_value(collection, field)
+                since = scanned[field]
+                if not since:
+                    return None
+                update_watermark(game, ds_id, field=field, value=since)
+            plans[endpoint] = {
+                "resource_url": url,
+                "field": field,
+                "since": since,
+                "select": select,
+            }
+        return plans
+
+    def _boundary_ids(self, game: str, collection, plans: dict[str, dict]) -> set[str]:
+        """Content digests of stored draws on each plan's watermark day (re-fetched by `>=`)."""
+        digests: set[str] = set()
+        for plan in plans.values():
+            try:
+                page = collection.get(where={plan["field"]: plan["since"]}, include=["metadatas"])
+            except Exception as boundary_error:
+                print(f"  ⚠ Could not load boundary draws for {plan['since']}: {boundary_error}")
+                continue
+            for metadata in page.get("metadatas") or []:
+                digests.add(socrata_delta.content_digest(game, metadata or {}, plan["select"]))
+        return digests
 
     def _build_success_result(
         self,
@@ -408,6 +1087,7 @@ class IngestService:
         final_total: int,
         force: bool,
         skipped_fetch: bool = False,
+        delta: bool = False,
     ) -> dict:
         net_added = max(final_total - existing_count, 0)
         return {
@@ -419,15 +1099,19 @@ class IngestService:
             "incremental": bool(existing_count > 0 and not force),
             "added_in_run": total_rows_added,
             "skipped_fetch": skipped_fetch,
+            "delta": delta,
         }
 
-    def fetch_and_sync(self, game: str, progress_callback=None, force: bool = False):
+    def fetch_and_sync(self, game: str, progress_callback=None, force: bool = False,
+                       cancel_event: threading.Event | None = None, delta_only: bool = False):
         """
         Fetch game data and sync to ChromaDB in batches.
         
         Args:
             game: Game name
             progress_callback: Optional callback function(rows_fetched, total_rows) for progress tracking
+            cancel_event: Optional event; once set, the sync raises IngestCancelled at the next batch boundary
+            delta_only: Only run an incremental (delta) sync; skip instead of downloading full datasets
         """
         game_key = resolve_game_key(game)
         if not game_key:
@@ -441,8 +1125,7 @@ class IngestService:
                 f"Game '{game_key}' endpoint not found in configured datasets or Socrata catalog. "
                 f"Available configured games: {list(DATASET_ENDPOINTS.keys())}"
             )
-        total_rows_processed = 0
-        column_names = []
+        self._publish_pipeline_stats(game_key, {})
 
         collection_name = game_key
         if force:
@@ -452,25 +1135,100 @@ class IngestService:
                 invalidate_draw_count(collection_name)
             except Exception:
                 pass
-        # Use default embedding function to avoid dimension mismatch
-        default_ef = embedding_functions.DefaultEmbeddingFunction()
-        
         # Lazy import to avoid ChromaDB connection during module import
         from .chroma_client import chroma_client
         
         try:
             collection = chroma_client.client.get_or_create_collection(
                 name=collection_name,
-                embedding_function=default_ef
+                # Shared warm model + content-hash cache; same default model, so dimensions match.
+                embedding_function=shared_embedding_function
             )
             print(f"✓ Connected to collection '{collection_name}'")
         except Exception as conn_error:
             raise Exception(f"Failed to connect to ChromaDB collection '{collection_name}': {str(conn_error)}")
 
-        existing_count = chroma_client.count_documents(collection_name, allow_refresh=False)
-        existing_ids: set[str] = set()
+        # Emptiness comes from a live count: the cached draw count was just invalidated
+        # on force runs and is missing for games that were never counted.
+        collection_empty = False
+        try:
+            existing_count = int(collection.count() or 0)
+            collection_empty = existing_count == 0
+        except Exception as count_error:
+            print(f"  ⚠ [{game_key.upper()}] Live count failed ({count_error}); using the cached draw count")
+            existing_count = chroma_client.count_documents(collection_name, allow_refresh=False)
+        if collection_empty:
+            clear_watermarks(game_key)
+            clear_ingest_checkpoints(game_key)
+            # Only a verified-empty collection starts ordinal-complete (otherwise only a full
+            # draw_fields_backfill marks it); _process_endpoints withdraws the flag as soon as
+            # it stores a row without a draw_ordinal.
+            update_draw_ordinals(game_key, complete=True)
+        # An interrupted full download must be finished before delta/skip shortcuts
+        # apply: its watermark and count only cover part of the dataset.
+        resuming = self.checkpoints_enabled and has_ingest_checkpoint(game_key)
+        if resuming:
+            print(f"↻ [{game_key.upper()}] Resuming an interrupted ingest from its checkpoints")
+        row_id_scheme = self._resolve_row_id_scheme(game_key, collection_empty)
+        id_index = get_id_index(game_key)
+        try:
+            id_index.sync_with_collection(collection, existing_count, page_size=self.id_index_page_size)
+            existing_ids = KnownIds(id_index)
+        except Exception as index_error:
+            print(
+                f"  ⚠ Could not load id index ({index_error}); "
+                "falling back to upsert-only sync"
+            )
+            existing_ids = set()
+        if draw_store_enabled():
+            try:
+                get_draw_store(game_key).sync_with_collection(collection, existing_count)
+            except Exception as store_error:
+                print(f"  ⚠ Could not build local draw store ({store_error}); readers will use Chroma")
+
+        if existing_count > 0 and not force and self.delta_enabled and not resuming:
+            try:
+                delta_plans = self._plan_delta(game_key, endpoints, collection)
+            except Exception as plan_error:
+                print(f"  ⚠ [{game_key.upper()}] Delta sync unavailable ({plan_error}); using full download")
+                delta_plans = None
+            if delta_plans:
+                print(
+                    f"↻ [{game_key.upper()}] Existing records detected ({existing_count}). "
+                    "Delta sync: fetching draws since the stored watermark."
+                )
+                boundary_ids = self._boundary_ids(game_key, collection, delta_plans)
+                if isinstance(existing_ids, KnownIds):
+                    existing_ids.extra.update(boundary_ids)
+                else:
+                    existing_ids = boundary_ids
+                return self._finish_sync(
+                    game_key,
+                    collection,
+                    endpoints,
+                    existing_count=existing_count,
+                    existing_ids=existing_ids,
+                    force=force,
+                    progress_callback=progress_callback,
+                    deltas=delta_plans,
+                    row_id_scheme=row_id_scheme,
+                    cancel_event=cancel_event,
+                )
 
-        if existing_count > 0 and not force:
+        if delta_only:
+            print(f"⏭ [{game_key.upper()}] Delta sync unavailable; skipping full download for delta-only sync")
+            if progress_callback:
+                progress_callback(existing_count, existing_count)
+            return self._build_success_result(
+                existing_count=existing_count,
+                total_rows_processed=0,
+                total_rows_added=0,
+                final_total=existing_count,
+                force=force,
+                skipped_fetch=True,
+            )
+
+        if existing_count > 0 and not force and not resuming:
             if existing_count >= self.skip_fetch_threshold:
                 print(
                     f"⏭ [{game_key.upper()}] Fast-path skip: {existing_count} rows already stored "
@@ -491,22 +1249,49 @@ class IngestService:
                 f"↻ [{game_key.upper()}] Existing records detected ({existing_count}). "
                 "Incremental sync: only missing draws will be added."
             )
-            if existing_count <= self.max_id_preload:
-                try:
-                    existing_payload = collection.get(include=[])
-                    existing_ids = set(existing_payload.get("ids") or [])
-                    print(f"  ✓ Loaded {len(existing_ids)} existing IDs for dedupe")
-                except Exception as existing_error:
-                    print(
-                        f"  ⚠ Could not pre-load existing IDs ({existing_error}); "
-                        "falling back to upsert-only sync"
-                    )
-            else:
-                print(
-                    f"  ↳ Skipping ID preload ({existing_count} > {self.max_id_preload}); "
-                    "upsert dedupe only"
-                )
 
+        return self._finish_sync(
+            game_key,
+            collection,
+            endpoints,
+            existing_count=existing_count,
+            existing_ids=existing_ids,
+            force=force,
+            progress_callback=progress_callback,
+            row_id_scheme=row_id_scheme,
+            cancel_event=cancel_event,
+        )
+
+    def _resolve_row_id_scheme(self, game: str, collection_empty: bool) -> str:
+        """
+        Pick the row id scheme for a collection and remember it.
+
+        INGEST_LEGACY_ROW_IDS=1 forces md5(str(row)). Only a collection whose
+        live count is 0 starts on fast ids. Any other collection keeps the
+        scheme it was first ingested with, and populated collections with no
+        record predate the fast scheme and therefore use legacy ids.
+        """
+        if self.legacy_row_ids:
+            return ROW_ID_LEGACY
+        stored = get_row_id_scheme(game)
+        if collection_empty:
+            scheme = ROW_ID_FAST
+        elif stored in (ROW_ID_FAST, ROW_ID_LEGACY):
+            scheme = stored
+        else:
+            scheme = ROW_ID_LEGACY
+        if scheme != stored:
+            set_row_id_scheme(game, scheme)
+        return scheme
+
+    def _finish_sync(self, game_key: str, collection, endpoints: list[str], *, existing_count: int,
+                     existing_ids: set[str], force: bool, progress_callback=None,
+                     deltas: dict[str, dict] | None = None, row_id_scheme: str | None = None,
+                     cancel_event: threading.Event | None = None) -> dict:
+        """Fetch `endpoints` into `collection`, then update counts, hooks and build the result."""
+        collection_name = game_key
+        column_names = []
+        total_rows_processed = 0
         rows_processed, rows_added, column_names = self._process_endpoints(
             game=game_key,
             endpoints=endpoints,
@@ -515,11 +1300,15 @@ class IngestService:
             total_rows_processed=total_rows_processed,
             progress_callback=progress_callback,
             existing_ids=existing_ids,
+            deltas=deltas,
+            row_id_scheme=row_id_scheme,
+            cancel_event=cancel_event,
         )
         total_rows_processed += rows_processed
         total_rows_added = rows_added
 
-        if rows_processed == 0 and self.fallback_on_empty:
+        # An empty delta just means no new draws were published.
+        if rows_processed == 0 and self.fallback_on_empty and not deltas:
             print(f"⚠ [{game_key.upper()}] No rows from configured endpoints; trying catalog fallback candidates...")
             fallback_endpoints = self._fetch_catalog_endpoints(game_key)
             configured_set = set(endpoints)
@@ -534,6 +1323,8 @@ class IngestService:
                     total_rows_processed=total_rows_processed,
                     progress_callback=progress_callback,
                     existing_ids=existing_ids,
+                    row_id_scheme=row_id_scheme,
+                    cancel_event=cancel_event,
                 )
                 total_rows_processed += fallback_processed
                 total_rows_added += fallback_added
@@ -542,6 +1333,12 @@ class IngestService:
             raise Exception(f"No data was successfully ingested for game '{game_key}'. Check backend logs for details.")
 
         final_total = max(existing_count + total_rows_added, existing_count, total_rows_processed)
+        if draw_store_enabled():
+            # Fold this run's draws into the memory-mapped arrays readers open.
+            try:
+                get_draw_store(game_key).compact()
+            except Exception as store_error:
+                print(f"⚠ [{game_key.upper()}] Draw store compaction skipped: {store_error}")
         try:
             from state.draw_counts import update_draw_count
 
@@ -566,12 +1363,20 @@ class IngestService:
                     on_new_draw_metadata(game_key, metas[0], ids[0] if ids else None)
             except Exception as hook_error:
                 print(f"⚠ [{game_key.upper()}] Weight update hook skipped: {hook_error}")
-        return self._build_success_result(
+        result = self._build_success_result(
             existing_count=existing_count,
             total_rows_processed=total_rows_processed,
             total_rows_added=total_rows_added,
             final_total=final_total,
             force=force,
+            delta=bool(deltas),
         )
+        pipeline_stats = self.get_pipeline_stats(game_key)
+        if pipeline_stats:
+            result["pipeline"] = pipeline_stats
+        tuning = self.get_tuning(game_key)
+        if tuning:
+            result["tuning"] = tuning
+        return result
 
 ingest_service = IngestService()
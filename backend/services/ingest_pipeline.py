@@ -0,0 +1,238 @@
+"""
+Staged reader -> normalizer -> writer pipeline for draw ingestion.
+
+Each stage runs on its own thread and hands work to the next through a bounded
+queue, so fetching/parsing, metadata normalization and Chroma upserts overlap.
+A full queue blocks the upstream stage (backpressure) instead of buffering the
+whole dataset. Per-stage counters are exposed through `snapshot()` for the
+ingest progress payload.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+_DONE = object()
+_POLL_S = 0.2
+
+
+class StageStats:
+    """Throughput and wait-time counters for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.batches = 0
+        self.rows = 0
+        self.busy_s = 0.0
+        self.wait_input_s = 0.0
+        self.wait_output_s = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, *, rows: int = 0, busy_s: float = 0.0, wait_input_s: float = 0.0,
+               wait_output_s: float = 0.0, batch: bool = False) -> None:
+        with self._lock:
+            if batch:
+                self.batches += 1
+            self.rows += rows
+            self.busy_s += busy_s
+            self.wait_input_s += wait_input_s
+            self.wait_output_s += wait_output_s
+
+    def snapshot(self, elapsed_s: float) -> dict:
+        with self._lock:
+            busy_per_worker = self.busy_s / max(self.workers, 1)
+            return {
+                "workers": self.workers,
+                "batches": self.batches,
+                "rows": self.rows,
+                "busy_s": round(self.busy_s, 3),
+                "rows_per_s": round(self.rows / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+                "capacity_rows_per_s": round(self.rows / busy_per_worker, 1) if busy_per_worker > 0 else None,
+                "utilization": round(min(1.0, busy_per_worker / elapsed_s), 3) if elapsed_s > 0 else 0.0,
+                "backpressure_s": round(self.wait_output_s, 3),
+                "starved_s": round(self.wait_input_s, 3),
+            }
+
+
+class IngestPipeline:
+    """
+    Run `read -> normalize -> write` over batches with bounded hand-off queues.
+
+    - `batches`: iterable of raw row batches (iterating it performs the fetch).
+    - `normalize(batch, index)`: returns an opaque record bundle for the writer.
+    - `write(bundle, index)`: stores the bundle; exceptions here are treated as
+      fatal, so writers should handle their own per-batch retries.
+
+    With `threaded=False` the same callbacks run inline on the caller's thread.
+    Errors raised by any stage are re-raised from `run()` after the other stages
+    have been told to stop.
+    """
+
+    def __init__(self, *, queue_depth: int = 2, writers: int = 1, threaded: bool = True, name: str = "ingest"):
+        self.queue_depth = max(1, int(queue_depth))
+        self.writers = max(1, int(writers))
+        self.threaded = threaded
+        self.name = name
+        self.stats = {
+            "reader": StageStats("reader"),
+            "normalizer": StageStats("normalizer"),
+            "writer": StageStats("writer", workers=self.writers),
+        }
+        self._queues: dict[str, queue.Queue] = {}
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._abort = threading.Event()
+        self._errors: list[BaseException] = []
+        self._errors_lock = threading.Lock()
+
+    # -- reporting ---------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.time()) - self._started_at
+        stages = {name: stats.snapshot(elapsed) for name, stats in self.stats.items()}
+        capacities = {
+            name: stage["capacity_rows_per_s"]
+            for name, stage in stages.items()
+            if stage["capacity_rows_per_s"]
+        }
+        return {
+            "mode": "pipelined" if self.threaded else "serial",
+            "elapsed_s": round(elapsed, 3),
+            "queue_depth": self.queue_depth,
+            "queues": {name: q.qsize() for name, q in self._queues.items()},
+            "stages": stages,
+            "bottleneck": min(capacities, key=capacities.get) if capacities else None,
+        }
+
+    # -- plumbing ----------------------------------------------------------
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._errors_lock:
+            self._errors.append(exc)
+        self._abort.set()
+
+    def _put(self, q: queue.Queue, item: Any, stats: StageStats) -> bool:
+        started = time.perf_counter()
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=_POLL_S)
+                stats.record(wait_output_s=time.perf_counter() - started)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, stats: StageStats):
+        started = time.perf_counter()
+        while not self._abort.is_set():
+            try:
+                item = q.get(timeout=_POLL_S)
+                stats.record(wait_input_s=time.perf_counter() - started)
+                return item
+            except queue.Empty:
+                continue
+        return _DONE
+
+    # -- stages ------------------------------------------------------------
+
+    def _reader(self, batches: Iterable[list], out_q: queue.Queue) -> None:
+        stats = self.stats["reader"]
+        try:
+            iterator = iter(batches)
+            index = 0
+            while not self._abort.is_set():
+                started = time.perf_counter()
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    break
+                stats.record(rows=len(batch), busy_s=time.perf_counter() - started, batch=True)
+                if not self._put(out_q, (index, batch), stats):
+                    return
+                index += 1
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._put(out_q, _DONE, stats)
+
+    def _normalizer(self, normalize: Callable, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        stats = self.stats["normalizer"]
+        try:
+            while True:
+                item = self._get(in_q, stats)
+                if item is _DONE:
+                    break
+                index, batch = item
+                started = time.perf_counter()
+                bundle = normalize(batch, index)
+                stats.record(rows=len(batch), busy_s=time.perf_counter() - started, batch=True)
+                if not self._put(out_q, (index, len(batch), bundle), stats):
+                    return
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            for _ in range(self.writers):
+                self._put(out_q, _DONE, stats)
+
+    def _writer(self, write: Callable, in_q: queue.Queue) -> None:
+        stats = self.stats["writer"]
+        try:
+            while True:
+                item = self._get(in_q, stats)
+                if item is _DONE:
+                    break
+                index, row_count, bundle = item
+                started = time.perf_counter()
+                write(bundle, index)
+                stats.record(rows=row_count, busy_s=time.perf_counter() - started, batch=True)
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _run_serial(self, batches: Iterable[list], normalize: Callable, write: Callable) -> None:
+        for index, batch in enumerate(batches):
+            started = time.perf_counter()
+            self.stats["reader"].record(rows=len(batch), batch=True)
+            bundle = normalize(batch, index)
+            normalized_at = time.perf_counter()
+            self.stats["normalizer"].record(rows=len(batch), busy_s=normalized_at - started, batch=True)
+            write(bundle, index)
+            self.stats["writer"].record(rows=len(batch), busy_s=time.perf_counter() - normalized_at, batch=True)
+
+    def run(self, batches: Iterable[list], normalize: Callable, write: Callable) -> dict:
+        """Drive all stages to completion and return the final snapshot."""
+        self._started_at = time.time()
+        try:
+            if not self.threaded:
+                self._run_serial(batches, normalize, write)
+                return self.snapshot()
+
+            read_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+            write_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+            self._queues = {"normalize": read_q, "write": write_q}
+            threads = [
+                threading.Thread(target=self._reader, args=(batches, read_q), daemon=True,
+                                 name=f"{self.name}-reader"),
+                threading.Thread(target=self._normalizer, args=(normalize, read_q, write_q), daemon=True,
+                                 name=f"{self.name}-normalizer"),
+            ]
+            threads.extend(
+                threading.Thread(target=self._writer, args=(write, write_q), daemon=True,
+                                 name=f"{self.name}-writer-{idx}")
+                for idx in range(self.writers)
+            )
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if self._errors:
+                raise self._errors[0]
+            return self.snapshot()
+        finally:
+            self._finished_at = time.time()
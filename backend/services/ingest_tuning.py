@@ -0,0 +1,161 @@
+"""
+Adaptive batch size and writer concurrency for Chroma upserts.
+
+Upsert latency depends on collection size and embedding load, so a fixed
+INGEST_BATCH_SIZE is either too timid for a fresh collection or too large for
+a busy one. `AimdController` adjusts both knobs from every observed upsert,
+TCP-style (additive increase, multiplicative decrease):
+
+- Upsert finished within INGEST_UPSERT_TARGET_S: grow the batch by a fixed
+  step; after one success per active writer, allow one more writer.
+- Upsert slower than the target: shrink the batch by INGEST_AIMD_DECREASE.
+- Upsert failed, or took twice the target: shrink the batch and the number of
+  writers.
+
+Everything stays within the configured min/max bounds. With INGEST_ADAPTIVE=0
+the controller pins the initial settings and only records latencies.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+
+
+class AimdController:
+    def __init__(self, *, batch_size: int, writers: int, min_batch_size: int | None = None,
+                 max_batch_size: int | None = None, min_writers: int = 1, max_writers: int | None = None,
+                 target_latency_s: float | None = None, decrease: float | None = None,
+                 batch_step: int | None = None, adaptive: bool | None = None):
+        if adaptive is None:
+            adaptive = os.getenv("INGEST_ADAPTIVE", "1") != "0"
+        self.adaptive = adaptive
+        if min_batch_size is None:
+            min_batch_size = int(os.getenv("INGEST_BATCH_SIZE_MIN", "500"))
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("INGEST_BATCH_SIZE_MAX", "16000"))
+        if max_writers is None:
+            max_writers = int(os.getenv("INGEST_WRITERS_MAX", "4"))
+        if target_latency_s is None:
+            target_latency_s = float(os.getenv("INGEST_UPSERT_TARGET_S", "2.0"))
+        if decrease is None:
+            decrease = float(os.getenv("INGEST_AIMD_DECREASE", "0.5"))
+
+        self.min_batch_size = max(1, min(min_batch_size, batch_size))
+        self.max_batch_size = max(batch_size, max_batch_size)
+        self.min_writers = max(1, min(min_writers, writers))
+        self.max_writers = max(writers, max_writers)
+        if not adaptive:
+            self.min_batch_size = self.max_batch_size = batch_size
+            self.min_writers = self.max_writers = writers
+        self.target_latency_s = max(0.01, target_latency_s)
+        self.decrease = min(max(decrease, 0.1), 0.95)
+        self.batch_step = max(1, batch_step or int(os.getenv("INGEST_BATCH_SIZE_STEP", "0")) or batch_size // 4)
+
+        self.batch_size = batch_size
+        self.writers = writers
+        self._active_writers = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            "upserts": 0,
+            "errors": 0,
+            "rows": 0,
+            "increases": 0,
+            "decreases": 0,
+            "latency_s_total": 0.0,
+            "latency_s_max": 0.0,
+            "peak_batch_size": batch_size,
+            "peak_writers": writers,
+        }
+
+    # -- knobs -------------------------------------------------------------
+
+    def current_batch_size(self) -> int:
+        with self._cond:
+            return self.batch_size
+
+    @contextmanager
+    def writer_slot(self):
+        """Hold one of the currently allowed writer slots for the duration of an upsert."""
+        with self._cond:
+            while self._active_writers >= self.writers:
+                self._cond.wait(timeout=0.5)
+            self._active_writers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active_writers -= 1
+                self._cond.notify_all()
+
+    # -- feedback ----------------------------------------------------------
+
+    def record(self, rows: int, latency_s: float, ok: bool = True) -> None:
+        """Feed one upsert outcome back into the controller."""
+        with self._cond:
+            self.stats["upserts"] += 1
+            self.stats["latency_s_total"] += latency_s
+            self.stats["latency_s_max"] = max(self.stats["latency_s_max"], latency_s)
+            if ok:
+                self.stats["rows"] += rows
+            else:
+                self.stats["errors"] += 1
+
+            if not ok or latency_s > 2 * self.target_latency_s:
+                self._shrink(writers=True)
+            elif latency_s > self.target_latency_s:
+                self._shrink(writers=False)
+            else:
+                self._grow()
+            self._cond.notify_all()
+
+    def _shrink(self, *, writers: bool) -> None:
+        batch_size = max(self.min_batch_size, int(self.batch_size * self.decrease))
+        writer_count = max(self.min_writers, int(self.writers * self.decrease)) if writers else self.writers
+        if (batch_size, writer_count) != (self.batch_size, self.writers):
+            self.stats["decreases"] += 1
+        self.batch_size = batch_size
+        self.writers = writer_count
+        self._successes = 0
+
+    def _grow(self) -> None:
+        batch_size = min(self.max_batch_size, self.batch_size + self.batch_step)
+        writer_count = self.writers
+        self._successes += 1
+        if self._successes >= self.writers:
+            writer_count = min(self.max_writers, self.writers + 1)
+            self._successes = 0
+        if (batch_size, writer_count) != (self.batch_size, self.writers):
+            self.stats["increases"] += 1
+        self.batch_size = batch_size
+        self.writers = writer_count
+        self.stats["peak_batch_size"] = max(self.stats["peak_batch_size"], batch_size)
+        self.stats["peak_writers"] = max(self.stats["peak_writers"], writer_count)
+
+    # -- reporting ---------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            upserts = self.stats["upserts"]
+            return {
+                "adaptive": self.adaptive,
+                "batch_size": self.batch_size,
+                "writers": self.writers,
+                "bounds": {
+                    "batch_size": [self.min_batch_size, self.max_batch_size],
+                    "writers": [self.min_writers, self.max_writers],
+                },
+                "target_latency_s": self.target_latency_s,
+                "upserts": upserts,
+                "errors": self.stats["errors"],
+                "error_rate": round(self.stats["errors"] / upserts, 4) if upserts else 0.0,
+                "rows": self.stats["rows"],
+                "increases": self.stats["increases"],
+                "decreases": self.stats["decreases"],
+                "avg_latency_s": round(self.stats["latency_s_total"] / upserts, 3) if upserts else None,
+                "max_latency_s": round(self.stats["latency_s_max"], 3),
+                "peak_batch_size": self.stats["peak_batch_size"],
+                "peak_writers": self.stats["peak_writers"],
+            }
+
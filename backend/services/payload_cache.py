@@ -0,0 +1,201 @@
+"""
+On-disk cache of raw Socrata payloads with conditional-GET validators.
+
+Each endpoint's last successful body is kept gzip-compressed under
+`DATA_DIR/ingest_cache` next to a small JSON file holding its `ETag` and
+`Last-Modified` headers. Later downloads send `If-None-Match` /
+`If-Modified-Since`; on `304 Not Modified` the cached body is replayed locally
+instead of transferring the dataset again.
+
+The cache also keeps small JSON values with a TTL (memory + disk), used for
+catalog lookups that rarely change.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+_READ_CHUNK = 256 * 1024
+
+
+class PayloadCache:
+    def __init__(self, root: str | Path | None = None, enabled: bool | None = None):
+        default_root = Path(os.environ.get("DATA_DIR", "/data")) / "ingest_cache"
+        self.root = Path(root or os.getenv("INGEST_CACHE_DIR", str(default_root)))
+        if enabled is None:
+            enabled = os.getenv("INGEST_PAYLOAD_CACHE", "1") != "0"
+        self.enabled = enabled
+        self.compress_level = int(os.getenv("INGEST_CACHE_COMPRESS_LEVEL", "5"))
+        self._json_memory: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    # -- paths -------------------------------------------------------------
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, url: str) -> Path:
+        return self.root / "payloads" / f"{self._key(url)}.json.gz"
+
+    def _meta_path(self, url: str) -> Path:
+        return self.root / "payloads" / f"{self._key(url)}.meta.json"
+
+    def _json_path(self, name: str) -> Path:
+        return self.root / "json" / f"{self._key(name)}.json"
+
+    # -- payloads ----------------------------------------------------------
+
+    def get_meta(self, url: str) -> dict:
+        """Stored validators for `url`, or {} when there is no usable cached body."""
+        if not self.enabled or not self._body_path(url).exists():
+            return {}
+        try:
+            with self._meta_path(url).open("r", encoding="utf-8") as handle:
+                meta = json.load(handle) or {}
+            return meta if isinstance(meta, dict) else {}
+        except Exception:
+            return {}
+
+    def request_headers(self, url: str) -> dict:
+        """Headers for a conditional, gzip-encoded GET of `url`."""
+        headers = {"Accept-Encoding": "gzip"}
+        meta = self.get_meta(url)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def has_body(self, url: str) -> bool:
+        return bool(self.get_meta(url))
+
+    def iter_body(self, url: str, chunk_size: int = _READ_CHUNK) -> Iterator[bytes]:
+        """Replay the cached body of `url` as decompressed byte chunks."""
+        with gzip.open(self._body_path(url), "rb") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read_body(self, url: str) -> bytes:
+        return b"".join(self.iter_body(url))
+
+    def _write_meta(self, url: str, headers, size: int) -> None:
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "bytes": size,
+            "stored_at": time.time(),
+        }
+        path = self._meta_path(url)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False, indent=2)
+        os.replace(str(tmp), str(path))
+
+    def tee(self, url: str, headers, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Yield `chunks` unchanged while writing them to the cache.
+
+        The cached copy is only committed once the iterator is exhausted, so an
+        interrupted download never replaces a good cached body. Responses with
+        no validators are passed through without caching.
+        """
+        if not self.enabled or not (headers.get("ETag") or headers.get("Last-Modified")):
+            yield from chunks
+            return
+
+        body_path = self._body_path(url)
+        tmp = body_path.with_name(f"{body_path.name}.{threading.get_ident()}.tmp")
+        size = 0
+        handle = None
+        try:
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = gzip.open(tmp, "wb", compresslevel=self.compress_level)
+        except OSError as exc:
+            print(f"⚠ Failed to cache payload for {url}: {exc}")
+
+        committed = False
+        try:
+            for chunk in chunks:
+                if handle is not None and chunk:
+                    try:
+                        handle.write(chunk)
+                        size += len(chunk)
+                    except OSError as exc:
+                        # Caching is best effort; keep serving the download.
+                        print(f"⚠ Failed to cache payload for {url}: {exc}")
+                        handle.close()
+                        handle = None
+                yield chunk
+            if handle is not None:
+                try:
+                    handle.close()
+                    handle = None
+                    os.replace(str(tmp), str(body_path))
+                    self._write_meta(url, headers, size)
+                    committed = True
+                except OSError as exc:
+                    print(f"⚠ Failed to cache payload for {url}: {exc}")
+        finally:
+            if handle is not None:
+                handle.close()
+            if not committed:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+
+    def store_body(self, url: str, headers, body: bytes) -> None:
+        for _ in self.tee(url, headers, [body]):
+            pass
+
+    # -- small JSON values with TTL ----------------------------------------
+
+    def load_json(self, name: str, max_age_s: float):
+        """Return a value stored with `store_json` if younger than `max_age_s`, else None."""
+        if not self.enabled or max_age_s <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            cached = self._json_memory.get(name)
+        if cached and now - cached[0] < max_age_s:
+            return cached[1]
+        try:
+            with self._json_path(name).open("r", encoding="utf-8") as handle:
+                record = json.load(handle) or {}
+            stored_at = float(record.get("stored_at", 0))
+        except Exception:
+            return None
+        if now - stored_at >= max_age_s:
+            return None
+        with self._lock:
+            self._json_memory[name] = (stored_at, record.get("value"))
+        return record.get("value")
+
+    def store_json(self, name: str, value) -> None:
+        if not self.enabled:
+            return
+        stored_at = time.time()
+        with self._lock:
+            self._json_memory[name] = (stored_at, value)
+        try:
+            path = self._json_path(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as handle:
+                json.dump({"name": name, "stored_at": stored_at, "value": value}, handle, ensure_ascii=False)
+            os.replace(str(tmp), str(path))
+        except Exception as exc:
+            print(f"⚠ Failed to persist cache entry {name}: {exc}")
+
+
+payload_cache = PayloadCache()
@@ -313,6 +313,7 @@ class PredictorService:
         # Lazy import to avoid ChromaDB connection during module import
         from .chroma_client import chroma_client
         from services.trainer import TrainerService
+        from state.draw_store import load_draw_store
 
         game_key = str(game or "").strip().lower()
         artifact, load_error = load_model_artifact(game_key, self.models_dir)
@@ -330,17 +331,26 @@ class PredictorService:
         window_size = int(artifact.get("window_size", 1))
         rules = artifact.get("rules") or self._get_rules(game_key)
 
-        # Fetch recent draws from ChromaDB for prediction input
-        collection = chroma_client.client.get_collection(game_key)
         fetch_k = max(int(recent_k), window_size + 2)
-        data = collection.get(limit=fetch_k, include=["metadatas"])
-
-        if not data or not data["metadatas"]:
-            return {"status": "error", "message": "Not enough data to make a suggestion."}
-
-        metadatas = TrainerService()._sort_metadatas_chronologically(data["metadatas"])
-        sequences = [self._extract_sequence(meta, game_key) for meta in metadatas]
-        sequences = [seq for seq in sequences if seq]
+        store = load_draw_store(game_key)
+        if store is not None and len(store):
+            # Same parsed sequences the model was trained on.
+            sequences = store.sequences(fetch_k)
+        else:
+            # Fetch recent draws from ChromaDB for prediction input
+            collection = chroma_client.client.get_collection(game_key)
+            latest = chroma_client.get_latest_draws(game_key, fetch_k, collection=collection)
+            if latest is not None:
+                metadatas = latest[0]
+            else:
+                data = collection.get(limit=fetch_k, include=["metadatas"])
+                metadatas = TrainerService()._sort_metadatas_chronologically((data or {}).get("metadatas") or [])
+
+            if not metadatas:
+                return {"status": "error", "message": "Not enough data to make a suggestion."}
+
+            sequences = [self._extract_sequence(meta, game_key) for meta in metadatas]
+            sequences = [seq for seq in sequences if seq]
 
         if len(sequences) < window_size:
             return {"status": "error", "message": "Not enough historical draws for model window."}
@@ -4,6 +4,7 @@ Combines ChromaDB retrieval with Gemini LLM for context-aware responses
 """
 
 from services.chroma_client import chroma_client
+from services.embedding_backfill import embedding_backfill
 from services.gemini_client import gemini_client
 from config import settings
 
@@ -164,6 +165,8 @@ class RAGService:
     def _search_game_collection(self, query: str, game: str, top_k: int) -> list:
         """Search a specific game's ChromaDB collection"""
         try:
+            # Draws ingested with deferred embeddings get real vectors once RAG needs them.
+            embedding_backfill.ensure(game)
             collection = self.chroma_client.get_or_create_collection(game)
             results = collection.query(
                 query_texts=[query],
@@ -196,6 +199,7 @@ class RAGService:
             for collection_obj in collections:
                 game_name = collection_obj.name
                 try:
+                    embedding_backfill.ensure(game_name)
                     collection = self.chroma_client.get_or_create_collection(game_name)
                     results = collection.query(
                         query_texts=[query],
@@ -0,0 +1,80 @@
+"""
+Helpers for incremental (delta) fetches through the SODA resource API.
+
+Full ingests download `/api/views/<id>/rows.json?accessType=DOWNLOAD`. Delta
+syncs instead query `/resource/<id>.json` with SoQL: `$where` on the draw date
+watermark, `$select` of just the columns the draw parsers read, and
+`$limit`/`$offset` paging ordered by date.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+_VIEW_ID_RE = re.compile(r"/(?:api/views|resource)/([a-z0-9]{4}-[a-z0-9]{4})")
+_MILLIS_SUFFIX_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})\.000$")
+
+# Substrings of column names read by draw_loader / trainer parsers.
+_PARSER_COLUMN_HINTS = (
+    "date", "time", "winning", "number", "result", "bonus", "ball",
+    "midday", "evening", "daily", "multiplier", "extra",
+)
+
+
+def dataset_id(endpoint: str) -> str | None:
+    """Socrata 4x4 dataset id of a views/resource URL (None if not a Socrata URL)."""
+    match = _VIEW_ID_RE.search(urlsplit(endpoint).path)
+    return match.group(1) if match else None
+
+
+def resource_url(endpoint: str) -> str | None:
+    """Map a `rows.json` download URL to its SODA resource endpoint."""
+    ds_id = dataset_id(endpoint)
+    if not ds_id:
+        return None
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}/resource/{ds_id}.json"
+
+
+def normalize_value(value) -> str:
+    """Stringify a cell the way rows.json values are stored (drops SODA's `.000` millis)."""
+    if value is None:
+        return ""
+    text = str(value)
+    match = _MILLIS_SUFFIX_RE.match(text)
+    return match.group(1) if match else text
+
+
+def date_field(columns: list[str]) -> str | None:
+    """Pick the draw date column used as the watermark."""
+    names = [name for name in columns if name and not name.startswith(":")]
+    if "draw_date" in names:
+        return "draw_date"
+    for name in names:
+        if "date" in name.lower():
+            return name
+    return None
+
+
+def parser_columns(columns: list[str], bonus_keys: list[str] | None = None) -> list[str]:
+    """Subset of dataset columns the draw parsers need, in dataset order."""
+    bonus = {key.lower() for key in (bonus_keys or [])}
+    selected = []
+    for name in columns:
+        if not name or name.startswith(":"):
+            continue
+        lowered = name.lower()
+        if lowered in bonus or any(hint in lowered for hint in _PARSER_COLUMN_HINTS):
+            selected.append(name)
+    return selected
+
+
+def content_digest(game: str, metadata: dict, columns: list[str]) -> str:
+    """Stable id for a draw built from its parser-relevant column values only."""
+    parts = [game] + [f"{name}={normalize_value(metadata.get(name))}" for name in sorted(columns)]
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def soql_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
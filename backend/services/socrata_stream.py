@@ -0,0 +1,167 @@
+"""
+Incremental parser for Socrata `rows.json` payloads.
+
+`rows.json?accessType=DOWNLOAD` returns one large object of the form
+`{"meta": {"view": {"columns": [...]}}, "data": [[...], [...], ...]}`.
+Loading that with `response.json()` keeps the raw bytes and the full
+list-of-lists in memory at once. `SocrataRowStream` instead consumes the body
+chunk by chunk (e.g. from `response.iter_content`) and yields one row at a
+time, so peak memory is bounded by a single chunk plus the caller's batch.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+# Top-level keys whose list values are streamed element by element instead of
+# being decoded in one piece. Mirrors IngestService._extract_rows_and_columns.
+ROW_KEYS = ("data", "results", "records", "rows")
+
+_WHITESPACE = " \t\n\r"
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class SocrataRowStream:
+    """Yield rows from a chunked Socrata JSON body without materializing it."""
+
+    def __init__(self, chunks: Iterable[bytes | str]):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.meta: dict = {}
+        self.columns: list[str] = []
+        self.row_count_hint: int | None = None
+        self.rows_yielded = 0
+        self.empty = False
+
+    # -- buffer management -------------------------------------------------
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer. Returns False at end of input."""
+        if self._eof:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            text = self._text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buf += text
+                return True
+        tail = self._text_decoder.decode(b"", final=True)
+        if tail:
+            self._buf += tail
+        self._eof = True
+        return bool(tail)
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON payload: expected '{char}' but found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def _decode_value(self) -> Any:
+        """Decode one complete JSON value starting at the current position."""
+        if not self._peek():
+            raise ValueError("Invalid JSON payload: unexpected end of input")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A scalar ending exactly at the buffer edge may be truncated
+            # (e.g. `12` of `1234`); only accept it once more input is seen.
+            if end >= len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    # -- structure ---------------------------------------------------------
+
+    def _absorb_meta(self, meta: Any) -> None:
+        if not isinstance(meta, dict):
+            return
+        self.meta = meta
+        columns_meta = (meta.get("view") or {}).get("columns") or []
+        self.columns = [col.get("fieldName", f"col_{idx}") for idx, col in enumerate(columns_meta)]
+        for col in columns_meta:
+            cached = col.get("cachedContents") or {}
+            if "non_null" not in cached and "null" not in cached:
+                continue
+            try:
+                self.row_count_hint = int(cached.get("non_null") or 0) + int(cached.get("null") or 0)
+            except (TypeError, ValueError):
+                continue
+            break
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._expect("[")
+        while True:
+            char = self._peek()
+            if char == "]":
+                self._pos += 1
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            if not char:
+                raise ValueError("Invalid JSON payload: unterminated array")
+            row = self._decode_value()
+            self.rows_yielded += 1
+            yield row
+
+    def _drain(self) -> None:
+        """Consume any remaining input so chunk sources (e.g. cache tees) complete."""
+        while self._fill():
+            self._pos = len(self._buf)
+
+    def __iter__(self) -> Iterator[Any]:
+        first = self._peek()
+        if not first:
+            self.empty = True
+            return
+        if first == "[":
+            yield from self._iter_array()
+            self._drain()
+            return
+        if first != "{":
+            raise ValueError(f"Invalid JSON payload: unexpected leading character {first!r}")
+
+        self._pos += 1
+        while True:
+            char = self._peek()
+            if char == "}":
+                self._pos += 1
+                self._drain()
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            if not char:
+                raise ValueError("Invalid JSON payload: unterminated object")
+            key = self._decode_value()
+            self._expect(":")
+            if key in ROW_KEYS and self._peek() == "[":
+                yield from self._iter_array()
+                continue
+            value = self._decode_value()
+            if key == "meta":
+                self._absorb_meta(value)
@@ -1,12 +1,15 @@
+import copy
 import json
 import os
-import re
+import threading
 import time
 import numpy as np
 import joblib
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
-from config import GAME_CONFIGS
+from services.training_pool import RssSampler, available_memory_bytes, fit_pool
+from services.training_search import successive_halving
+from utils import draw_numbers
 from utils.training_params import (
     extract_training_params,
     merge_training_params,
@@ -32,6 +35,15 @@ class TrainerService:
         self.data_limit = int(os.environ.get("TRAIN_DATA_LIMIT", defaults["data_limit"]))
         self.window_size = int(os.environ.get("TRAIN_WINDOW_SIZE", defaults["window_size"]))
         self.auto_tune = str(os.environ.get("TRAIN_AUTO_TUNE", "1")).lower() not in ("0", "false", "no")
+        # Only the grid search (TRAIN_SEARCH=grid) grows warm-started forests; see _train_iterative_collect.
+        self.warm_start = str(os.environ.get("TRAIN_WARM_START", "1")).lower() not in ("0", "false", "no")
+        self.search_strategy = str(os.environ.get("TRAIN_SEARCH", "halving")).strip().lower()
+        self.default_time_budget_s = float(os.environ.get("TRAIN_TIME_BUDGET_S", "0") or 0) or None
+        self.time_budget_s = self.default_time_budget_s
+        self.read_page_size = max(1, int(os.environ.get("TRAIN_READ_PAGE_SIZE", "5000")))
+        self.read_workers = max(1, int(os.environ.get("TRAIN_READ_WORKERS", "4")))
+        self._progress_callback = None
+        self._cancel_event = None
 
     @staticmethod
     def get_training_defaults():
@@ -135,6 +147,7 @@ class TrainerService:
         data_limit=None,
         window_size=None,
         auto_tune=None,
+        time_budget_s=None,
     ):
         if target_accuracy is not None:
             self.target_accuracy = float(target_accuracy)
@@ -156,256 +169,147 @@ class TrainerService:
             self.window_size = max(1, int(window_size))
         if auto_tune is not None:
             self.auto_tune = bool(auto_tune)
+        if time_budget_s is not None:
+            self.time_budget_s = float(time_budget_s) if float(time_budget_s) > 0 else None
+
+    def _report_progress(self, phase: str, **fields) -> None:
+        if self._progress_callback is None:
+            return
+        try:
+            self._progress_callback({"phase": phase, **fields})
+        except Exception as exc:
+            print(f"⚠ Training progress callback failed: {exc}")
+
+    def _cancel_requested(self) -> bool:
+        return self._cancel_event is not None and self._cancel_event.is_set()
 
     def _parse_numbers(self, raw_value: str):
-        tokens = re.findall(r"\d+", str(raw_value or ""))
-        return [int(token) for token in tokens]
+        return draw_numbers.parse_numbers(raw_value)
 
     def _parse_pick3_digits(self, raw_value: str):
-        text = str(raw_value or "").strip()
-        if not text:
-            return []
-        if text.isdigit():
-            padded = text.zfill(3)[-3:]
-            return [int(digit) for digit in padded]
-        return self._parse_numbers(text)
+        return draw_numbers.parse_pick3_digits(raw_value)
 
     def _get_rules(self, game: str):
-        base = {
-            "primary_count": 5,
-            "primary_min": 1,
-            "primary_max": 99,
-            "primary_unique": True,
-            "bonus_count": 0,
-            "bonus_min": 1,
-            "bonus_max": 99,
-            "bonus_keys": [],
-            "embedded_bonus_in_winning_numbers": False,
-        }
-        configured = GAME_CONFIGS.get(game, {}) or {}
-        merged = {**base, **configured}
-        merged["bonus_keys"] = [str(k).lower() for k in (merged.get("bonus_keys") or [])]
-        return merged
+        return draw_numbers.game_rules(game)
 
     def _clamp_primary(self, numbers, rules):
-        valid = [
-            int(n)
-            for n in numbers
-            if rules["primary_min"] <= int(n) <= rules["primary_max"]
-        ]
-
-        if not valid:
-            return []
-
-        if rules.get("primary_unique", True):
-            seen = set()
-            uniq = []
-            for value in valid:
-                if value not in seen:
-                    seen.add(value)
-                    uniq.append(value)
-            valid = uniq
-
-        if len(valid) < rules["primary_count"]:
-            return []
-        return valid[:rules["primary_count"]]
+        return draw_numbers.clamp_primary(numbers, rules)
 
     def _extract_bonus_values(self, metadata, rules):
-        bonus_count = int(rules.get("bonus_count", 0) or 0)
-        if bonus_count <= 0:
-            return []
-
-        values = []
-        bonus_min = int(rules.get("bonus_min", 1))
-        bonus_max = int(rules.get("bonus_max", 99))
-
-        for key, value in (metadata or {}).items():
-            key_lower = str(key).lower()
-            if key_lower in rules["bonus_keys"] or ("bonus" in key_lower and "winning" not in key_lower):
-                parsed = self._parse_numbers(value)
-                for item in parsed:
-                    if bonus_min <= item <= bonus_max:
-                        values.append(item)
-                        if len(values) >= bonus_count:
-                            return values[:bonus_count]
-        return values[:bonus_count]
+        return draw_numbers.extract_bonus_values(metadata, rules)
 
     def _extract_primary_candidate(self, metadata, game: str | None = None):
-        preferred = []
-        fallback = []
-        daily_fields = []
-
-        for key, value in (metadata or {}).items():
-            key_lower = str(key).lower()
-            if "draw_number" in key_lower or not str(value or "").strip():
-                continue
-
-            if key_lower in ("winning_numbers", "winningnumbers"):
-                preferred.append(value)
-            elif key_lower in ("midday_daily", "evening_daily"):
-                daily_fields.append(value)
-            elif "winning" in key_lower and "number" in key_lower:
-                fallback.append(value)
-            elif "numbers" in key_lower or "result" in key_lower:
-                fallback.append(value)
-
-        parse_value = self._parse_pick3_digits if str(game or "").lower() == "pick3" else self._parse_numbers
-        for candidate in preferred + daily_fields + fallback:
-            numbers = parse_value(candidate)
-            if numbers:
-                return numbers
-
-        return []
+        return draw_numbers.extract_primary_candidate(metadata, game=game)
 
     def _extract_record_sequence(self, metadata, game: str):
-        rules = self._get_rules(game)
-        winning_numbers = self._extract_primary_candidate(metadata, game=game)
-        if not winning_numbers:
-            return []
-
-        if str(game or "").lower() == "pick3":
-            if len(winning_numbers) == 1 and int(winning_numbers[0]) > 9:
-                winning_numbers = self._parse_pick3_digits(str(winning_numbers[0]))
-            elif len(winning_numbers) > 3:
-                flattened = []
-                for value in winning_numbers:
-                    flattened.extend(self._parse_pick3_digits(str(value)))
-                winning_numbers = flattened
-
-        primary_count = int(rules["primary_count"])
-        bonus_count = int(rules.get("bonus_count", 0) or 0)
-
-        embedded_bonus = []
-        if rules.get("embedded_bonus_in_winning_numbers") and bonus_count > 0 and len(winning_numbers) >= primary_count + bonus_count:
-            embedded_bonus = winning_numbers[primary_count:primary_count + bonus_count]
-            winning_numbers = winning_numbers[:primary_count]
-
-        primary_numbers = self._clamp_primary(winning_numbers, rules)
-        if len(primary_numbers) != primary_count:
-            return []
-
-        bonus_numbers = self._extract_bonus_values(metadata, rules)
-        if not bonus_numbers and embedded_bonus:
-            bonus_min = int(rules.get("bonus_min", 1))
-            bonus_max = int(rules.get("bonus_max", 99))
-            bonus_numbers = [int(n) for n in embedded_bonus if bonus_min <= int(n) <= bonus_max][:bonus_count]
-
-        if bonus_count > 0 and bonus_numbers:
-            return primary_numbers + bonus_numbers[:bonus_count]
-        return primary_numbers
+        return draw_numbers.extract_record_sequence(metadata, game, self._get_rules(game))
 
     def _metadata_sort_key(self, metadata):
-        if not isinstance(metadata, dict):
-            return ""
-        for key in ("draw_date", "drawdate", "date", "drawn_at", "draw_datetime"):
-            for variant in (key, key.upper(), key.title()):
-                value = metadata.get(variant)
-                if value:
-                    return str(value)
-        return ""
+        return draw_numbers.metadata_sort_key(metadata)
 
     def _sort_metadatas_chronologically(self, metadatas):
         if not metadatas:
             return []
         return sorted(metadatas, key=self._metadata_sort_key)
 
-    def _load_all_metadatas(self, collection):
-        page_size = 5000
-        total = int(collection.count() or 0)
-        if total <= 0:
-            return []
+    def _load_sequences(self, game: str):
+        """
+        Chronological winning-number sequences for `game`, None when it has no data.
 
-        if self.data_limit and self.data_limit > 0:
-            total = min(total, self.data_limit)
-
-        metadatas = []
-        offset = 0
-        while offset < total:
-            batch_size = min(page_size, total - offset)
-            data = collection.get(
-                limit=batch_size,
-                offset=offset,
-                include=["metadatas"],
-            )
-            batch = data.get("metadatas") if data else None
-            if not batch:
-                break
-            metadatas.extend(batch)
-            offset += len(batch)
-            if len(batch) < batch_size:
-                break
-        return metadatas
+        Reads the local draw store (latest `data_limit` draws when set). Without
+        it, the newest `data_limit` draws come from a `draw_ordinal` range
+        query, and full histories from a parallel paged read that parses each
+        page into number arrays as it arrives.
+        """
+        from state.draw_store import load_draw_store, read_collection_draws, sequences_from_numbers
 
-    def _extract_winning_sequences(self, metadatas, game: str):
-        sequences = []
-        game_key = str(game or "").lower()
-        for meta in metadatas or []:
-            if not isinstance(meta, dict):
-                continue
+        limit = self.data_limit if self.data_limit and self.data_limit > 0 else None
+        store = load_draw_store(game)
+        if store is not None and len(store):
+            return store.sequences(limit)
 
-            if game_key == "pick3" and not str(meta.get("winning_numbers") or "").strip():
-                for session, field in (("midday", "midday_daily"), ("evening", "evening_daily")):
-                    digits = self._parse_pick3_digits(meta.get(field))
-                    if len(digits) != 3:
-                        continue
-                    session_meta = {
-                        **meta,
-                        "draw_session": session,
-                        "winning_numbers": "".join(str(d) for d in digits),
-                    }
-                    numbers = self._extract_record_sequence(session_meta, game)
-                    if numbers:
-                        sequences.append(numbers)
-                continue
+        from .chroma_client import chroma_client
+
+        collection = chroma_client.client.get_collection(game)
+        if limit:
+            latest = chroma_client.get_latest_draws(game, limit, collection=collection)
+            if latest is not None:
+                return self._extract_winning_sequences(latest[0], game) or None
 
-            numbers = self._extract_record_sequence(meta, game)
-            if numbers:
-                sequences.append(numbers)
+        numbers, _, _ = read_collection_draws(
+            collection, game, page_size=self.read_page_size, workers=self.read_workers
+        )
+        if limit:
+            numbers = numbers[-limit:]
+        return sequences_from_numbers(numbers) or None
 
-        return sequences
+    def _extract_winning_sequences(self, metadatas, game: str):
+        return draw_numbers.extract_winning_sequences(metadatas, game)
+
+    @staticmethod
+    def _draw_matrix(sequences, width: int | None = None):
+        """Draws as one C-contiguous float32 matrix, zero-padded (or truncated) to `width` columns."""
+        rows = [seq for seq in (sequences or [])]
+        width = int(width if width is not None else max((len(seq) for seq in rows), default=0))
+        if rows and all(len(seq) == width for seq in rows):
+            return np.ascontiguousarray(rows, dtype=np.float32).reshape(len(rows), width)
+        matrix = np.zeros((len(rows), width), dtype=np.float32)
+        for index, seq in enumerate(rows):
+            values = seq[:width]
+            matrix[index, :len(values)] = values
+        return matrix
+
+    @staticmethod
+    def _lagged_windows(matrix, window: int):
+        """
+        Read-only (X, y) views over a draw matrix without copying.
+
+        Row i of X is draws i..i+window-1 laid end to end, which in a
+        C-contiguous matrix is one contiguous run, so X is a strided view;
+        row i of y is draw i+window.
+        """
+        count, width = matrix.shape
+        samples = count - window
+        X = np.lib.stride_tricks.as_strided(
+            matrix,
+            shape=(samples, window * width),
+            strides=(matrix.strides[0], matrix.strides[1]),
+            writeable=False,
+        )
+        y = matrix[window:]
+        y.flags.writeable = False
+        return X, y
 
     def _build_supervised_dataset(self, sequences, window_size: int | None = None):
         window = max(1, int(window_size or self.window_size or 1))
         if len(sequences) < window + 1:
             return None, None, 0, 0
 
-        output_len = max(len(seq) for seq in sequences)
-        feature_len = output_len * window
-
-        X = []
-        y = []
-        for index in range(window, len(sequences)):
-            features = []
-            for seq in sequences[index - window:index]:
-                padded = list(seq[:output_len]) + [0] * max(0, output_len - len(seq))
-                features.extend(padded[:output_len])
-            target = list(sequences[index][:output_len]) + [0] * max(0, output_len - len(sequences[index]))
-            X.append(features[:feature_len])
-            y.append(target[:output_len])
-
-        return np.array(X), np.array(y), feature_len, output_len
+        matrix = self._draw_matrix(sequences)
+        output_len = matrix.shape[1]
+        X, y = self._lagged_windows(matrix, window)
+        return X, y, output_len * window, output_len
 
     @staticmethod
     def build_feature_vector(sequences, window_size: int, feature_len: int):
         window = max(1, int(window_size or 1))
         usable = [seq for seq in (sequences or []) if seq]
         if not usable:
-            return []
+            return np.zeros(0, dtype=np.float32)
 
         per_draw = max(1, feature_len // window)
-        recent = usable[-window:]
-        if len(recent) < window:
-            recent = ([[]] * (window - len(recent))) + recent
+        recent = TrainerService._draw_matrix(usable[-window:], per_draw)
+        features = np.zeros((window, per_draw), dtype=np.float32)
+        features[window - len(recent):] = recent
+        return features.reshape(-1)[:feature_len]
 
-        features = []
-        for seq in recent:
-            padded = list(seq[:per_draw]) + [0] * max(0, per_draw - len(seq))
-            features.extend(padded[:per_draw])
-        return features[:feature_len]
+    @staticmethod
+    def _split_index(sample_count: int, train_size: float) -> int:
+        split_idx = int(sample_count * float(train_size))
+        return max(10, min(split_idx, sample_count - 10))
 
     def _chronological_split(self, X, y, train_size: float):
-        split_idx = int(len(X) * float(train_size))
-        split_idx = max(10, min(split_idx, len(X) - 10))
+        split_idx = self._split_index(len(X), train_size)
         return X[:split_idx], X[split_idx:], y[:split_idx], y[split_idx:]
 
     def _score_predictions(self, y_true, y_pred, y_full):
@@ -465,10 +369,9 @@ class TrainerService:
             return 2
         return -1
 
-    def _fit_and_score_model(self, X_train, y_train, X_val, y_val, y_full, attempt: int):
+    def _attempt_params(self, sample_count: int, attempt: int) -> dict:
         base_estimators = max(50, int(self.n_estimators or 250))
         base_depth = max(4, int(self.max_depth or 18))
-        sample_count = len(X_train)
         estimators_cap = 600
         depth_cap = 32
         if sample_count >= 3000:
@@ -478,22 +381,109 @@ class TrainerService:
             estimators_cap = 300
             depth_cap = 20
         n_estimators = min(base_estimators + ((attempt - 1) * 20), estimators_cap)
-        max_depth = min(base_depth + max(0, attempt - 1), depth_cap)
-        n_jobs = self._rf_n_jobs(len(X_train), n_estimators)
-        model = RandomForestRegressor(
-            n_estimators=n_estimators,
-            random_state=int(self.random_state or 42) + attempt,
-            n_jobs=n_jobs,
-            max_depth=max_depth,
-            min_samples_split=max(2, 4 - (attempt // 6)),
-            min_samples_leaf=1,
-        )
+        return {
+            "n_estimators": n_estimators,
+            "max_depth": min(base_depth + max(0, attempt - 1), depth_cap),
+            "min_samples_split": max(2, 4 - (attempt // 6)),
+            "min_samples_leaf": 1,
+            "random_state": int(self.random_state or 42) + attempt,
+            "n_jobs": self._rf_n_jobs(sample_count, n_estimators),
+        }
+
+    def _fit_and_score_model(self, X_train, y_train, X_val, y_val, y_full, attempt: int):
+        model = RandomForestRegressor(**self._attempt_params(len(X_train), attempt))
         model.fit(X_train, y_train)
 
         predictions = model.predict(X_val)
         mae, accuracy = self._score_predictions(y_val, predictions, y_full)
         return model, mae, accuracy, predictions
 
+    @staticmethod
+    def _forest_checkpoint(forest):
+        """Frozen copy of a warm-started forest as it stands (trees are shared, not copied)."""
+        snapshot = copy.copy(forest)
+        snapshot.estimators_ = list(forest.estimators_)
+        snapshot.n_estimators = len(snapshot.estimators_)
+        snapshot.warm_start = False
+        return snapshot
+
+    def _cold_attempts(self, X_train, y_train, X_val, y_val, y_full, max_attempts: int):
+        """Yield (attempt, model, mae, accuracy, predictions), fitting every attempt from scratch."""
+        if fit_pool.enabled:
+            yield from self._pooled_cold_attempts(X_train, y_train, X_val, y_val, y_full, max_attempts)
+            return
+        for attempt in range(1, max_attempts + 1):
+            try:
+                model, mae, accuracy, predictions = self._fit_and_score_model(
+                    X_train, y_train, X_val, y_val, y_full, attempt
+                )
+            except Exception:
+                continue
+            yield attempt, model, mae, accuracy, predictions
+
+    def _pooled_cold_attempts(self, X_train, y_train, X_val, y_val, y_full, max_attempts: int):
+        """`_cold_attempts` on the fit pool; attempts are yielded as their fits complete."""
+        train_rows = len(X_train)
+        tasks = []
+        for attempt in range(1, max_attempts + 1):
+            params = self._attempt_params(train_rows, attempt)
+            params["n_jobs"] = 1
+            tasks.append({
+                "attempt": attempt,
+                "params": params,
+                "train": (0, train_rows),
+                "val": (train_rows, train_rows + len(X_val)),
+            })
+        with fit_pool.share(np.concatenate([X_train, X_val]), np.concatenate([y_train, y_val])) as dataset:
+            fits = fit_pool.fit_many(dataset, tasks)
+            try:
+                for task, outcome in fits:
+                    if not outcome:
+                        continue
+                    predictions = outcome["predictions"]
+                    mae, accuracy = self._score_predictions(y_val, predictions, y_full)
+                    yield task["attempt"], outcome["model"], mae, accuracy, predictions
+            finally:
+                fits.close()
+
+    def _warm_start_attempts(self, X_train, y_train, X_val, y_val, y_full, max_attempts: int):
+        """
+        Yield (attempt, model, mae, accuracy, predictions) like repeated
+        `_fit_and_score_model` calls, growing one forest where possible.
+
+        Consecutive attempts that only add estimators share a `warm_start`
+        forest: each one fits just the new trees and is scored from a running
+        sum of per-tree validation predictions. Attempts that change the tree
+        shape (depth, min_samples_split) or cannot add trees (estimator cap
+        reached) start a fresh forest with that attempt's seed.
+        """
+        forest = None
+        shape = None
+        prediction_sum = None
+        for attempt in range(1, max_attempts + 1):
+            params = self._attempt_params(len(X_train), attempt)
+            attempt_shape = (params["max_depth"], params["min_samples_split"])
+            if forest is None or attempt_shape != shape or params["n_estimators"] <= len(forest.estimators_):
+                forest = RandomForestRegressor(warm_start=True, **params)
+                shape = attempt_shape
+                prediction_sum = None
+                scored = 0
+            else:
+                forest.set_params(n_estimators=params["n_estimators"], n_jobs=params["n_jobs"])
+            try:
+                forest.fit(X_train, y_train)
+            except Exception:
+                forest = None
+                continue
+
+            for tree in forest.estimators_[scored:]:
+                tree_predictions = np.asarray(tree.predict(X_val), dtype=float)
+                prediction_sum = tree_predictions if prediction_sum is None else prediction_sum + tree_predictions
+            scored = len(forest.estimators_)
+            predictions = prediction_sum / scored
+            mae, accuracy = self._score_predictions(y_val, predictions, y_full)
+            yield attempt, self._forest_checkpoint(forest), mae, accuracy, predictions
+
     def _ensemble_predictions(self, models, weights, X):
         if not models:
             raise ValueError("No models available for ensemble prediction")
@@ -553,29 +543,37 @@ class TrainerService:
         floor = float(floor_accuracy) if floor_accuracy is not None else None
         effective_target = max(target, floor or 0.0)
         max_attempts = max(1, int(self.max_train_attempts))
-        for attempt in range(1, max_attempts + 1):
-            try:
-                model, mae, accuracy, predictions = self._fit_and_score_model(
-                    X_train, y_train, X_val, y_val, y_full, attempt
-                )
-                candidates.append(
-                    {
-                        "model": model,
-                        "mae": float(mae),
-                        "accuracy": float(accuracy),
-                        "attempt": int(attempt),
-                        "predictions": np.asarray(predictions, dtype=float),
-                    }
-                )
-                candidates.sort(
-                    key=lambda item: float(item.get("accuracy", 0.0)),
-                    reverse=True,
-                )
-                candidates = candidates[:3]
-                if float(accuracy) >= effective_target:
-                    break
-            except Exception:
-                continue
+        attempt_source = self._warm_start_attempts if self.warm_start else self._cold_attempts
+        started = time.monotonic()
+        completed = 0
+        for attempt, model, mae, accuracy, predictions in attempt_source(
+            X_train, y_train, X_val, y_val, y_full, max_attempts
+        ):
+            completed += 1
+            candidates.append(
+                {
+                    "model": model,
+                    "mae": float(mae),
+                    "accuracy": float(accuracy),
+                    "attempt": int(attempt),
+                    "predictions": np.asarray(predictions, dtype=float),
+                }
+            )
+            candidates.sort(
+                key=lambda item: float(item.get("accuracy", 0.0)),
+                reverse=True,
+            )
+            candidates = candidates[:3]
+            elapsed = time.monotonic() - started
+            self._report_progress(
+                "search",
+                attempt=completed,
+                total_attempts=max_attempts,
+                best_accuracy=float(candidates[0]["accuracy"]),
+                eta_s=round(elapsed / completed * (max_attempts - completed), 1),
+            )
+            if float(accuracy) >= effective_target or self._cancel_requested():
+                break
         return candidates
 
     def _build_top3_ensemble(self, candidates, y_val, y_full):
@@ -808,18 +806,19 @@ class TrainerService:
             values.append(float(stored))
         return max(values) if values else None
 
-    def _load_previous_state(self, model_path: str, X_val, y_val, y_full):
+    def _load_previous_state(self, model_path: str, X_val, y_val, y_full, artifact=None):
+        """Score the saved artifact (or `artifact`, already loaded from `model_path`) on one split."""
         previous_artifact = None
         previous_model = None
         previous_accuracy = None
         previous_mae = None
         previous_predictions = None
 
-        if not os.path.exists(model_path):
+        if artifact is None and not os.path.exists(model_path):
             return previous_artifact, previous_model, previous_accuracy, previous_mae, previous_predictions
 
         try:
-            existing_artifact = joblib.load(model_path)
+            existing_artifact = artifact if artifact is not None else joblib.load(model_path)
             if not isinstance(existing_artifact, dict):
                 return previous_artifact, previous_model, previous_accuracy, previous_mae, previous_predictions
 
@@ -917,22 +916,24 @@ class TrainerService:
 
             baseline = self._load_stored_baseline(game)
             refresh_only = baseline is not None
+            # The modular backtest has no attempt loop: it reports its phase only and
+            # can be cancelled before it starts, not while it runs.
+            if self._cancel_requested():
+                return {"status": "cancelled", "message": f"Training for {game} was cancelled before the backtest."}
+            self._report_progress("backtest")
             return prediction_adapter.train_or_backtest(
                 game,
                 refresh_only=refresh_only,
                 baseline_accuracy=baseline,
             )
 
-        from .chroma_client import chroma_client
-
-        collection = chroma_client.client.get_collection(game)
-        metadatas = self._load_all_metadatas(collection)
-        if not metadatas:
+        started = time.monotonic()
+        self._report_progress("loading")
+        sequences = self._load_sequences(game)
+        if sequences is None:
             return {"status": "error", "message": "No data found to train on."}
 
-        metadatas = self._sort_metadatas_chronologically(metadatas)
         window_size = max(1, int(self.window_size or 1))
-        sequences = self._extract_winning_sequences(metadatas, game)
         X, y, feature_len, output_len = self._build_supervised_dataset(sequences, window_size)
         if X is None or len(X) < 10:
             return {"status": "error", "message": "Not enough parsed winning-number sequences to train."}
@@ -945,8 +946,32 @@ class TrainerService:
 
         best_run = None
         total_attempts = 0
-        for train_size in self._train_size_candidates():
-            train_size = min(max(float(train_size), 0.10), 0.50)
+        train_sizes = [min(max(float(train_size), 0.10), 0.50) for train_size in self._train_size_candidates()]
+        use_search = self.search_strategy == "halving" or self.time_budget_s is not None
+        search = None
+
+        # Score the previous artifact on every split before searching: it is read from disk
+        # once, and its cost is spent before the search budget is computed.
+        previous_started = time.monotonic()
+        stored_artifact = None
+        if os.path.exists(model_path):
+            try:
+                stored_artifact = joblib.load(model_path)
+            except Exception:
+                stored_artifact = None
+        previous_states = {}
+        for train_size in train_sizes:
+            _, X_val, _, y_val = self._chronological_split(X, y, train_size)
+            previous_states[train_size] = self._load_previous_state(
+                model_path, X_val, y_val, y, artifact=stored_artifact
+            )
+        # Scoring and saving the new model costs about what scoring the old one did per split.
+        finalize_reserve_s = (time.monotonic() - previous_started) / max(1, len(train_sizes))
+
+        self._report_progress("search", samples=int(len(X)))
+        for train_size in train_sizes:
+            if best_run is not None and self._cancel_requested():
+                break
             val_size = 1.0 - train_size
             X_train, X_val, y_train, y_val = self._chronological_split(X, y, train_size)
             (
@@ -955,7 +980,7 @@ class TrainerService:
                 previous_accuracy,
                 previous_mae,
                 previous_predictions,
-            ) = self._load_previous_state(model_path, X_val, y_val, y)
+            ) = previous_states[train_size]
 
             if baseline_accuracy is None and previous_accuracy is not None:
                 baseline_accuracy = self._resolve_baseline_accuracy(game, previous_accuracy)
@@ -964,15 +989,34 @@ class TrainerService:
                 )
                 training_target = max(requested_target, baseline_accuracy or 0.0)
 
-            candidates = self._train_iterative_collect(
-                X_train,
-                y_train,
-                X_val,
-                y_val,
-                y,
-                training_target=training_target,
-                floor_accuracy=baseline_accuracy,
-            )
+            if use_search:
+                if search is None:
+                    budget = None
+                    if self.time_budget_s is not None:
+                        reserve = max(finalize_reserve_s, 0.05 * self.time_budget_s)
+                        budget = max(0.0, self.time_budget_s - (time.monotonic() - started) - reserve)
+                    search = successive_halving(
+                        self,
+                        X,
+                        y,
+                        train_sizes,
+                        max_attempts=max(1, int(self.max_train_attempts)),
+                        target_accuracy=max(training_target, baseline_accuracy or 0.0),
+                        time_budget_s=budget,
+                        progress=lambda fields: self._report_progress("search", **fields),
+                        should_stop=self._cancel_requested,
+                    )
+                candidates = list(search["candidates"].get(train_size, []))
+            else:
+                candidates = self._train_iterative_collect(
+                    X_train,
+                    y_train,
+                    X_val,
+                    y_val,
+                    y,
+                    training_target=training_target,
+                    floor_accuracy=baseline_accuracy,
+                )
             if previous_model is not None and previous_predictions is not None:
                 try:
                     prev_mae, prev_acc = self._score_predictions(y_val, previous_predictions, y)
@@ -1013,7 +1057,18 @@ class TrainerService:
                 best_run = run_payload
 
         if best_run is None:
+            if search and search["summary"].get("stopped") in ("time_budget", "cancelled"):
+                return {
+                    # A cancel is not a failure: the job ends as cancelled.
+                    "status": "cancelled" if search["summary"]["stopped"] == "cancelled" else "error",
+                    "message": (
+                        f"Search stopped ({search['summary']['stopped']}) before any full-size fit "
+                        "finished; no model was saved."
+                    ),
+                    "search": search["summary"],
+                }
             return {"status": "error", "message": "No successful training attempts were completed."}
+        self._report_progress("finalizing", best_accuracy=float(best_run["accuracy"]))
 
         train_size = float(best_run["train_size"])
         val_size = float(best_run["validation_size"])
@@ -1168,6 +1223,7 @@ class TrainerService:
                     model_strategy=selected_strategy,
                     blend_weight=selected_blend_weight,
                 ),
+                "search": search["summary"] if search else None,
             }
 
         artifact = {
@@ -1196,7 +1252,7 @@ class TrainerService:
                 "n_estimators": int(self.n_estimators),
                 "max_depth": int(self.max_depth),
                 "random_state": int(self.random_state),
-                "records_loaded": len(metadatas),
+                "records_loaded": len(sequences),
                 "window_size": int(window_size),
                 "auto_tune": bool(self.auto_tune),
                 "split_strategy": "chronological",
@@ -1316,7 +1372,7 @@ class TrainerService:
             "training_params": run_training_params,
             "best_training_params": best_training_params,
             "last_trained_at": time.time(),
-            "last_trained_record_count": len(metadatas),
+            "last_trained_record_count": len(sequences),
             "accuracy_history": accuracy_history,
             "recent_runs": recent_runs,
         }
@@ -1359,8 +1415,10 @@ class TrainerService:
                 "validation_size": val_size,
                 "training_params": run_training_params,
                 "best_training_params": best_training_params,
+                "search": search["summary"] if search else None,
             }
 
+        self._report_progress("saving")
         temp_model_path = f"{model_path}.tmp"
         joblib.dump(artifact, temp_model_path, compress=3)
         if not os.path.exists(temp_model_path) or os.path.getsize(temp_model_path) <= 0:
@@ -1399,6 +1457,7 @@ class TrainerService:
             "validation_size": val_size,
             "training_params": run_training_params,
             "best_training_params": best_training_params,
+            "search": search["summary"] if search else None,
         }
 
     def train(
@@ -1414,8 +1473,19 @@ class TrainerService:
         data_limit: int = None,
         window_size: int = None,
         auto_tune: bool = None,
+        time_budget_s: float = None,
+        progress_callback=None,
+        cancel_event=None,
     ):
-        """Backward-compatible alias used by API routes and tooling."""
+        """
+        Backward-compatible alias used by API routes and tooling.
+
+        `progress_callback(dict)` receives phase/attempt/best-accuracy/ETA
+        updates; setting `cancel_event` stops the search at the next attempt
+        boundary and keeps the best fully trained candidate (or the previous
+        model). The modular engine reports its phase only and honours
+        `cancel_event` before its backtest starts.
+        """
         import logging
         from experiments.store import (
             MAX_STORED_PER_GAME,
@@ -1925,6 +1995,8 @@ class TrainerService:
                 "validation_size",
                 "training_params",
                 "best_training_params",
+                "search",
+                "cancelled",
             ):
                 if key in result and result.get(key) is not None:
                     response[key] = result.get(key)
@@ -1947,6 +2019,8 @@ class TrainerService:
         leaderboard: list[dict] = []
         accuracy_history: list[float] = []
         memory_profile: dict = {}
+        self._progress_callback = progress_callback
+        self._cancel_event = cancel_event
 
         try:
             record_count = _get_dataset_record_count()
@@ -1958,6 +2032,8 @@ class TrainerService:
             self.configure_training(
                 **{key: value for key, value in caller_overrides.items() if value is not None}
             )
+            # The budget applies to this request only.
+            self.time_budget_s = float(time_budget_s) if time_budget_s else self.default_time_budget_s
             record_baseline = _coerce_float(self._load_stored_baseline(game_key))
             if record_baseline is not None:
                 self.target_accuracy = max(float(self.target_accuracy or 0.0), record_baseline)
@@ -1976,13 +2052,28 @@ class TrainerService:
             )
 
             existing_leaderboard = _load_existing_leaderboard()
+            if self._cancel_requested():
+                return _build_response(
+                    {"status": "cancelled", "message": f"Training for {game_key} was cancelled before it started."},
+                    leaderboard=existing_leaderboard,
+                    optimal_config=optimal_config,
+                    optimal_config_applied=optimal_config_applied,
+                    accuracy_history=accuracy_history,
+                    memory_profile=memory_profile,
+                )
+            training_started = time.monotonic()
             result = self.train_model(game_key)
+            if self._cancel_requested():
+                result["cancelled"] = True
 
             if self._uses_modular_engine() and str(result.get("status", "")).lower() == "success":
                 result = self._enrich_modular_train_result(result, record_before=record_baseline)
 
             record_before = _coerce_float(self._load_stored_baseline(game_key))
             candidate_acc = _coerce_float(result.get("candidate_accuracy"))
+            budget_left = None
+            if self.time_budget_s is not None:
+                budget_left = self.time_budget_s - (time.monotonic() - training_started)
             should_recreate = (
                 not self._uses_modular_engine()
                 and str(result.get("status", "")).lower() == "success"
@@ -1992,6 +2083,8 @@ class TrainerService:
                 and candidate_acc + 1e-9 < record_before
                 and optimal_config
                 and not memory_profile.get("recreate_attempted")
+                and not self._cancel_requested()
+                and (budget_left is None or budget_left > 0.05 * self.time_budget_s)
             )
             if should_recreate:
                 logger.info(
@@ -2003,6 +2096,9 @@ class TrainerService:
                 memory_profile["recreate_attempted"] = True
                 _apply_config(optimal_config)
                 self.target_accuracy = max(float(self.target_accuracy or 0.0), record_before)
+                if budget_left is not None:
+                    # The retry shares the request's budget.
+                    self.time_budget_s = budget_left
                 recreate_result = self.train_model(game_key)
                 recreate_acc = _coerce_float(
                     recreate_result.get("highest_accuracy") or recreate_result.get("accuracy")
@@ -2099,18 +2195,131 @@ class TrainerService:
                 accuracy_history=accuracy_history,
                 memory_profile=memory_profile,
             )
+        finally:
+            self._progress_callback = None
+            self._cancel_event = None
+
+    def _isolated_copy(self) -> "TrainerService":
+        """A trainer with this one's configuration that can be reconfigured independently."""
+        trainer = copy.copy(self)
+        trainer._progress_callback = None
+        trainer._cancel_event = None
+        return trainer
+
+    def train_all_games(self, games: list[str] | None = None) -> dict:
+        """
+        Train several games concurrently, smallest dataset first.
+
+        Each game trains on its own copy of this trainer's configuration, so
+        per-game tuning (optimal configs, recreate retries) does not leak into
+        other games. Up to TRAIN_ALL_WORKERS games run at once (0 = one per
+        fit worker), admitted like `FitPool.concurrency()` admits fits: the
+        first game runs alone while an `RssSampler` measures the memory it
+        adds (in this process and in pool workers). That footprint, per
+        cached draw, estimates every other game's, and a game starts only
+        while the estimates of the running games plus its own fit in
+        `available memory * TRAIN_FIT_MEMORY_FRACTION` (read whenever no game
+        is running). This also bounds modular-engine backtests, which do not
+        go through `fit_pool`; legacy searches additionally share its fit
+        slots. Ordering by cached draw count lets pick3/take5 finish while
+        quickdraw is still searching.
+
+        Returns {"results": [...], "finish_order": [...], "wall_time_s",
+        "cpu_time_s", "parallelism", "workers"}. `cpu_time_s` sums each
+        game thread's CPU time and that of pool workers.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    def train_all_games(self, games: list[str] | None = None):
         from config import GAME_CONFIGS
-
-        targets = games or list(GAME_CONFIGS.keys())
-        results = []
-        for game in targets:
+        from state.draw_counts import get_draw_count
+
+        targets = list(games or GAME_CONFIGS.keys())
+        counts = {game: get_draw_count(game, default=-1) for game in targets}
+        # Unknown sizes go last: an uncounted game may be the largest.
+        ordered = sorted(targets, key=lambda game: (counts[game] < 0, counts[game]))
+        configured = int(os.environ.get("TRAIN_ALL_WORKERS", "0") or 0)
+        workers = max(1, min(len(ordered) or 1, configured or fit_pool.workers))
+
+        largest_count = max([count for count in counts.values() if count > 0], default=0)
+        game_slots = threading.Condition()
+        # running: game -> estimated footprint; per_draw / footprint: largest solo measurements.
+        gate = {"running": {}, "admitted": 0, "per_draw": 0.0, "footprint": 0, "budget": None}
+
+        def _estimate(game: str) -> int:
+            draws = counts[game] if counts[game] > 0 else largest_count
+            if gate["per_draw"] > 0 and draws > 0:
+                return max(int(gate["per_draw"] * draws), 1)
+            return gate["footprint"]
+
+        def _admissible(game: str) -> bool:
+            running = gate["running"]
+            if not running:
+                return True
+            # One game until a footprint was measured, then what memory allows.
+            if len(running) >= workers or gate["footprint"] <= 0:
+                return False
+            if gate["budget"] is None:
+                return True
+            return sum(running.values()) + _estimate(game) <= gate["budget"]
+
+        started = time.monotonic()
+        pool_cpu_started = fit_pool.worker_cpu_s
+
+        def _train_one(game: str) -> dict:
+            with game_slots:
+                while not _admissible(game):
+                    game_slots.wait(timeout=1.0)
+                alone = not gate["running"]
+                if alone:
+                    # Nothing of ours is resident now, so this is the memory games can share.
+                    available = available_memory_bytes()
+                    gate["budget"] = None if available is None else available * fit_pool.memory_fraction
+                gate["running"][game] = _estimate(game)
+                gate["admitted"] += 1
+                ticket = gate["admitted"]
+            game_started = time.monotonic()
+            cpu_started = time.thread_time()
+            sampler = RssSampler(fit_pool)
             try:
-                results.append(self.train(game))
+                with sampler:
+                    result = self._isolated_copy().train(game)
             except Exception as exc:
-                results.append({"game": game, "status": "error", "message": str(exc)})
-        return results
+                result = {"game": game, "status": "error", "message": str(exc)}
+            finally:
+                footprint = max(1, sampler.peak)
+                with game_slots:
+                    # Only a game that ran alone measures its own footprint.
+                    if alone and gate["admitted"] == ticket:
+                        gate["footprint"] = max(gate["footprint"], footprint)
+                        if counts[game] > 0:
+                            gate["per_draw"] = max(gate["per_draw"], footprint / counts[game])
+                    del gate["running"][game]
+                    game_slots.notify_all()
+            result["wall_time_s"] = round(time.monotonic() - game_started, 3)
+            result["cpu_time_s"] = round(time.thread_time() - cpu_started, 3)
+            return result
+
+        results: dict[str, dict] = {}
+        finish_order: list[str] = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TrainAll") as executor:
+            futures = {executor.submit(_train_one, game): game for game in ordered}
+            for future in as_completed(futures):
+                game = futures[future]
+                results[game] = future.result()
+                finish_order.append(game)
+                print(f"✓ [TRAIN_ALL] {game} {results[game].get('status')} in {results[game]['wall_time_s']}s")
+
+        wall_time = time.monotonic() - started
+        cpu_time = sum(result["cpu_time_s"] for result in results.values())
+        cpu_time += fit_pool.worker_cpu_s - pool_cpu_started
+        return {
+            "results": [results[game] for game in targets],
+            "finish_order": finish_order,
+            "workers": workers,
+            "wall_time_s": round(wall_time, 3),
+            "cpu_time_s": round(cpu_time, 3),
+            "parallelism": round(cpu_time / wall_time, 2) if wall_time > 0 else None,
+        }
 
 
 trainer_service = TrainerService()
@@ -0,0 +1,312 @@
+"""
+Process-pool random-forest fits that share one copy of the training data.
+
+The trainer's dataset (X, y) is written once per search as .npy files. The
+default location is /dev/shm, so the files sit in memory. Pool workers
+open them with `mmap_mode="r"`, so a fit task only pickles its parameters
+and row ranges, not the matrix.
+
+Fit concurrency is memory-aware. The first fit runs alone. Each worker
+reports its peak RSS, and the number of fits in flight is then capped at
+`available memory * TRAIN_FIT_MEMORY_FRACTION / largest peak`, bounded by
+the worker count. Available memory is the smaller of MemAvailable and the
+cgroup limit headroom, because containers see the host's MemAvailable. With
+one worker (or one CPU) fits run in-process and nothing is written out.
+
+That cap is global: searches running at the same time (train_all trains
+several games at once) share one set of fit slots, so together they never
+run more fits than the CPU and memory budget allows.
+"""
+from __future__ import annotations
+
+import os
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import get_context
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+_worker_arrays: dict[str, np.ndarray] = {}
+
+
+def peak_rss_bytes() -> int:
+    """Lifetime peak RSS of this process (ru_maxrss is KiB on Linux)."""
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process now (its peak when /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def available_memory_bytes() -> int | None:
+    """Memory this process can still use, None when it cannot be determined."""
+    available = None
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    try:
+        with open("/sys/fs/cgroup/memory.max", "r", encoding="utf-8") as handle:
+            limit = handle.read().strip()
+        with open("/sys/fs/cgroup/memory.current", "r", encoding="utf-8") as handle:
+            current = int(handle.read().strip())
+        if limit != "max":
+            headroom = max(0, int(limit) - current)
+            available = headroom if available is None else min(available, headroom)
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+def fit_forest(X, y, task: dict) -> dict:
+    """Fit one forest on X/y row ranges and predict its validation rows."""
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    train_start, train_stop = task["train"]
+    val_start, val_stop = task["val"]
+    model = RandomForestRegressor(**task["params"])
+    model.fit(X[train_start:train_stop], y[train_start:train_stop])
+    predictions = np.asarray(model.predict(X[val_start:val_stop]), dtype=float)
+    return {
+        "model": model,
+        "predictions": predictions,
+        "elapsed": time.perf_counter() - started,
+        "cpu_s": time.process_time() - cpu_started,
+        "peak_rss": peak_rss_bytes(),
+    }
+
+
+def _worker_fit(paths: tuple[str, str], task: dict) -> dict:
+    if set(_worker_arrays) != set(paths):
+        # Drop maps of earlier searches so their deleted /dev/shm files are released.
+        _worker_arrays.clear()
+        for path in paths:
+            _worker_arrays[path] = np.load(path, mmap_mode="r")
+    return fit_forest(_worker_arrays[paths[0]], _worker_arrays[paths[1]], task)
+
+
+class SharedDataset:
+    """X and y as seen by fits: in-process arrays, or .npy files pool workers memory-map."""
+
+    def __init__(self, X, y, directory: str | None = None):
+        self.X = X
+        self.y = y
+        self.directory = directory
+        self.paths = None
+        if directory:
+            self.paths = (os.path.join(directory, "X.npy"), os.path.join(directory, "y.npy"))
+            np.save(self.paths[0], np.ascontiguousarray(X))
+            np.save(self.paths[1], np.ascontiguousarray(y))
+
+    def close(self) -> None:
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+class FitPool:
+    def __init__(self, workers: int | None = None, memory_fraction: float | None = None):
+        configured = int(workers if workers is not None else os.getenv("TRAIN_FIT_WORKERS", "0"))
+        self.workers = max(1, configured or os.cpu_count() or 1)
+        self.memory_fraction = float(
+            memory_fraction if memory_fraction is not None else os.getenv("TRAIN_FIT_MEMORY_FRACTION", "0.7")
+        )
+        self.shared_dir = os.getenv("TRAIN_SHARED_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.Condition()
+        self._in_flight = 0
+        self.peak_rss = 0
+        # CPU seconds spent in pool workers; in-process fits show up in the caller's process_time().
+        self.worker_cpu_s = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=get_context(os.getenv("TRAIN_FIT_START_METHOD", "spawn")),
+                )
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def concurrency(self) -> int:
+        """Fits allowed in flight: 1 until a peak RSS was measured, then what memory allows."""
+        if not self.enabled or self.peak_rss <= 0:
+            return 1
+        available = available_memory_bytes()
+        if available is None:
+            return self.workers
+        return max(1, min(self.workers, int(available * self.memory_fraction // self.peak_rss)))
+
+    def worker_rss_bytes(self) -> int:
+        """Estimated memory of the fits running in pool workers now (in-process fits show in this RSS)."""
+        if not self.enabled:
+            return 0
+        with self._slots:
+            return self._in_flight * self.peak_rss
+
+    def _acquire_slot(self, block: bool) -> bool:
+        """Claim one of the fit slots shared by every caller; wait for one when `block`."""
+        with self._slots:
+            while self._in_flight >= self.concurrency():
+                if not block:
+                    return False
+                self._slots.wait(timeout=1.0)
+            self._in_flight += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._slots:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._slots.notify_all()
+
+    @contextmanager
+    def share(self, X, y):
+        """Make X/y available to fits for the duration of the block."""
+        directory = tempfile.mkdtemp(prefix="mensa-fit-", dir=self.shared_dir) if self.enabled else None
+        dataset = SharedDataset(X, y, directory)
+        try:
+            yield dataset
+        finally:
+            dataset.close()
+
+    def fit_many(self, dataset: SharedDataset, tasks, admit=None):
+        """
+        Yield (task, result) for each task as fits complete.
+
+        `admit(task)` is asked before each fit starts; returning False stops
+        starting new fits (those already running still yield). A failed fit
+        yields an empty result. Closing the generator cancels fits that have
+        not started.
+        """
+        pending = list(tasks)
+        if not self.enabled or dataset.paths is None:
+            for task in pending:
+                if admit is not None and not admit(task):
+                    return
+                self._acquire_slot(block=True)
+                try:
+                    result = fit_forest(dataset.X, dataset.y, task)
+                except Exception:
+                    result = {}
+                finally:
+                    self._release_slot()
+                yield task, result
+            return
+
+        running = {}
+        try:
+            while pending or running:
+                while pending:
+                    task = pending[0]
+                    if admit is not None and not admit(task):
+                        pending = []
+                        break
+                    # Wait for a slot only when this caller has nothing running to wait on.
+                    if not self._acquire_slot(block=not running):
+                        break
+                    pending.pop(0)
+                    try:
+                        running[self._get_executor().submit(_worker_fit, dataset.paths, task)] = task
+                    except Exception:
+                        self._release_slot()
+                        raise
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    self._release_slot()
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as exc:
+                        # Only this call falls back to in-process fits; the next one starts a new executor.
+                        print(f"⚠ Training fit pool broke ({exc or 'worker died, possibly out of memory'}); finishing these fits in-process")
+                        self._reset_executor()
+                        pending = [task] + list(running.values()) + pending
+                        for _ in running:
+                            self._release_slot()
+                        running = {}
+                        yield from self.fit_many(SharedDataset(dataset.X, dataset.y), pending, admit)
+                        return
+                    except Exception:
+                        result = {}
+                    if result:
+                        with self._slots:
+                            self.peak_rss = max(self.peak_rss, int(result.get("peak_rss") or 0))
+                            self.worker_cpu_s += float(result.get("cpu_s") or 0.0)
+                    yield task, result
+        finally:
+            for future in running:
+                future.cancel()
+                self._release_slot()
+
+
+class RssSampler:
+    """
+    Peak memory a block of work adds, sampled on a thread while it runs.
+
+    Each sample is this process's current RSS above its value on entry,
+    plus `pool.worker_rss_bytes()`. `ru_maxrss` cannot be used for this: it
+    is the process's lifetime peak, so earlier work (an ingest) would be
+    charged to the block.
+    """
+
+    def __init__(self, pool: FitPool | None = None, interval_s: float = 0.05):
+        self.pool = pool
+        self.interval_s = interval_s
+        self.peak = 0
+        self._baseline = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        used = max(0, current_rss_bytes() - self._baseline)
+        if self.pool is not None:
+            used += self.pool.worker_rss_bytes()
+        self.peak = max(self.peak, used)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self._baseline = current_rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="RssSampler")
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+fit_pool = FitPool()
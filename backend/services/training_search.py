@@ -0,0 +1,256 @@
+"""
+Successive-halving search over legacy trainer configurations.
+
+The grid the trainer used to run is every `train_size` candidate times every
+attempt's forest parameters (`TrainerService._attempt_params`), each fitted
+in full. Successive halving evaluates all of those configurations cheaply
+first: a fraction of the trees on the most recent slice of the training
+split, scored on the full validation split. Only the best 1/eta move on
+to the next rung, where the fraction grows by eta, until the last rung
+fits the survivors with full trees on full splits. Fits within a rung run
+concurrently on `training_pool.fit_pool`.
+
+The search stops early when:
+- a fit reaches the training target;
+- a rung's best accuracy improves on the previous rung's best by less
+  than `plateau_tol`;
+- the next fit is predicted to overrun the time budget;
+- `should_stop()` returns True (a cancelled job), checked before each fit.
+An early stop sends the top configs straight to full fits; a cancellation
+sends only the leader, unless a full fit has already finished. Only full-resource fits are returned, so the trainer never saves a
+forest with a fraction of the trees or rows. If none finished, no candidates
+come back, and the trainer keeps the previous model.
+
+Budget predictions use the slowest seconds-per-(tree x row) seen so far,
+seeded by a small in-process probe fit before the first rung. A fit's
+predicted finish also counts the work already running in the pool. Until
+the last rung, every admission leaves enough budget for one full fit of the
+best config so far, so a budget stop can still produce a full model.
+"""
+from __future__ import annotations
+
+import math
+import os
+import time
+
+from services.training_pool import fit_forest, fit_pool
+
+MIN_ESTIMATORS = 10
+MIN_ROWS = 50
+FINALISTS = 3
+# Predicted fit times are inflated by this factor before they are compared with the budget.
+BUDGET_MARGIN = 1.25
+
+
+def _rung_resources(config_count: int, eta: int) -> list[float]:
+    """Resource fraction per rung, ending at 1.0, sized so the last rung keeps FINALISTS configs."""
+    rungs = 1
+    if config_count > FINALISTS:
+        rungs += int(math.ceil(math.log(config_count / FINALISTS, eta)))
+    return [float(eta) ** (rung - (rungs - 1)) for rung in range(rungs)]
+
+
+def successive_halving(
+    trainer,
+    X,
+    y,
+    train_sizes: list[float],
+    *,
+    max_attempts: int,
+    target_accuracy: float | None = None,
+    time_budget_s: float | None = None,
+    eta: int | None = None,
+    plateau_tol: float | None = None,
+    pool=None,
+    progress=None,
+    should_stop=None,
+) -> dict:
+    """
+    Run the search and return {"candidates": {train_size: [candidate, ...]}, "summary": {...}}.
+
+    Candidates have the shape `_train_iterative_collect` produces (model, mae,
+    accuracy, attempt, predictions), at most FINALISTS per train_size, best
+    first, and are always full-resource fits.
+    `progress(dict)` receives rung, attempt, total_attempts, best_accuracy and
+    eta_s after each fit; the ETA is the mean wall-clock time per fit so far
+    times the fits still planned.
+    """
+    pool = pool or fit_pool
+    eta = max(2, int(eta or os.getenv("TRAIN_SEARCH_ETA", "3")))
+    plateau_tol = float(plateau_tol if plateau_tol is not None else os.getenv("TRAIN_SEARCH_PLATEAU", "0.002"))
+    started = time.monotonic()
+    deadline = started + float(time_budget_s) if time_budget_s else None
+
+    sample_count = len(X)
+    splits = {size: trainer._split_index(sample_count, size) for size in train_sizes}
+    configs = [(size, attempt) for size in train_sizes for attempt in range(1, max(1, int(max_attempts)) + 1)]
+    resources = _rung_resources(len(configs), eta)
+    # Planned fits assuming every rung keeps 1/eta of its configs.
+    planned = 0
+    remaining_configs = len(configs)
+    for _ in resources:
+        planned += remaining_configs
+        remaining_configs = max(FINALISTS, int(math.ceil(remaining_configs / eta)))
+
+    results: dict[tuple, dict] = {}
+    rung_summaries = []
+    unit_cost = 0.0
+    fits = 0
+    stopped = None
+    previous_best = None
+    best_accuracy = None
+    in_flight_cost = 0
+    finishing = False
+
+    def task_for(config, resource) -> dict:
+        size, attempt = config
+        split = splits[size]
+        params = trainer._attempt_params(split, attempt)
+        trees = max(MIN_ESTIMATORS, int(round(params["n_estimators"] * resource)))
+        rows = min(split, max(MIN_ROWS, int(round(split * resource))))
+        params.update(n_estimators=trees, n_jobs=1 if pool.enabled else trainer._rf_n_jobs(rows, trees))
+        return {
+            "config": config,
+            "params": params,
+            "train": (split - rows, split),
+            "val": (split, sample_count),
+            "cost": trees * rows,
+            "resource": resource,
+        }
+
+    full_cost = {config: task_for(config, 1.0)["cost"] for config in configs}
+
+    def predicted_s(task) -> float:
+        # Fits already running share the pool's slots with this one.
+        concurrent = max(1, pool.concurrency())
+        return unit_cost * max(task["cost"], (in_flight_cost + task["cost"]) / concurrent)
+
+    def full_fit_reserve_s() -> float:
+        best = max(results, key=lambda config: results[config]["accuracy"]) if results else None
+        return unit_cost * (full_cost[best] if best is not None else max(full_cost.values()))
+
+    def admit(task) -> bool:
+        nonlocal stopped, in_flight_cost
+        if not finishing and should_stop is not None and should_stop():
+            stopped = "cancelled"
+            return False
+        if deadline is not None:
+            needed = predicted_s(task)
+            if task["resource"] < 1.0:
+                needed += full_fit_reserve_s()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or needed * BUDGET_MARGIN > remaining:
+                stopped = "time_budget"
+                return False
+        in_flight_cost += task["cost"]
+        return True
+
+    if deadline is not None and configs:
+        # Seed the cost model so the first rung's fits are checked against the budget too.
+        probe = task_for(configs[0], resources[0])
+        probe_rows = min(probe["train"][1], MIN_ROWS * 2)
+        probe["params"].update(n_estimators=MIN_ESTIMATORS, n_jobs=1)
+        probe["train"] = (probe["train"][1] - probe_rows, probe["train"][1])
+        outcome = fit_forest(X, y, probe)
+        unit_cost = outcome["elapsed"] / (MIN_ESTIMATORS * probe_rows)
+
+    with pool.share(X, y) as dataset:
+        survivors = configs
+        rung = 0
+        while rung < len(resources):
+            resource = resources[rung]
+            evaluated = []
+            rung_fits = pool.fit_many(dataset, [task_for(config, resource) for config in survivors], admit)
+            try:
+                for task, outcome in rung_fits:
+                    in_flight_cost -= task["cost"]
+                    if not outcome:
+                        continue
+                    fits += 1
+                    unit_cost = max(unit_cost, outcome["elapsed"] / task["cost"])
+                    config = task["config"]
+                    mae, accuracy = trainer._score_predictions(y[splits[config[0]]:], outcome["predictions"], y)
+                    results[config] = {
+                        "model": outcome["model"],
+                        "mae": float(mae),
+                        "accuracy": float(accuracy),
+                        "attempt": int(config[1]),
+                        "predictions": outcome["predictions"],
+                        "resource": resource,
+                    }
+                    evaluated.append(config)
+                    best_accuracy = accuracy if best_accuracy is None else max(best_accuracy, accuracy)
+                    if progress is not None:
+                        elapsed = time.monotonic() - started
+                        progress({
+                            "rung": rung + 1,
+                            "rungs": len(resources),
+                            "attempt": fits,
+                            "total_attempts": max(planned, fits),
+                            "best_accuracy": float(best_accuracy),
+                            "eta_s": round(elapsed / fits * max(0, planned - fits), 1),
+                        })
+                    if target_accuracy is not None and accuracy >= target_accuracy:
+                        stopped = "target"
+                        break
+            finally:
+                rung_fits.close()
+                in_flight_cost = 0
+            ranked = sorted(evaluated, key=lambda item: results[item]["accuracy"], reverse=True)
+            best = results[ranked[0]]["accuracy"] if ranked else None
+            rung_summaries.append({
+                "resource": round(resource, 4),
+                "configs": len(survivors),
+                "evaluated": len(evaluated),
+                "best_accuracy": best,
+            })
+            if stopped == "cancelled":
+                # Finish the leader as one full fit, so a cancelled search still yields a model.
+                if finishing or not fits or any(result["resource"] >= 1.0 for result in results.values()):
+                    break
+                finishing = True
+                keep = 1
+                ranked = ranked or survivors
+                rung = len(resources) - 1
+            elif rung == len(resources) - 1:
+                break
+            elif stopped in ("target", "time_budget"):
+                # Never hand back a subset model: promote the leaders to full fits.
+                keep = 1 if stopped == "target" else FINALISTS
+                ranked = ranked or survivors
+                rung = len(resources) - 1
+            elif previous_best is not None and best is not None and best - previous_best < plateau_tol:
+                keep = min(FINALISTS, len(ranked))
+                rung = len(resources) - 1
+                stopped = "plateau"
+            else:
+                keep = max(FINALISTS, int(math.ceil(len(ranked) / eta)))
+                rung += 1
+            previous_best = best
+            survivors = ranked[:keep]
+            for config in set(results) - set(survivors):
+                del results[config]
+            if not survivors:
+                break
+
+    candidates: dict[float, list[dict]] = {}
+    for (size, _), result in sorted(results.items(), key=lambda item: item[1]["accuracy"], reverse=True):
+        if result["resource"] < 1.0:
+            continue
+        group = candidates.setdefault(size, [])
+        if len(group) < FINALISTS:
+            group.append(result)
+
+    return {
+        "candidates": candidates,
+        "summary": {
+            "strategy": "successive_halving",
+            "configs": len(configs),
+            "fits": fits,
+            "eta": eta,
+            "rungs": rung_summaries,
+            "stopped": stopped,
+            "time_budget_s": float(time_budget_s) if time_budget_s else None,
+            "elapsed_s": round(time.monotonic() - started, 3),
+        },
+    }
@@ -0,0 +1,359 @@
+"""
+Local columnar store of parsed draws, the primary read path for training,
+prediction and backtests.
+
+Reading history from Chroma meant paging every metadata dict over HTTP and
+re-parsing winning numbers with regexes on each request. The store instead
+keeps per game under `DATA_DIR/draw_store/<game>/`, in chronological order
+(row index = draw ordinal):
+
+- `numbers.npy`: int16 matrix of primaries then bonus numbers, one row per
+  draw, padded with -1 where a draw has no bonus.
+- `dates.npy`: int64 draw date (epoch seconds).
+- `ordinals.npy`: int64 `draw_ordinal` (utils.draw_numbers), the sort key.
+  Dates have day resolution; the ordinal adds the draw time or Pick 3
+  session, so same-day Quick Draw and midday/evening draws stay in order.
+- `ids.npy`: record ids (Chroma id, plus `:midday`/`:evening` for Pick 3
+  session rows).
+- `rows.log`: JSON lines appended after each batch the ingest stores; folded
+  into the arrays (deduped by id, re-sorted by ordinal) on compaction.
+- `meta.json`: row count, matrix width and sort key; its presence marks the
+  store as built (stores written before ordinals were kept are rebuilt).
+
+Base arrays are opened with `mmap_mode="r"`, so readers share the page cache
+instead of copying. Ingest keeps the store current; a store that was never
+built is rebuilt from the Chroma collection on first use. Chroma stays the
+source of truth (and the RAG index).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from utils.draw_numbers import ORDINAL_DAY, draw_ordinal, game_rules, metadata_timestamp, record_sequences
+
+_NUMBERS_DTYPE = np.dtype("<i2")
+_DATES_DTYPE = np.dtype("<i8")
+_ARRAYS = ("numbers", "dates", "ordinals", "ids")
+_SORT_KEY = "draw_ordinal"
+_COMPACT_MIN = 5_000
+_PAD = -1
+_REBUILD_WORKERS = max(1, int(os.getenv("DRAW_STORE_READ_WORKERS", "4")))
+
+
+def draw_store_enabled() -> bool:
+    return os.getenv("DRAW_STORE", "1") != "0"
+
+
+def _parse_records(game: str, rules: dict, width: int, metadatas: list[dict], ids: list[str]) -> list[dict]:
+    rows = []
+    for meta, record_id in zip(metadatas, ids):
+        sequences = record_sequences(meta, game, rules)
+        if not sequences:
+            continue
+        timestamp = metadata_timestamp(meta)
+        for session, numbers in sequences:
+            ordinal = draw_ordinal({**meta, "draw_session": session} if session else meta)
+            rows.append({
+                "id": f"{record_id}:{session}" if session else str(record_id),
+                "t": timestamp,
+                "o": _day_ordinal(timestamp) if ordinal is None else ordinal,
+                "n": numbers[:width],
+            })
+    return rows
+
+
+def _day_ordinal(timestamp: int) -> int:
+    # Rows without a parseable draw time sort at the start of their day.
+    return int(timestamp) // 86_400 * ORDINAL_DAY
+
+
+def _rows_to_arrays(rows: list[dict], width: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    numbers = np.full((len(rows), width), _PAD, dtype=_NUMBERS_DTYPE)
+    for index, row in enumerate(rows):
+        numbers[index, :len(row["n"])] = row["n"]
+    dates = np.fromiter((row["t"] for row in rows), dtype=_DATES_DTYPE, count=len(rows))
+    ordinals = np.fromiter(
+        (row.get("o", _day_ordinal(row["t"])) for row in rows), dtype=_DATES_DTYPE, count=len(rows)
+    )
+    ids = np.array([row["id"] for row in rows]) if rows else np.empty(0, dtype=str)
+    return numbers, dates, ordinals, ids
+
+
+def sequences_from_numbers(numbers: np.ndarray) -> list[list[int]]:
+    """Number-matrix rows as lists without the -1 padding."""
+    return [[int(value) for value in row if value != _PAD] for row in numbers.tolist()]
+
+
+def read_collection_draws(collection, game: str, *, page_size: int = 5_000, workers: int = 4,
+                          total: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse every draw stored in `collection` into (numbers, dates, ids) arrays, in draw order.
+
+    Offset pages are fetched by up to `workers` threads and each page is
+    parsed as soon as it arrives; only the compact arrays outlive it, so raw
+    metadata dicts never accumulate. Rows written while the read is running
+    may be missed.
+    """
+    numbers, dates, _, ids = _read_collection_arrays(collection, game, page_size=page_size,
+                                                     workers=workers, total=total)
+    return numbers, dates, ids
+
+
+def _read_collection_arrays(collection, game: str, *, page_size: int, workers: int,
+                            total: int | None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rules = game_rules(game)
+    width = int(rules["primary_count"]) + int(rules.get("bonus_count", 0) or 0)
+    total = int(collection.count() or 0) if total is None else int(total)
+    offsets = list(range(0, max(total, 0), page_size))
+
+    def load(offset: int):
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        rows = _parse_records(game, rules, width, page.get("metadatas") or [], page.get("ids") or [])
+        return _rows_to_arrays(rows, width)
+
+    if not offsets:
+        return _rows_to_arrays([], width)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(offsets))),
+                            thread_name_prefix=f"draw-read-{game}") as pool:
+        parts = list(pool.map(load, offsets))
+    numbers, dates, ordinals, ids = (np.concatenate([part[index] for part in parts]) for index in range(4))
+    order = np.argsort(ordinals, kind="stable")
+    return numbers[order], dates[order], ordinals[order], ids[order]
+
+
+class DrawStore:
+    def __init__(self, game: str, root: str | Path | None = None):
+        base_root = Path(root or Path(os.environ.get("DATA_DIR", "/data")) / "draw_store")
+        self.game = game
+        self.directory = base_root / game
+        rules = game_rules(game)
+        self.primary_count = int(rules["primary_count"])
+        self.width = self.primary_count + int(rules.get("bonus_count", 0) or 0)
+        self._rules = rules
+        self._arrays: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+        self._meta: dict | None = None
+        self._pending: list[dict] = []
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    @property
+    def built(self) -> bool:
+        if self._meta is None:
+            try:
+                with self._path("meta.json").open("r", encoding="utf-8") as handle:
+                    self._meta = json.load(handle) or {}
+            except (OSError, ValueError):
+                self._meta = {}
+        return int(self._meta.get("width", -1)) == self.width and self._meta.get("sort_key") == _SORT_KEY
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            log_file = self._path("rows.log")
+            try:
+                if log_file.exists():
+                    for line in log_file.read_text(encoding="utf-8").splitlines():
+                        try:
+                            self._pending.append(json.loads(line))
+                        except ValueError:
+                            # A torn final line from a crash mid-append.
+                            continue
+            except OSError as exc:
+                print(f"⚠ Failed to read draw store log for {self.game}: {exc}")
+            self._loaded = True
+
+    def _rows_from_records(self, metadatas: list[dict], ids: list[str]) -> list[dict]:
+        return _parse_records(self.game, self._rules, self.width, metadatas, ids)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        with self._lock:
+            numbers = self._base()[0]
+            return len(numbers) + len(self._pending)
+
+    # -- writes ------------------------------------------------------------
+
+    def add(self, metadatas: list[dict], ids: list[str]) -> int:
+        """Parse records that were just stored in Chroma and append them to the log."""
+        rows = self._rows_from_records(metadatas, ids)
+        if not rows:
+            return 0
+        self._ensure_loaded()
+        with self._lock:
+            self._pending.extend(rows)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with self._path("rows.log").open("a", encoding="utf-8") as handle:
+                    handle.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows))
+            except OSError as exc:
+                print(f"⚠ Failed to append to draw store for {self.game}: {exc}")
+            numbers = self._base()[0]
+            if len(self._pending) >= max(_COMPACT_MIN, len(numbers) // 10):
+                self.compact()
+        return len(rows)
+
+    def compact(self) -> None:
+        """Fold the append log into the sorted base arrays."""
+        self._ensure_loaded()
+        with self._lock:
+            if not self._pending and self.built:
+                return
+            numbers, dates, ordinals, ids = self._base()
+            if self._pending:
+                new_numbers, new_dates, new_ordinals, new_ids = _rows_to_arrays(self._pending, self.width)
+                numbers = np.concatenate([numbers, new_numbers])
+                dates = np.concatenate([dates, new_dates])
+                ordinals = np.concatenate([ordinals, new_ordinals])
+                ids = np.concatenate([ids.astype(str), new_ids]) if len(ids) else new_ids
+                # Keep the last write of each id, then order by draw ordinal.
+                _, first_from_end = np.unique(ids[::-1], return_index=True)
+                keep = np.sort(len(ids) - 1 - first_from_end)
+                order = keep[np.argsort(ordinals[keep], kind="stable")]
+                numbers, dates, ordinals, ids = numbers[order], dates[order], ordinals[order], ids[order]
+            self._write(numbers, dates, ordinals, ids)
+            self._pending = []
+
+    def _write(self, numbers: np.ndarray, dates: np.ndarray, ordinals: np.ndarray, ids: np.ndarray) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Unbuilt while the arrays are swapped: a crash in between forces a rebuild.
+            self._path("meta.json").unlink(missing_ok=True)
+            self._meta = {}
+            for name, array in zip(_ARRAYS, (numbers, dates, ordinals, ids)):
+                tmp = self._path(f"{name}.tmp.npy")
+                np.save(tmp, np.ascontiguousarray(array))
+                os.replace(str(tmp), str(self._path(f"{name}.npy")))
+            meta = {"rows": int(len(numbers)), "width": self.width, "sort_key": _SORT_KEY}
+            tmp_meta = self._path("meta.json.tmp")
+            with tmp_meta.open("w", encoding="utf-8") as handle:
+                json.dump(meta, handle)
+            os.replace(str(tmp_meta), str(self._path("meta.json")))
+            self._path("rows.log").unlink(missing_ok=True)
+            self._meta = meta
+        except OSError as exc:
+            print(f"⚠ Failed to write draw store for {self.game}: {exc}")
+        self._arrays = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = []
+            self._arrays = None
+            self._meta = {}
+            self._loaded = True
+            for name in [f"{name}.npy" for name in _ARRAYS] + ["rows.log", "meta.json"]:
+                try:
+                    self._path(name).unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def rebuild(self, collection, page_size: int = 5_000, total: int | None = None) -> int:
+        """Replace the store with every draw currently stored in `collection`."""
+        arrays = _read_collection_arrays(
+            collection, self.game, page_size=page_size, workers=_REBUILD_WORKERS, total=total
+        )
+        with self._lock:
+            self.clear()
+            self._write(*arrays)
+            return len(arrays[0])
+
+    def sync_with_collection(self, collection, stored_count: int, page_size: int = 5_000) -> None:
+        """
+        Make the store match a collection holding `stored_count` rows before ingest appends to it.
+
+        An empty collection resets the store; a collection with rows but no
+        built store (first run, or the game's number layout changed) is read
+        into it once.
+        """
+        if stored_count <= 0:
+            if self.built or len(self):
+                self.clear()
+            return
+        if not self.built:
+            print(f"  ↳ Building local draw store for {self.game} from {stored_count} stored rows...")
+            rebuilt = self.rebuild(collection, page_size=page_size, total=stored_count)
+            print(f"  ✓ Draw store holds {rebuilt} parsed draws")
+
+    # -- reads -------------------------------------------------------------
+
+    def _base(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            if self.built:
+                try:
+                    self._arrays = tuple(np.load(self._path(f"{name}.npy"), mmap_mode="r") for name in _ARRAYS)
+                except (OSError, ValueError) as exc:
+                    print(f"⚠ Failed to open draw store for {self.game}: {exc}")
+            if self._arrays is None:
+                return (
+                    np.empty((0, self.width), dtype=_NUMBERS_DTYPE),
+                    np.empty(0, dtype=_DATES_DTYPE),
+                    np.empty(0, dtype=_DATES_DTYPE),
+                    np.empty(0, dtype=str),
+                )
+        return self._arrays
+
+    def read(self, limit: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (numbers, dates, ids) of the latest `limit` draws (all when None), oldest first.
+
+        Returns read-only memory-mapped views; copy before mutating.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if self._pending:
+                self.compact()
+            numbers, dates, _, ids = self._base()
+        if limit is not None and limit > 0:
+            numbers, dates, ids = numbers[-limit:], dates[-limit:], ids[-limit:]
+        return numbers, dates, ids
+
+    def sequences(self, limit: int | None = None) -> list[list[int]]:
+        """Latest draws as number lists (primaries then bonus), oldest first."""
+        numbers, _, _ = self.read(limit)
+        return sequences_from_numbers(numbers)
+
+
+_stores: dict[str, DrawStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_draw_store(game: str) -> DrawStore:
+    with _stores_lock:
+        store = _stores.get(game)
+        if store is None:
+            store = DrawStore(game)
+            _stores[game] = store
+        return store
+
+
+def load_draw_store(game: str) -> DrawStore | None:
+    """
+    The game's store, built from Chroma on first use; None when disabled or unavailable.
+
+    Callers fall back to reading Chroma directly on None.
+    """
+    if not draw_store_enabled():
+        return None
+    store = get_draw_store(game)
+    if store.built:
+        return store
+    try:
+        from services.chroma_client import chroma_client
+
+        collection = chroma_client.client.get_collection(game)
+        store.sync_with_collection(collection, int(collection.count() or 0))
+    except Exception as exc:
+        print(f"⚠ Draw store for {game} unavailable, reading Chroma: {exc}")
+        return None
+    return store if store.built else None
@@ -0,0 +1,231 @@
+"""
+Persistent per-game index of record ids already stored in Chroma.
+
+Ingest dedupe used to preload every id with `collection.get(include=[])`,
+which only scaled to ~15k rows. The index instead keeps a compact on-disk set
+per game under `DATA_DIR/id_index/<game>/`:
+
+- `ids.npy`: sorted uint64 keys (first 64 bits of each md5 record id), checked
+  in batches with `np.searchsorted`.
+- `ids.log`: append-only uint64 keys written after each stored batch; folded
+  into `ids.npy` once it grows past a fraction of the base array.
+
+A 64-bit prefix of an md5 id makes false positives negligible (~n / 2**64).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+_DTYPE = np.dtype("<u8")
+_COMPACT_MIN = 50_000
+
+
+def id_key(record_id: str) -> int:
+    """64-bit key of a record id (md5 hex ids use their first 16 hex digits)."""
+    text = str(record_id)
+    try:
+        return int(text[:16], 16) if len(text) >= 16 else _fallback_key(text)
+    except ValueError:
+        return _fallback_key(text)
+
+
+def _fallback_key(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+class IdIndex:
+    def __init__(self, game: str, root: str | Path | None = None):
+        base_root = Path(root or Path(os.environ.get("DATA_DIR", "/data")) / "id_index")
+        self.game = game
+        self.directory = base_root / game
+        self._base = np.empty(0, dtype=_DTYPE)
+        self._pending: set[int] = set()
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    @property
+    def _base_file(self) -> Path:
+        return self.directory / "ids.npy"
+
+    @property
+    def _log_file(self) -> Path:
+        return self.directory / "ids.log"
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                if self._base_file.exists():
+                    self._base = np.load(self._base_file).astype(_DTYPE, copy=False)
+                if self._log_file.exists():
+                    raw = self._log_file.read_bytes()
+                    usable = len(raw) - (len(raw) % _DTYPE.itemsize)
+                    logged = np.frombuffer(raw[:usable], dtype=_DTYPE)
+                    if len(logged):
+                        self._pending = set(logged[~self._lookup(logged)].tolist())
+            except Exception as exc:
+                print(f"⚠ Failed to load id index for {self.game}: {exc}; starting empty")
+                self._base = np.empty(0, dtype=_DTYPE)
+                self._pending = set()
+            self._loaded = True
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Membership of `keys` in the sorted base array."""
+        if not len(self._base) or not len(keys):
+            return np.zeros(len(keys), dtype=bool)
+        positions = np.searchsorted(self._base, keys)
+        positions[positions >= len(self._base)] = 0
+        return self._base[positions] == keys
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        with self._lock:
+            return len(self._base) + len(self._pending)
+
+    def contains_many(self, record_ids: Iterable[str]) -> list[bool]:
+        self._ensure_loaded()
+        keys = np.fromiter((id_key(record_id) for record_id in record_ids), dtype=_DTYPE)
+        with self._lock:
+            found = self._lookup(keys)
+            if self._pending:
+                pending = self._pending
+                for idx in np.flatnonzero(~found):
+                    if int(keys[idx]) in pending:
+                        found[idx] = True
+        return found.tolist()
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.contains_many([record_id])[0]
+
+    def add(self, record_ids: Iterable[str]) -> None:
+        """Record ids that were just stored; appended to the log immediately."""
+        self._ensure_loaded()
+        keys = np.fromiter((id_key(record_id) for record_id in record_ids), dtype=_DTYPE)
+        if not len(keys):
+            return
+        with self._lock:
+            keys = np.unique(keys)
+            keys = keys[~self._lookup(keys)]
+            fresh = [key for key in keys.tolist() if key not in self._pending]
+            if not fresh:
+                return
+            self._pending.update(fresh)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with self._log_file.open("ab") as handle:
+                    handle.write(np.asarray(fresh, dtype=_DTYPE).tobytes())
+            except OSError as exc:
+                print(f"⚠ Failed to append to id index for {self.game}: {exc}")
+            if len(self._pending) >= max(_COMPACT_MIN, len(self._base) // 10):
+                self.compact()
+
+    # Set-like alias so the index can stand in for `existing_ids`.
+    update = add
+
+    def compact(self) -> None:
+        """Fold the append log into the sorted base array."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._pending:
+                pending = np.fromiter(self._pending, dtype=_DTYPE, count=len(self._pending))
+                self._base = np.union1d(self._base, pending).astype(_DTYPE, copy=False)
+                self._pending = set()
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self.directory / "ids.tmp.npy"
+                np.save(tmp, self._base)
+                os.replace(str(tmp), str(self._base_file))
+                self._log_file.unlink(missing_ok=True)
+            except OSError as exc:
+                print(f"⚠ Failed to compact id index for {self.game}: {exc}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._base = np.empty(0, dtype=_DTYPE)
+            self._pending = set()
+            self._loaded = True
+            for path in (self._base_file, self._log_file):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def rebuild(self, collection, page_size: int = 10_000) -> int:
+        """Replace the index with every id currently stored in `collection`."""
+        keys: list[np.ndarray] = []
+        offset = 0
+        while True:
+            page = collection.get(include=[], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if ids:
+                keys.append(np.fromiter((id_key(record_id) for record_id in ids), dtype=_DTYPE, count=len(ids)))
+            if len(ids) < page_size:
+                break
+            offset += len(ids)
+        with self._lock:
+            self._base = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=_DTYPE)
+            self._pending = set()
+            self._loaded = True
+            self.compact()
+            return len(self._base)
+
+    def sync_with_collection(self, collection, stored_count: int, page_size: int = 10_000) -> None:
+        """
+        Make the index safe to dedupe against a collection holding `stored_count` rows.
+
+        `stored_count` must be a live count: only an empty collection resets
+        the index. An index that disagrees with a populated collection (it is
+        missing, lost ids, or rows were deleted) is rebuilt, so a forced
+        reingest still writes only rows the collection does not hold.
+        """
+        if stored_count <= 0:
+            if len(self):
+                self.clear()
+            return
+        known = len(self)
+        if known != stored_count:
+            print(f"  ↳ Rebuilding id index for {self.game} from {stored_count} stored rows...")
+            rebuilt = self.rebuild(collection, page_size=page_size)
+            print(f"  ✓ Indexed {rebuilt} existing IDs for dedupe")
+
+
+class KnownIds:
+    """`existing_ids` view over an IdIndex plus per-run ids that are not persisted."""
+
+    def __init__(self, index: IdIndex, extra: Iterable[str] | None = None):
+        self.index = index
+        self.extra = set(extra or ())
+
+    def contains_many(self, record_ids: list[str]) -> list[bool]:
+        found = self.index.contains_many(record_ids)
+        if self.extra:
+            found = [hit or record_id in self.extra for hit, record_id in zip(found, record_ids)]
+        return found
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self.extra or record_id in self.index
+
+    def update(self, record_ids: Iterable[str]) -> None:
+        self.index.add(record_ids)
+
+
+_indexes: dict[str, IdIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_id_index(game: str) -> IdIndex:
+    with _indexes_lock:
+        index = _indexes.get(game)
+        if index is None:
+            index = IdIndex(game)
+            _indexes[game] = index
+        return index
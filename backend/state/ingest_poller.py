@@ -0,0 +1,234 @@
+"""
+Schedule-aware background ingest poller.
+
+Keeps collections fresh without a fixed full-download timer. For every game
+that already has data, the poller reads its draw schedule from
+`GAME_PREDICTION_SCHEDULES` and queues a delta-only manual ingest job (SoQL
+delta queries; games that cannot be synced incrementally are skipped rather
+than re-downloaded):
+
+- Scheduled games: once INGEST_POLL_LAG_S has passed after a scheduled draw
+  time. Socrata often publishes late, so a sync that adds nothing is retried
+  with exponential backoff (INGEST_POLL_RETRY_S, capped at
+  INGEST_POLL_RETRY_MAX_S) until INGEST_POLL_CATCHUP_S after the draw. Days
+  without draws (e.g. powerball outside `weekday_draws`) are never polled.
+- Rolling games (`rolling: True`, quickdraw): every INGEST_POLL_ROLLING_S.
+
+Games with a queued or running ingest are left alone for that tick.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, time as dt_time, timedelta
+from zoneinfo import ZoneInfo
+
+from config import GAME_CONFIGS, GAME_PREDICTION_SCHEDULES
+
+
+def scheduled_draws(game: str, start: datetime, end: datetime, tz: ZoneInfo) -> list[datetime]:
+    """Scheduled draw datetimes of `game` in [start, end), in `tz`."""
+    schedule = GAME_PREDICTION_SCHEDULES.get(game) or {}
+    times = [dt_time.fromisoformat(value) for value in schedule.get("draw_times") or []]
+    if not times or schedule.get("rolling"):
+        return []
+    daily_draws = int(schedule.get("daily_draws", 0) or 0)
+    weekday_draws = schedule.get("weekday_draws") or {}
+    draws = []
+    day = start.astimezone(tz).date() - timedelta(days=1)
+    while day <= end.astimezone(tz).date():
+        count = int(weekday_draws.get(day.weekday(), daily_draws) or 0) if weekday_draws else daily_draws
+        for draw_time in times[:count]:
+            when = datetime.combine(day, draw_time, tzinfo=tz)
+            if start <= when < end:
+                draws.append(when)
+        day += timedelta(days=1)
+    return draws
+
+
+class IngestPoller:
+    def __init__(self, games: list[str] | None = None, now_fn=None, enqueue_fn=None, job_state_fn=None,
+                 populated_fn=None):
+        self.enabled = os.getenv("INGEST_POLLER", "1") != "0"
+        self.tick_s = max(1.0, float(os.getenv("INGEST_POLL_TICK_S", "60")))
+        self.lag = timedelta(seconds=float(os.getenv("INGEST_POLL_LAG_S", "1800")))
+        self.retry_s = max(1.0, float(os.getenv("INGEST_POLL_RETRY_S", "900")))
+        self.retry_max_s = max(self.retry_s, float(os.getenv("INGEST_POLL_RETRY_MAX_S", "7200")))
+        self.catchup = timedelta(seconds=float(os.getenv("INGEST_POLL_CATCHUP_S", "43200")))
+        self.rolling_s = max(1.0, float(os.getenv("INGEST_POLL_ROLLING_S", "600")))
+        self.tz = ZoneInfo(os.getenv("PREDICTION_TIMEZONE", "America/New_York"))
+        self.games = list(games or GAME_CONFIGS.keys())
+        self._now = now_fn or (lambda: datetime.now(self.tz))
+        self._enqueue = enqueue_fn or _enqueue_ingest
+        self._job_state = job_state_fn or _job_state
+        self._populated = populated_fn or _is_populated
+        self._games: dict[str, dict] = {
+            game: {"satisfied": None, "attempts": 0, "next_attempt": None, "pending_seq": None, "last": None}
+            for game in self.games
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> bool:
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="IngestPoller")
+        self._thread.start()
+        print(f"✓ Ingest poller started for {len(self.games)} games")
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as exc:
+                print(f"⚠ Ingest poller tick failed: {exc}")
+            self._stop.wait(self.tick_s)
+
+    # -- scheduling --------------------------------------------------------
+
+    def _rolling(self, game: str) -> bool:
+        return bool((GAME_PREDICTION_SCHEDULES.get(game) or {}).get("rolling"))
+
+    def latest_draw(self, game: str, now: datetime) -> datetime | None:
+        draws = scheduled_draws(game, now - timedelta(days=8), now + timedelta(seconds=1), self.tz)
+        return draws[-1] if draws else None
+
+    def next_draw(self, game: str, now: datetime) -> datetime | None:
+        draws = scheduled_draws(game, now + timedelta(seconds=1), now + timedelta(days=8), self.tz)
+        return draws[0] if draws else None
+
+    def tick(self) -> list[str]:
+        """Collect finished syncs and queue the ones that are due. Returns the games queued."""
+        now = self._now()
+        queued = []
+        for game in self.games:
+            with self._lock:
+                entry = self._games[game]
+                if entry["pending_seq"] is not None:
+                    self._collect(game, entry, now)
+                    if entry["pending_seq"] is not None:
+                        continue
+                due = self._due(game, entry, now)
+            if not due or not self._populated(game):
+                continue
+            job = self._enqueue(game)
+            if job is None:
+                continue
+            with self._lock:
+                entry["pending_seq"] = job["seq"]
+                entry["attempts"] += 1
+                entry["last"] = {"queued_at": now.isoformat(), "draw": due.isoformat()}
+                if self._rolling(game):
+                    entry["next_attempt"] = now + timedelta(seconds=self.rolling_s)
+                else:
+                    backoff = min(self.retry_s * (2 ** (entry["attempts"] - 1)), self.retry_max_s)
+                    entry["next_attempt"] = now + timedelta(seconds=backoff)
+            queued.append(game)
+        return queued
+
+    def _due(self, game: str, entry: dict, now: datetime) -> datetime | None:
+        """Draw a sync should be queued for now, or None."""
+        if entry["next_attempt"] is not None and now < entry["next_attempt"]:
+            return None
+        if self._rolling(game):
+            return now
+        draw = self.latest_draw(game, now)
+        if draw is None or (entry["satisfied"] is not None and draw <= entry["satisfied"]):
+            return None
+        if now < draw + self.lag:
+            return None
+        if now > draw + self.catchup:
+            if entry["attempts"]:
+                print(f"⚠ [POLLER] {game}: no new rows published for the {draw.isoformat()} draw; giving up")
+            entry["satisfied"] = draw
+            entry["attempts"] = 0
+            entry["next_attempt"] = None
+            return None
+        return draw
+
+    def _collect(self, game: str, entry: dict, now: datetime) -> None:
+        state = self._job_state(game) or {}
+        # seq is monotonic; a newer seq means a later job for the game finished our work too.
+        if int(state.get("seq") or 0) < entry["pending_seq"]:
+            return
+        status = str(state.get("status", "")).lower()
+        if status not in {"completed", "error", "cancelled"}:
+            return
+        entry["pending_seq"] = None
+        entry["last"] = {**(entry["last"] or {}), "status": status, "added": state.get("added", 0)}
+        if self._rolling(game):
+            entry["attempts"] = 0
+        elif status == "completed" and int(state.get("added") or 0) > 0:
+            # The newest scheduled draw is in; wait for the next one.
+            entry["satisfied"] = self.latest_draw(game, now)
+            entry["attempts"] = 0
+            entry["next_attempt"] = None
+
+    def status(self) -> dict:
+        now = self._now()
+        with self._lock:
+            games = {}
+            for game, entry in self._games.items():
+                next_draw = None if self._rolling(game) else self.next_draw(game, now)
+                games[game] = {
+                    "rolling": self._rolling(game),
+                    "next_draw": next_draw.isoformat() if next_draw else None,
+                    "next_attempt": entry["next_attempt"].isoformat() if entry["next_attempt"] else None,
+                    "satisfied_draw": entry["satisfied"].isoformat() if entry["satisfied"] else None,
+                    "attempts": entry["attempts"],
+                    "pending": entry["pending_seq"] is not None,
+                    "last": entry["last"],
+                }
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "games": games,
+        }
+
+
+def _enqueue_ingest(game: str) -> dict | None:
+    """Queue a non-force manual ingest job unless the game already has one."""
+    from state.ingest_state import (
+        enqueue_manual_ingest,
+        manual_ingest_queue,
+        manual_ingest_queue_lock,
+        manual_ingest_running,
+        set_manual_ingest_state,
+    )
+    from state.manual_ingest_worker import _start_manual_ingest_worker_if_needed
+
+    with manual_ingest_queue_lock:
+        busy = game in manual_ingest_running or any(job["game"] == game for job in manual_ingest_queue)
+    if busy:
+        return None
+    job = enqueue_manual_ingest(game, False, delta_only=True)
+    if job["state"] != "queued":
+        return None
+    set_manual_ingest_state(game, {"status": "queued", "queued": True, "seq": job["seq"], "force": False,
+                                   "source": "poller"})
+    _start_manual_ingest_worker_if_needed()
+    return job
+
+
+def _job_state(game: str) -> dict:
+    from state.ingest_state import get_manual_ingest_state
+
+    return get_manual_ingest_state(game)
+
+
+def _is_populated(game: str) -> bool:
+    # Only refresh games that were ingested before; empty ones need a full (manual/startup) ingest.
+    from state.draw_counts import get_draw_count
+
+    return get_draw_count(game) > 0
+
+
+ingest_poller = IngestPoller()
@@ -30,9 +30,17 @@ startup_state = {
 # Track manual ingestion progress globally
 manual_ingest_state = {}
 
-# Manual ingestion queue to serialize manual ingests (avoid parallel runs)
+# Resumable ingest checkpoints: {game: {endpoint: {"offset", "fingerprint", ...}}}.
+# Persisted in the same file as manual_ingest_state under _CHECKPOINTS_KEY.
+ingest_checkpoints: dict[str, dict[str, dict]] = {}
+_CHECKPOINTS_KEY = "_checkpoints"
+_checkpoints_lock = threading.Lock()
+
+# Manual ingestion queue. Workers (see state.manual_ingest_worker) take jobs
+# for different games in parallel, but never two jobs for the same game.
 manual_ingest_queue: deque[dict] = deque()
-manual_ingest_worker_running = False
+# Jobs currently being ingested, keyed by game.
+manual_ingest_running: dict[str, dict] = {}
 manual_ingest_queue_lock = threading.Lock()
 # Monotonic sequence for enqueued jobs to provide stable IDs even if the
 # worker consumes jobs quickly (prevents duplicate "position=1" confusion).
@@ -54,8 +62,14 @@ def _load_manual_ingest_state():
             with _ingest_state_file.open('r', encoding='utf-8') as fh:
                 data = json.load(fh) or {}
                 if isinstance(data, dict):
+                    checkpoints = data.pop(_CHECKPOINTS_KEY, None)
                     manual_ingest_state.clear()
                     manual_ingest_state.update(data)
+                    ingest_checkpoints.clear()
+                    if isinstance(checkpoints, dict):
+                        ingest_checkpoints.update(
+                            {game: dict(eps) for game, eps in checkpoints.items() if isinstance(eps, dict)}
+                        )
     except Exception as e:
         print(f"⚠ Failed to load manual ingest state from {_ingest_state_file}: {e}")
 
@@ -65,8 +79,12 @@ def _save_manual_ingest_state():
     try:
         _ingest_state_file.parent.mkdir(parents=True, exist_ok=True)
         tmp = _ingest_state_file.with_suffix('.tmp')
+        with _checkpoints_lock:
+            payload = {**manual_ingest_state, _CHECKPOINTS_KEY: {
+                game: dict(eps) for game, eps in ingest_checkpoints.items() if eps
+            }}
         with tmp.open('w', encoding='utf-8') as fh:
-            json.dump(manual_ingest_state, fh, ensure_ascii=False, indent=2)
+            json.dump(payload, fh, ensure_ascii=False, indent=2)
             fh.flush()
             os.fsync(fh.fileno())
         os.replace(str(tmp), str(_ingest_state_file))
@@ -117,7 +135,7 @@ def _schedule_manual_ingest_state_save(*, force: bool = False):
 def set_manual_ingest_state(game_key: str, state: dict):
     """Update manual ingest state for a specific game."""
     manual_ingest_state[game_key] = state
-    terminal = str(state.get("status", "")).lower() in {"completed", "error", "failed"}
+    terminal = str(state.get("status", "")).lower() in {"completed", "error", "failed", "cancelled"}
     if terminal and str(state.get("status", "")).lower() == "completed":
         try:
             from state.draw_counts import update_draw_count
@@ -135,6 +153,49 @@ def get_manual_ingest_state(game_key: str) -> Dict[str, Any]:
     return manual_ingest_state.get(game_key, {})
 
 
+def get_ingest_checkpoint(game_key: str, endpoint: str) -> Dict[str, Any]:
+    """Last committed position of an interrupted endpoint ingest, or {}."""
+    with _checkpoints_lock:
+        return dict((ingest_checkpoints.get(game_key) or {}).get(endpoint) or {})
+
+
+def has_ingest_checkpoint(game_key: str) -> bool:
+    with _checkpoints_lock:
+        return bool(ingest_checkpoints.get(game_key))
+
+
+def set_ingest_checkpoint(game_key: str, endpoint: str, *, offset: int, fingerprint: str,
+                          watermark: str | None = None):
+    """
+    Record that rows [0, offset) of `endpoint` are stored in Chroma.
+
+    Saved through the debounced writer, like progress updates.
+    """
+    with _checkpoints_lock:
+        ingest_checkpoints.setdefault(game_key, {})[endpoint] = {
+            "offset": int(offset),
+            "fingerprint": fingerprint,
+            "watermark": watermark,
+            "updated_at": datetime.now().isoformat(),
+        }
+    _schedule_manual_ingest_state_save()
+
+
+def clear_ingest_checkpoints(game_key: str, endpoint: str | None = None):
+    """Drop one endpoint's checkpoint (finished) or every checkpoint of a game (reset)."""
+    with _checkpoints_lock:
+        endpoints = ingest_checkpoints.get(game_key)
+        if not endpoints:
+            return
+        if endpoint is None:
+            ingest_checkpoints.pop(game_key, None)
+        elif endpoints.pop(endpoint, None) is None:
+            return
+        if not endpoints:
+            ingest_checkpoints.pop(game_key, None)
+    _schedule_manual_ingest_state_save(force=True)
+
+
 def get_startup_state() -> Dict[str, Any]:
     """Get current startup state."""
     return startup_state
@@ -179,18 +240,92 @@ def get_manual_ingest_queue_size() -> int:
     return len(manual_ingest_queue)
 
 
-def enqueue_manual_ingest(game_key: str, force: bool = False) -> int:
-    """Add a manual ingestion job to the queue. Returns sequence number."""
+def enqueue_manual_ingest(game_key: str, force: bool = False, delta_only: bool = False) -> dict:
+    """
+    Queue a manual ingestion job, coalescing duplicates.
+
+    A job already queued for the game absorbs the request (a force request
+    upgrades it, a full request lifts `delta_only`). A running job absorbs
+    non-force requests, since it is already fetching the latest data; a force
+    request queues one follow-up. `delta_only` jobs (scheduled polls) skip
+    games that cannot be synced incrementally instead of downloading them.
+    Returns a snapshot {"game", "force", "seq", "state", "merged"} where
+    state is "queued" or "running".
+    """
     global manual_ingest_seq
-    manual_ingest_seq += 1
-    job = {
-        "game": game_key,
-        "force": force,
-        "seq": manual_ingest_seq
-    }
     with manual_ingest_queue_lock:
+        for job in manual_ingest_queue:
+            if job["game"] == game_key:
+                job["force"] = job["force"] or force
+                job["delta_only"] = job.get("delta_only", False) and delta_only
+                return {**_job_snapshot(job), "state": "queued", "merged": True}
+        running = manual_ingest_running.get(game_key)
+        if running is not None and (not force or running["force"]):
+            return {**_job_snapshot(running), "state": "running", "merged": True}
+        manual_ingest_seq += 1
+        job = {
+            "game": game_key,
+            "force": force,
+            "seq": manual_ingest_seq,
+            "delta_only": delta_only,
+            "cancel": threading.Event(),
+        }
         manual_ingest_queue.append(job)
-    return manual_ingest_seq
+        return {**_job_snapshot(job), "state": "queued", "merged": False}
+
+
+def cancel_manual_ingest(game_key: str) -> str | None:
+    """
+    Cancel a game's queued job and/or signal its running job to stop.
+
+    Running ingests check the signal between batches. Returns "cancelling"
+    when a running job was signalled, "cancelled" when only a queued job was
+    dropped, or None when the game had no job.
+    """
+    with manual_ingest_queue_lock:
+        queued = [job for job in manual_ingest_queue if job["game"] == game_key]
+        for job in queued:
+            manual_ingest_queue.remove(job)
+        running = manual_ingest_running.get(game_key)
+        if running is not None:
+            running["cancel"].set()
+            return "cancelling"
+    return "cancelled" if queued else None
+
+
+def claim_ingest(game_key: str, owner: str) -> dict | None:
+    """
+    Register an ingest that runs outside the manual queue (startup ingestion).
+
+    It takes the same per-game slot as a running manual job, so manual jobs
+    for the game wait behind it and `cancel_manual_ingest` can signal it.
+    Returns the claim, or None when a manual job already has the game queued
+    or running (that job will fetch it).
+    """
+    global manual_ingest_seq
+    with manual_ingest_queue_lock:
+        if game_key in manual_ingest_running or any(job["game"] == game_key for job in manual_ingest_queue):
+            return None
+        manual_ingest_seq += 1
+        claim = {
+            "game": game_key,
+            "force": False,
+            "seq": manual_ingest_seq,
+            "owner": owner,
+            "cancel": threading.Event(),
+        }
+        manual_ingest_running[game_key] = claim
+        return claim
+
+
+def release_ingest_claim(claim: dict) -> None:
+    with manual_ingest_queue_lock:
+        if manual_ingest_running.get(claim["game"]) is claim:
+            del manual_ingest_running[claim["game"]]
+
+
+def _job_snapshot(job: dict) -> dict:
+    return {"game": job["game"], "force": job["force"], "seq": job["seq"]}
 
 
 # Load persisted state at startup (best-effort)
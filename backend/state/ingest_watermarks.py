@@ -0,0 +1,157 @@
+"""
+Persistent per-dataset ingest watermarks.
+
+For every (game, dataset) pair we remember the newest draw date already stored
+in Chroma together with the dataset's column names. Incremental syncs use the
+watermark to request only newer rows from the SODA resource API instead of
+downloading the full history again.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+_watermarks_lock = threading.Lock()
+_watermarks: dict[str, dict] = {}
+_watermarks_file = Path(os.environ.get("DATA_DIR", "/data")) / "ingest_watermarks.json"
+_loaded = False
+# Pseudo dataset id for per-collection settings stored alongside the watermarks.
+_COLLECTION_KEY = "*"
+# Row id schemes live outside the per-game keys so clear_watermarks() cannot erase them:
+# re-picking a scheme for a populated collection would store every draw a second time.
+_SCHEMES_KEY = "row_id_schemes"
+
+
+def _key(game: str, dataset_id: str) -> str:
+    return f"{game}:{dataset_id}"
+
+
+def _ensure_loaded() -> None:
+    global _loaded
+    if _loaded:
+        return
+    with _watermarks_lock:
+        if _loaded:
+            return
+        try:
+            if _watermarks_file.exists():
+                with _watermarks_file.open("r", encoding="utf-8") as handle:
+                    data = json.load(handle) or {}
+                if isinstance(data, dict):
+                    for key, value in data.items():
+                        if isinstance(value, dict):
+                            _watermarks[str(key)] = value
+        except Exception as exc:
+            print(f"⚠ Failed to load ingest watermarks from {_watermarks_file}: {exc}")
+        _loaded = True
+
+
+def _persist() -> None:
+    try:
+        _watermarks_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _watermarks_file.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(_watermarks, handle, ensure_ascii=False, indent=2, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(str(tmp), str(_watermarks_file))
+    except Exception as exc:
+        print(f"⚠ Failed to persist ingest watermarks to {_watermarks_file}: {exc}")
+
+
+def get_watermark(game: str, dataset_id: str) -> dict:
+    """Return {"field", "value", "columns", "updated_at"} or {} when unknown."""
+    _ensure_loaded()
+    with _watermarks_lock:
+        return dict(_watermarks.get(_key(game, dataset_id)) or {})
+
+
+def update_watermark(game: str, dataset_id: str, *, field: str | None = None, value: str | None = None,
+                     columns: list[str] | None = None) -> dict:
+    """
+    Merge new information into a dataset watermark.
+
+    `value` only ever moves forward (ISO dates compare lexicographically), so
+    concurrent or replayed ingests cannot rewind it.
+    """
+    _ensure_loaded()
+    with _watermarks_lock:
+        entry = dict(_watermarks.get(_key(game, dataset_id)) or {})
+        if field:
+            entry["field"] = field
+        if value and (not entry.get("value") or str(value) > str(entry["value"])):
+            entry["value"] = str(value)
+        if columns:
+            entry["columns"] = list(columns)
+        entry["updated_at"] = time.time()
+        _watermarks[_key(game, dataset_id)] = entry
+        snapshot = dict(entry)
+    _persist()
+    return snapshot
+
+
+def get_row_id_scheme(game: str) -> str | None:
+    """Row id scheme recorded for a game's collection (see services.batch_normalizer)."""
+    _ensure_loaded()
+    with _watermarks_lock:
+        scheme = (_watermarks.get(_SCHEMES_KEY) or {}).get(game)
+    # Older files kept the scheme in the collection entry.
+    return scheme or get_watermark(game, _COLLECTION_KEY).get("row_id_scheme")
+
+
+def set_row_id_scheme(game: str, scheme: str) -> None:
+    _ensure_loaded()
+    with _watermarks_lock:
+        schemes = dict(_watermarks.get(_SCHEMES_KEY) or {})
+        schemes[game] = scheme
+        _watermarks[_SCHEMES_KEY] = schemes
+    _persist()
+
+
+def get_draw_ordinals(game: str) -> dict:
+    """
+    {"min", "max", "complete"} of the `draw_ordinal` values stored for a game.
+
+    `complete` is only set when every stored row carries an ordinal (the
+    collection was ingested from empty), so range queries cannot miss rows.
+    """
+    entry = get_watermark(game, _COLLECTION_KEY)
+    return {
+        "min": entry.get("draw_ordinal_min"),
+        "max": entry.get("draw_ordinal_max"),
+        "complete": bool(entry.get("draw_ordinals_complete")),
+    }
+
+
+def update_draw_ordinals(game: str, *, low: int | None = None, high: int | None = None,
+                         complete: bool | None = None) -> None:
+    """Widen the stored ordinal range (the high-water mark only moves forward)."""
+    _ensure_loaded()
+    with _watermarks_lock:
+        entry = dict(_watermarks.get(_key(game, _COLLECTION_KEY)) or {})
+        if low is not None and (entry.get("draw_ordinal_min") is None or low < entry["draw_ordinal_min"]):
+            entry["draw_ordinal_min"] = int(low)
+        if high is not None and (entry.get("draw_ordinal_max") is None or high > entry["draw_ordinal_max"]):
+            entry["draw_ordinal_max"] = int(high)
+        if complete is not None:
+            entry["draw_ordinals_complete"] = bool(complete)
+        entry["updated_at"] = time.time()
+        _watermarks[_key(game, _COLLECTION_KEY)] = entry
+    _persist()
+
+
+def clear_watermarks(game: str) -> None:
+    """
+    Forget every dataset watermark of a game (e.g. after its collection is reset).
+
+    The row id scheme is kept; see set_row_id_scheme.
+    """
+    _ensure_loaded()
+    prefix = f"{game}:"
+    with _watermarks_lock:
+        for key in [key for key in _watermarks if key.startswith(prefix)]:
+            del _watermarks[key]
+    _persist()
@@ -7,15 +7,21 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from state.ingest_state import (
+    claim_ingest,
+    has_ingest_checkpoint,
+    release_ingest_claim,
     startup_state,
     update_startup_progress,
     set_game_status,
 )
-from services.ingest import ingest_service
+from services.http_pool import http_pool
+from services.ingest import IngestCancelled, ingest_service
 
 
 _startup_state_lock = threading.Lock()
-_startup_parallel = max(1, int(os.getenv("INGEST_STARTUP_PARALLEL", "1")))
+# Downloads share http_pool's global/per-host caps, so by default let every
+# pooled slot drive its own game during cold start.
+_startup_parallel = max(1, int(os.getenv("INGEST_STARTUP_PARALLEL", str(http_pool.max_concurrency))))
 _startup_count_workers = max(1, int(os.getenv("INGEST_STARTUP_COUNT_WORKERS", "4")))
 
 
@@ -30,9 +36,22 @@ def _prefetch_existing_counts(games: list[str]) -> dict[str, int]:
 
 
 def _ingest_single_game(game: str, game_index: int, total_games: int, existing_draws: int):
-    """Ingest one configured game and update startup state."""
+    """
+    Ingest one configured game and update startup state.
+
+    The game is claimed in the manual ingest slots first. Interrupted ingests
+    resumed at startup are queued as manual jobs and share its checkpoints,
+    so when one holds the game this run leaves the game to it.
+    """
+    claim = claim_ingest(game, owner="startup")
+    if claim is None:
+        print(f"⏭ [STARTUP] Skipping {game} — a queued or running ingest job already covers it")
+        with _startup_state_lock:
+            set_game_status(game, "completed")
+        return
     try:
-        if existing_draws > 0:
+        # A game with checkpoints was interrupted mid-download; finish it instead of skipping.
+        if existing_draws > 0 and not has_ingest_checkpoint(game):
             print(f"⏭ [STARTUP] Skipping {game} — {existing_draws} draws already in Chroma")
             with _startup_state_lock:
                 set_game_status(game, "completed")
@@ -59,6 +78,7 @@ def _ingest_single_game(game: str, game_index: int, total_games: int, existing_d
 
         def update_game_progress(rows_fetched, total_rows):
             with _startup_state_lock:
+                startup_state["games"][game]["pipeline"] = ingest_service.get_pipeline_stats(game)
                 update_startup_state(
                     startup_state,
                     current_game=game,
@@ -71,6 +91,7 @@ def _ingest_single_game(game: str, game_index: int, total_games: int, existing_d
             game,
             progress_callback=update_game_progress,
             force=False,
+            cancel_event=claim["cancel"],
         )
 
         with _startup_state_lock:
@@ -82,10 +103,20 @@ def _ingest_single_game(game: str, game_index: int, total_games: int, existing_d
                 current_game_rows_fetched=result.get("total", 0),
                 current_game_rows_total=result.get("total", 0),
             )
+    except IngestCancelled:
+        with _startup_state_lock:
+            set_game_status(game, "cancelled")
+        print(f"⏹ [STARTUP] Cancelled ingest for {game}")
     except Exception as exc:
         with _startup_state_lock:
             set_game_status(game, "error", error=str(exc))
         print(f"Failed to ingest {game}: {exc}")
+    finally:
+        release_ingest_claim(claim)
+        # Manual jobs for this game may have queued behind the claim.
+        from state.manual_ingest_worker import _start_manual_ingest_worker_if_needed
+
+        _start_manual_ingest_worker_if_needed()
 
 
 def start_background_ingestion():
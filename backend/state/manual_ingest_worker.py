@@ -1,83 +1,165 @@
 """
-Manual ingestion queue management and worker.
+Manual ingestion queue management and worker pool.
+
+Up to INGEST_MANUAL_WORKERS jobs run at once, each for a different game; a
+game's next job waits until its current one finishes.
 """
+import os
 import threading
-from collections import deque
 from state.ingest_state import (
-    manual_ingest_queue, 
-    manual_ingest_worker_running, 
+    ingest_checkpoints,
+    manual_ingest_state,
+    manual_ingest_queue,
+    manual_ingest_running,
     manual_ingest_queue_lock,
     set_manual_ingest_state,
-    get_manual_ingest_queue_size,
     enqueue_manual_ingest
 )
-from services.ingest import ingest_service
+from services.ingest import IngestCancelled, ingest_service
 
 
-def _start_manual_ingest_worker_if_needed():
-    """Start the manual ingestion worker if not already running."""
-    global manual_ingest_worker_running
+_max_workers = max(1, int(os.getenv("INGEST_MANUAL_WORKERS", "2")))
+_active_workers = 0
 
-    def worker():
-        global manual_ingest_worker_running
-        try:
-            while True:
-                with manual_ingest_queue_lock:
-                    if not manual_ingest_queue:
-                        manual_ingest_worker_running = False
-                        return
-                    job = manual_ingest_queue.popleft()
-
-                game_key = job.get("game")
-                force = job.get("force", False)
-
-                # Mark queued -> ingesting
-                set_manual_ingest_state(game_key, {
-                    "status": "ingesting",
-                    "rows_fetched": 0,
-                    "total_rows": 0,
-                    "progress": 0,
-                    "queued": False,
-                })
-
-                def progress_callback(rows_fetched, total_rows):
-                    set_manual_ingest_state(game_key, {
-                        "status": "ingesting",
-                        "rows_fetched": rows_fetched,
-                        "total_rows": total_rows,
-                        "progress": (rows_fetched / total_rows * 100) if total_rows > 0 else 0,
-                    })
-
-                try:
-                    print(f"📥 [QUEUE] Starting ingest for {game_key}")
-                    result = ingest_service.fetch_and_sync(
-                        game_key,
-                        progress_callback=progress_callback,
-                        force=force,
-                    )
-
-                    set_manual_ingest_state(game_key, {
-                        "status": "completed",
-                        "rows_fetched": result.get("total", 0),
-                        "total_rows": result.get("total", 0),
-                        "progress": 100,
-                        "added": result.get("added", 0),
-                    })
-                    print(f"✅ [QUEUE] Completed ingest for {game_key}")
-                except Exception as exc:
-                    set_manual_ingest_state(game_key, {
-                        "status": "error",
-                        "error": str(exc),
-                    })
-                    print(f"❌ [QUEUE] Ingest failed for {game_key}: {exc}")
-
-        except Exception:
-            manual_ingest_worker_running = False
-            raise
 
+def _next_job():
+    """Claim the oldest queued job whose game is idle; retire the worker when there is none."""
+    global _active_workers
     with manual_ingest_queue_lock:
-        if manual_ingest_worker_running:
+        for job in manual_ingest_queue:
+            if job["game"] not in manual_ingest_running:
+                manual_ingest_queue.remove(job)
+                manual_ingest_running[job["game"]] = job
+                return job
+        _active_workers -= 1
+        return None
+
+
+def _run_job(job: dict):
+    game_key = job.get("game")
+    force = job.get("force", False)
+    cancel_event = job["cancel"]
+
+    # Mark queued -> ingesting
+    set_manual_ingest_state(game_key, {
+        "status": "ingesting",
+        "rows_fetched": 0,
+        "total_rows": 0,
+        "progress": 0,
+        "queued": False,
+        "force": force,
+        "seq": job.get("seq"),
+    })
+
+    def progress_callback(rows_fetched, total_rows):
+        set_manual_ingest_state(game_key, {
+            "status": "ingesting",
+            "rows_fetched": rows_fetched,
+            "total_rows": total_rows,
+            "progress": (rows_fetched / total_rows * 100) if total_rows > 0 else 0,
+            "pipeline": ingest_service.get_pipeline_stats(game_key),
+            "force": force,
+            "seq": job.get("seq"),
+            "cancel_requested": cancel_event.is_set(),
+        })
+
+    try:
+        print(f"📥 [QUEUE] Starting ingest for {game_key}")
+        result = ingest_service.fetch_and_sync(
+            game_key,
+            progress_callback=progress_callback,
+            force=force,
+            cancel_event=cancel_event,
+            delta_only=job.get("delta_only", False),
+        )
+
+        set_manual_ingest_state(game_key, {
+            "status": "completed",
+            "rows_fetched": result.get("total", 0),
+            "total_rows": result.get("total", 0),
+            "progress": 100,
+            "added": result.get("added", 0),
+            "pipeline": result.get("pipeline") or {},
+            "seq": job.get("seq"),
+        })
+        print(f"✅ [QUEUE] Completed ingest for {game_key}")
+    except IngestCancelled:
+        previous = manual_ingest_state.get(game_key) or {}
+        set_manual_ingest_state(game_key, {
+            "status": "cancelled",
+            "rows_fetched": previous.get("rows_fetched", 0),
+            "total_rows": previous.get("total_rows", 0),
+            "progress": previous.get("progress", 0),
+            "seq": job.get("seq"),
+        })
+        print(f"⏹ [QUEUE] Cancelled ingest for {game_key}")
+    except Exception as exc:
+        set_manual_ingest_state(game_key, {
+            "status": "error",
+            "error": str(exc),
+            "seq": job.get("seq"),
+        })
+        print(f"❌ [QUEUE] Ingest failed for {game_key}: {exc}")
+
+
+def _worker():
+    while True:
+        job = _next_job()
+        if job is None:
             return
-        manual_ingest_worker_running = True
-    thread = threading.Thread(target=worker, daemon=True, name="ManualIngestWorker")
-    thread.start()
\ No newline at end of file
+        try:
+            _run_job(job)
+        finally:
+            with manual_ingest_queue_lock:
+                manual_ingest_running.pop(job["game"], None)
+
+
+def _start_manual_ingest_worker_if_needed():
+    """Start workers for queued jobs that can run now, up to INGEST_MANUAL_WORKERS."""
+    global _active_workers
+    with manual_ingest_queue_lock:
+        runnable = len({job["game"] for job in manual_ingest_queue if job["game"] not in manual_ingest_running})
+        to_start = max(0, min(_max_workers - _active_workers, runnable - _idle_capacity()))
+        _active_workers += to_start
+    for _ in range(to_start):
+        thread = threading.Thread(target=_worker, daemon=True, name="ManualIngestWorker")
+        thread.start()
+
+
+def _idle_capacity() -> int:
+    # Workers that are alive but not yet holding a job will pick up queued work themselves.
+    return max(0, _active_workers - len(manual_ingest_running))
+
+
+def resume_interrupted_ingests() -> list[str]:
+    """
+    Re-queue ingests that were queued or running when the backend stopped.
+
+    Covers manual jobs persisted as queued/ingesting and any game with
+    leftover ingest checkpoints (e.g. an interrupted startup ingest), except
+    games whose last job was cancelled. The re-run resumes each endpoint
+    from its last committed batch.
+    """
+    games = [
+        game for game, state in list(manual_ingest_state.items())
+        if isinstance(state, dict) and str(state.get("status", "")).lower() in {"queued", "ingesting"}
+    ]
+    games.extend(
+        game for game in list(ingest_checkpoints)
+        if game not in games
+        and str((manual_ingest_state.get(game) or {}).get("status", "")).lower() != "cancelled"
+    )
+    for game_key in games:
+        force = bool((manual_ingest_state.get(game_key) or {}).get("force", False))
+        job = enqueue_manual_ingest(game_key, force)
+        set_manual_ingest_state(game_key, {
+            "status": "queued",
+            "queued": True,
+            "seq": job["seq"],
+            "force": job["force"],
+            "resumed": True,
+        })
+        print(f"↻ [QUEUE] Resuming interrupted ingest for {game_key}")
+    if games:
+        _start_manual_ingest_worker_if_needed()
+    return games
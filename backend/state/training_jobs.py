@@ -0,0 +1,211 @@
+"""
+Background training jobs.
+
+A job wraps one training run submitted through `/api/train/jobs`. It runs on
+its own thread and returns immediately with a job id. The run reports phase,
+attempt, best accuracy and ETA into the job record, which
+`/api/train/jobs/{id}/stream` serves as server-sent events. Each job trains
+on its own copy of the trainer. Jobs still run one at a time to bound CPU
+use; later ones wait as `queued`.
+
+Cancelling sets the job's event. A queued job is dropped. A running one
+stops at the next attempt boundary and saves the best fully trained
+candidate it found, or keeps the previous model. Attempt progress and
+mid-run cancellation cover the legacy engine; a modular-engine job reports
+its phase and can only be cancelled before its backtest starts. Job records (without models) persist to DATA_DIR/training_jobs.json;
+jobs that were queued or running when the backend stopped load as `error`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("completed", "error", "cancelled")
+
+_jobs_lock = threading.Lock()
+_run_lock = threading.Lock()
+_jobs: dict[str, dict] = {}
+_cancel_events: dict[str, threading.Event] = {}
+_jobs_file = Path(os.environ.get("DATA_DIR", "/data")) / "training_jobs.json"
+_keep = max(1, int(os.getenv("TRAINING_JOBS_KEEP", "50")))
+_loaded = False
+
+
+def _ensure_loaded() -> None:
+    global _loaded
+    if _loaded:
+        return
+    with _jobs_lock:
+        if _loaded:
+            return
+        try:
+            if _jobs_file.exists():
+                with _jobs_file.open("r", encoding="utf-8") as handle:
+                    data = json.load(handle) or {}
+                for job_id, job in (data.items() if isinstance(data, dict) else []):
+                    if not isinstance(job, dict):
+                        continue
+                    if job.get("status") in ACTIVE_STATUSES:
+                        job.update(status="error", error="Interrupted by a backend restart.")
+                    _jobs[str(job_id)] = job
+        except Exception as exc:
+            print(f"⚠ Failed to load training jobs from {_jobs_file}: {exc}")
+        _loaded = True
+
+
+def _persist() -> None:
+    with _jobs_lock:
+        snapshot = json.dumps(_jobs, ensure_ascii=False, indent=2, default=str)
+    try:
+        _jobs_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _jobs_file.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            handle.write(snapshot)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(str(tmp), str(_jobs_file))
+    except Exception as exc:
+        print(f"⚠ Failed to persist training jobs to {_jobs_file}: {exc}")
+
+
+def _prune() -> None:
+    # Caller holds _jobs_lock. Oldest finished jobs go first.
+    finished = sorted(
+        (job for job in _jobs.values() if job.get("status") in FINAL_STATUSES),
+        key=lambda job: job.get("submitted_at") or 0,
+    )
+    for job in finished[: max(0, len(_jobs) - _keep)]:
+        _jobs.pop(job["job_id"], None)
+        _cancel_events.pop(job["job_id"], None)
+
+
+def _update(job_id: str, persist: bool = False, **fields) -> None:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        if job.get("started_at"):
+            job["elapsed_s"] = round(time.time() - job["started_at"], 1)
+    if persist:
+        _persist()
+
+
+def _run_job(job_id: str, run) -> None:
+    cancel_event = _cancel_events[job_id]
+    with _run_lock:
+        if cancel_event.is_set():
+            _update(job_id, persist=True, status="cancelled", phase="cancelled", finished_at=time.time())
+            print(f"⏹ [TRAIN] Cancelled queued training job {job_id}")
+            return
+        _update(job_id, persist=True, status="running", phase="starting", started_at=time.time())
+
+        def progress_callback(fields: dict) -> None:
+            fields = dict(fields)
+            if fields.get("best_accuracy") is not None:
+                fields["best_accuracy"] = round(float(fields["best_accuracy"]), 6)
+            if fields.get("attempt") and fields.get("total_attempts"):
+                fields["progress"] = round(min(100.0, fields["attempt"] / fields["total_attempts"] * 100), 1)
+            _update(job_id, **fields)
+
+        try:
+            result = run(progress_callback, cancel_event) or {}
+            failed = str(result.get("status") or "").lower() == "error"
+            if failed:
+                status = "error"
+            elif cancel_event.is_set():
+                status = "cancelled"
+            else:
+                status = "completed"
+            final = {"progress": 100.0} if status == "completed" else {}
+            _update(
+                job_id,
+                persist=True,
+                status=status,
+                phase=status,
+                eta_s=0.0,
+                result=result,
+                error=result.get("message") if failed else None,
+                finished_at=time.time(),
+                **final,
+            )
+            print(f"✓ [TRAIN] Training job {job_id} {status}")
+        except Exception as exc:
+            _update(job_id, persist=True, status="error", phase="error", error=str(exc), finished_at=time.time())
+            print(f"❌ [TRAIN] Training job {job_id} failed: {exc}")
+
+
+def submit_training_job(game: str, run, params: dict | None = None) -> dict:
+    """
+    Queue `run(progress_callback, cancel_event) -> result dict` on a background thread.
+
+    Returns the new job record.
+    """
+    _ensure_loaded()
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        "job_id": job_id,
+        "game": game,
+        "status": "queued",
+        "phase": "queued",
+        "params": dict(params or {}),
+        "attempt": 0,
+        "total_attempts": None,
+        "best_accuracy": None,
+        "progress": 0.0,
+        "eta_s": None,
+        "elapsed_s": 0.0,
+        "cancel_requested": False,
+        "result": None,
+        "error": None,
+        "submitted_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+        _cancel_events[job_id] = threading.Event()
+        _prune()
+        snapshot = dict(job)
+    _persist()
+    threading.Thread(target=_run_job, args=(job_id, run), daemon=True, name=f"TrainingJob-{job_id}").start()
+    return snapshot
+
+
+def get_training_job(job_id: str) -> dict | None:
+    _ensure_loaded()
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def list_training_jobs(game: str | None = None) -> list[dict]:
+    """Job summaries, newest first, without their full results."""
+    _ensure_loaded()
+    with _jobs_lock:
+        jobs = [
+            {key: value for key, value in job.items() if key != "result"}
+            for job in _jobs.values()
+            if game is None or job.get("game") == game
+        ]
+    return sorted(jobs, key=lambda job: job.get("submitted_at") or 0, reverse=True)
+
+
+def cancel_training_job(job_id: str) -> str:
+    """Request cancellation: 'cancelling' (running or queued), 'finished', or 'not_found'."""
+    _ensure_loaded()
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        event = _cancel_events.get(job_id)
+        if job is None:
+            return "not_found"
+        if job.get("status") not in ACTIVE_STATUSES or event is None:
+            return "finished"
+        event.set()
+        job["cancel_requested"] = True
+    return "cancelling"
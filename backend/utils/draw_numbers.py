@@ -0,0 +1,313 @@
+"""
+Winning-number parsing shared by ingest, the trainer, the legacy predictor
+and the local draw store.
+
+Chroma metadata carries draw results as free-form strings ("01 12 23 34 45",
+"472", separate bonus fields, ...). These helpers turn one metadata record
+into integer sequences: primaries clamped to the game's rules followed by
+the bonus numbers when present.
+
+Ingest parses each record once and stores the result as typed fields
+(`n1..nK`, `bonus1..`, `n_count`, `draw_ordinal`; see `typed_fields`).
+Records carrying them are read back directly instead of re-parsed.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+
+from config import GAME_CONFIGS, GAME_PREDICTION_SCHEDULES
+
+DATE_KEYS = ("draw_date", "drawdate", "date", "drawn_at", "draw_datetime")
+PICK3_SESSIONS = (("midday", "midday_daily"), ("evening", "evening_daily"))
+
+# draw_ordinal = epoch day * ORDINAL_DAY + intraday slot (minute of the draw
+# time, or 1/2 for midday/evening sessions without a time).
+ORDINAL_FIELD = "draw_ordinal"
+# Number of n*/bonus* values stored; 0 marks a record that did not parse.
+COUNT_FIELD = "n_count"
+ORDINAL_DAY = 10_000
+_SESSION_SLOTS = {"midday": 1, "evening": 2}
+_TYPED_KEY = re.compile(r"^(n|bonus)\d+$")
+_EPOCH = date(1970, 1, 1)
+
+
+def parse_numbers(raw_value) -> list[int]:
+    return [int(token) for token in re.findall(r"\d+", str(raw_value or ""))]
+
+
+def parse_pick3_digits(raw_value) -> list[int]:
+    text = str(raw_value or "").strip()
+    if not text:
+        return []
+    if text.isdigit():
+        padded = text.zfill(3)[-3:]
+        return [int(digit) for digit in padded]
+    return parse_numbers(text)
+
+
+def game_rules(game: str) -> dict:
+    base = {
+        "primary_count": 5,
+        "primary_min": 1,
+        "primary_max": 99,
+        "primary_unique": True,
+        "bonus_count": 0,
+        "bonus_min": 1,
+        "bonus_max": 99,
+        "bonus_keys": [],
+        "embedded_bonus_in_winning_numbers": False,
+    }
+    configured = GAME_CONFIGS.get(game, {}) or {}
+    merged = {**base, **configured}
+    merged["bonus_keys"] = [str(k).lower() for k in (merged.get("bonus_keys") or [])]
+    return merged
+
+
+def clamp_primary(numbers, rules: dict) -> list[int]:
+    valid = [
+        int(n)
+        for n in numbers
+        if rules["primary_min"] <= int(n) <= rules["primary_max"]
+    ]
+
+    if not valid:
+        return []
+
+    if rules.get("primary_unique", True):
+        seen = set()
+        uniq = []
+        for value in valid:
+            if value not in seen:
+                seen.add(value)
+                uniq.append(value)
+        valid = uniq
+
+    if len(valid) < rules["primary_count"]:
+        return []
+    return valid[:rules["primary_count"]]
+
+
+def extract_bonus_values(metadata: dict, rules: dict) -> list[int]:
+    bonus_count = int(rules.get("bonus_count", 0) or 0)
+    if bonus_count <= 0:
+        return []
+
+    values = []
+    bonus_min = int(rules.get("bonus_min", 1))
+    bonus_max = int(rules.get("bonus_max", 99))
+
+    for key, value in (metadata or {}).items():
+        key_lower = str(key).lower()
+        if key_lower in rules["bonus_keys"] or ("bonus" in key_lower and "winning" not in key_lower):
+            for item in parse_numbers(value):
+                if bonus_min <= item <= bonus_max:
+                    values.append(item)
+                    if len(values) >= bonus_count:
+                        return values[:bonus_count]
+    return values[:bonus_count]
+
+
+def extract_primary_candidate(metadata: dict, game: str | None = None) -> list[int]:
+    preferred = []
+    fallback = []
+    daily_fields = []
+
+    for key, value in (metadata or {}).items():
+        key_lower = str(key).lower()
+        if "draw_number" in key_lower or not str(value or "").strip():
+            continue
+
+        if key_lower in ("winning_numbers", "winningnumbers"):
+            preferred.append(value)
+        elif key_lower in ("midday_daily", "evening_daily"):
+            daily_fields.append(value)
+        elif "winning" in key_lower and "number" in key_lower:
+            fallback.append(value)
+        elif "numbers" in key_lower or "result" in key_lower:
+            fallback.append(value)
+
+    parse_value = parse_pick3_digits if str(game or "").lower() == "pick3" else parse_numbers
+    for candidate in preferred + daily_fields + fallback:
+        numbers = parse_value(candidate)
+        if numbers:
+            return numbers
+
+    return []
+
+
+def typed_sequence(metadata: dict, rules: dict) -> list[int]:
+    """Numbers stored by `typed_fields` (the caller checks COUNT_FIELD is present)."""
+    count = int(metadata.get(COUNT_FIELD) or 0)
+    primary_count = int(rules["primary_count"])
+    numbers = [metadata.get(f"n{index}") for index in range(1, min(count, primary_count) + 1)]
+    numbers += [metadata.get(f"bonus{index}") for index in range(1, count - primary_count + 1)]
+    if any(value is None for value in numbers):
+        return []
+    return [int(value) for value in numbers]
+
+
+def extract_record_sequence(metadata: dict, game: str, rules: dict | None = None) -> list[int]:
+    """Primaries (clamped to the game rules) followed by bonus numbers when present."""
+    rules = rules or game_rules(game)
+    if COUNT_FIELD in metadata:
+        return typed_sequence(metadata, rules)
+    winning_numbers = extract_primary_candidate(metadata, game=game)
+    if not winning_numbers:
+        return []
+
+    if str(game or "").lower() == "pick3":
+        if len(winning_numbers) == 1 and int(winning_numbers[0]) > 9:
+            winning_numbers = parse_pick3_digits(str(winning_numbers[0]))
+        elif len(winning_numbers) > 3:
+            flattened = []
+            for value in winning_numbers:
+                flattened.extend(parse_pick3_digits(str(value)))
+            winning_numbers = flattened
+
+    primary_count = int(rules["primary_count"])
+    bonus_count = int(rules.get("bonus_count", 0) or 0)
+
+    embedded_bonus = []
+    if rules.get("embedded_bonus_in_winning_numbers") and bonus_count > 0 and len(winning_numbers) >= primary_count + bonus_count:
+        embedded_bonus = winning_numbers[primary_count:primary_count + bonus_count]
+        winning_numbers = winning_numbers[:primary_count]
+
+    primary_numbers = clamp_primary(winning_numbers, rules)
+    if len(primary_numbers) != primary_count:
+        return []
+
+    bonus_numbers = extract_bonus_values(metadata, rules)
+    if not bonus_numbers and embedded_bonus:
+        bonus_min = int(rules.get("bonus_min", 1))
+        bonus_max = int(rules.get("bonus_max", 99))
+        bonus_numbers = [int(n) for n in embedded_bonus if bonus_min <= int(n) <= bonus_max][:bonus_count]
+
+    if bonus_count > 0 and bonus_numbers:
+        return primary_numbers + bonus_numbers[:bonus_count]
+    return primary_numbers
+
+
+def record_sequences(metadata: dict, game: str, rules: dict | None = None) -> list[tuple[str | None, list[int]]]:
+    """
+    (session, numbers) pairs for one metadata record.
+
+    Pick 3 rows without `winning_numbers` carry a midday and an evening
+    result; each becomes its own draw. Every other record yields at most one
+    pair with session None.
+    """
+    if not isinstance(metadata, dict):
+        return []
+    rules = rules or game_rules(game)
+    if str(game or "").lower() == "pick3" and not str(metadata.get("winning_numbers") or "").strip():
+        pairs = []
+        for session, field in PICK3_SESSIONS:
+            digits = parse_pick3_digits(metadata.get(field))
+            if len(digits) != 3:
+                continue
+            session_meta = {
+                **metadata,
+                "draw_session": session,
+                "winning_numbers": "".join(str(d) for d in digits),
+            }
+            numbers = extract_record_sequence(session_meta, game, rules)
+            if numbers:
+                pairs.append((session, numbers))
+        return pairs
+
+    numbers = extract_record_sequence(metadata, game, rules)
+    return [(None, numbers)] if numbers else []
+
+
+def extract_winning_sequences(metadatas, game: str) -> list[list[int]]:
+    rules = game_rules(game)
+    sequences = []
+    for meta in metadatas or []:
+        sequences.extend(numbers for _, numbers in record_sequences(meta, game, rules))
+    return sequences
+
+
+def metadata_sort_key(metadata) -> str:
+    if not isinstance(metadata, dict):
+        return ""
+    for key in DATE_KEYS:
+        for variant in (key, key.upper(), key.title()):
+            value = metadata.get(variant)
+            if value:
+                return str(value)
+    return ""
+
+
+def _draw_datetime(metadata) -> datetime | None:
+    text = metadata_sort_key(metadata).strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text[:19].replace(" ", "T").rstrip("Z"))
+    except ValueError:
+        try:
+            return datetime.strptime(text[:10], "%m/%d/%Y")
+        except ValueError:
+            return None
+
+
+def metadata_timestamp(metadata) -> int:
+    """Draw date of a record as epoch seconds (0 when missing or unparseable)."""
+    parsed = _draw_datetime(metadata)
+    if parsed is None:
+        return 0
+    return int(parsed.timestamp()) if parsed.tzinfo else int((parsed - datetime(1970, 1, 1)).total_seconds())
+
+
+def draw_ordinal(metadata) -> int | None:
+    """Integer that orders draws chronologically (see ORDINAL_FIELD), None without a date."""
+    parsed = _draw_datetime(metadata)
+    if parsed is None:
+        return None
+    slot = parsed.hour * 60 + parsed.minute
+    draw_time = str(metadata.get("draw_time") or "").strip()
+    if not slot and draw_time:
+        hour, _, minute = draw_time.partition(":")
+        if hour.isdigit() and minute[:2].isdigit():
+            slot = int(hour) * 60 + int(minute[:2])
+    if not slot:
+        slot = _SESSION_SLOTS.get(str(metadata.get("draw_session") or "").lower(), 0)
+    return (parsed.date() - _EPOCH).days * ORDINAL_DAY + slot
+
+
+def draws_per_day(game: str) -> float:
+    """Average scheduled draws per day, from GAME_PREDICTION_SCHEDULES (at least 1/7)."""
+    schedule = GAME_PREDICTION_SCHEDULES.get(game) or {}
+    daily = float(schedule.get("daily_draws", 0) or 0)
+    weekday_draws = schedule.get("weekday_draws") or {}
+    if weekday_draws:
+        daily = sum(float(weekday_draws.get(day, daily) or 0) for day in range(7)) / 7
+    return max(daily, 1 / 7)
+
+
+def typed_fields(metadata: dict, game: str, rules: dict | None = None) -> dict:
+    """
+    Pre-parsed fields to store alongside a record's raw metadata.
+
+    `n1..nK` are the primaries and `bonus1..` the bonus numbers, as
+    `extract_record_sequence` parses them; `n_count` is how many were stored.
+    Legacy Pick 3 rows holding both sessions only get their `draw_ordinal`.
+    """
+    rules = rules or game_rules(game)
+    fields = {}
+    ordinal = draw_ordinal(metadata)
+    if ordinal is not None:
+        fields[ORDINAL_FIELD] = ordinal
+    raw = {key: value for key, value in metadata.items()
+           if key not in (COUNT_FIELD, ORDINAL_FIELD) and not _TYPED_KEY.match(str(key))}
+    sequences = record_sequences(raw, game, rules)
+    if len(sequences) > 1:
+        return fields
+    numbers = sequences[0][1] if sequences else []
+    primary_count = int(rules["primary_count"])
+    for index, value in enumerate(numbers[:primary_count], start=1):
+        fields[f"n{index}"] = int(value)
+    for index, value in enumerate(numbers[primary_count:], start=1):
+        fields[f"bonus{index}"] = int(value)
+    fields[COUNT_FIELD] = len(numbers)
+    return fields
@@ -0,0 +1,49 @@
+"""Tests for the columnar ingest batch normalizer."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+pytest.importorskip("chromadb")
+
+from services import batch_normalizer
+from services.ingest import IngestService
+
+COLUMNS = [":sid", "draw_date", "midday_daily", "evening_daily", "winning_numbers"]
+ROWS = [
+    [1, "2024-01-01T00:00:00.000", "123", "7", "01 02 03"],
+    [2, "2024-01-02T00:00:00", None, "", None],
+    [3, "2024-01-03T00:00:00", "4567", "045", 12],
+]
+
+
+@pytest.mark.parametrize("game", ["take5", "pick3"])
+@pytest.mark.parametrize("scheme", [batch_normalizer.ROW_ID_LEGACY, batch_normalizer.ROW_ID_FAST])
+def test_columnar_batch_matches_row_by_row(game, scheme):
+    service = IngestService()
+    expected = service._build_row_records(game, ROWS, COLUMNS, 0, None, "draw_date", scheme)
+    metadatas, ids, max_watermark = batch_normalizer.normalize_batch(
+        game, ROWS, COLUMNS, row_id_scheme=scheme, watermark_field="draw_date"
+    )
+
+    assert (metadatas, ids, max_watermark) == (expected[0], expected[1], expected[3])
+    assert max_watermark == "2024-01-03T00:00:00"
+
+
+def test_pick3_expands_sessions_and_legacy_ids_are_stable():
+    metadatas, ids, _ = batch_normalizer.normalize_batch(
+        "pick3", ROWS[:1], COLUMNS, row_id_scheme=batch_normalizer.ROW_ID_LEGACY
+    )
+    assert [(meta["draw_session"], meta["winning_numbers"]) for meta in metadatas] == [
+        ("midday", "123"), ("evening", "007"),
+    ]
+
+    legacy = batch_normalizer.normalize_batch("take5", ROWS[:1], COLUMNS, row_id_scheme=batch_normalizer.ROW_ID_LEGACY)
+    assert legacy[1] == [hashlib.md5(str(ROWS[0]).encode()).hexdigest()]
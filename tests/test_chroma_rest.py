@@ -0,0 +1,126 @@
+"""Tests for pooled, single-flight Chroma REST counts."""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+pytest.importorskip("chromadb")
+
+from services import chroma_client as chroma_module
+
+CATALOG = [{"name": "take5", "id": "c-take5"}, {"name": "powerball", "id": "c-powerball"}]
+COUNTS = {"c-take5": 120, "c-powerball": 80}
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self, path):
+        with self._lock:
+            self.calls.append(path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+
+    def payload(self, path):
+        if path == "/api/v1/collections":
+            return CATALOG
+        return {"count": COUNTS[path.split("/")[-2]]}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    counts = {}
+    monkeypatch.setattr(chroma_module, "get_draw_count", lambda name, default=0: counts.get(name, default))
+    monkeypatch.setattr(chroma_module, "set_draw_count", counts.__setitem__)
+    monkeypatch.setattr(chroma_module, "get_all_draw_counts", lambda names: {})
+    return chroma_module.ChromaClient()
+
+
+def test_concurrent_counts_share_one_request_per_collection(client, monkeypatch):
+    recorder = _Recorder()
+
+    def rest_get(path, timeout_seconds):
+        recorder.enter(path)
+        time.sleep(0.1)
+        recorder.leave()
+        return recorder.payload(path)
+
+    monkeypatch.setattr(client, "_rest_get", rest_get)
+    results = {}
+
+    def count(index, name):
+        results[index] = client._live_count(name)
+
+    threads = [threading.Thread(target=count, args=(i, name))
+               for i, name in enumerate(["take5", "powerball"] * 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [results[i] for i in range(8)] == [120, 80] * 4
+    count_calls = [path for path in recorder.calls if path.endswith("/count")]
+    assert sorted(count_calls) == ["/api/v1/collections/c-powerball/count", "/api/v1/collections/c-take5/count"]
+    assert recorder.calls.count("/api/v1/collections") == 1
+    assert recorder.peak > 1  # different collections are not serialized
+
+
+def test_async_snapshot_counts_collections_concurrently(client, monkeypatch):
+    recorder = _Recorder()
+
+    async def rest_get(path, timeout_seconds):
+        recorder.enter(path)
+        await asyncio.sleep(0.05)
+        recorder.leave()
+        return recorder.payload(path)
+
+    monkeypatch.setattr(client, "_async_rest_get", rest_get)
+
+    async def scenario():
+        snapshots, take5, take5_again = await asyncio.gather(
+            client.async_get_collections_snapshot(["take5", "powerball", "cash5"], refresh=True),
+            client.async_count_documents("take5"),
+            client.async_count_documents("take5"),
+        )
+        return snapshots, take5, take5_again
+
+    snapshots, take5, take5_again = asyncio.run(scenario())
+
+    assert take5 == take5_again == 120
+    assert [(snap["name"], snap["count"], snap["state"]) for snap in snapshots] == [
+        ("take5", 120, "refreshed"),
+        ("powerball", 80, "refreshed"),
+        ("cash5", 0, "empty"),
+    ]
+    assert recorder.calls.count("/api/v1/collections/c-take5/count") == 1
+    assert recorder.peak > 1
+
+
+def test_embedded_mode_counts_through_the_persistent_client(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(chroma_module.settings, "CHROMA_PERSIST_DIR", str(tmp_path))
+    embedded = chroma_module.ChromaClient(mode="embedded")
+    collection = embedded.client.get_or_create_collection("take5")
+    collection.add(ids=["a", "b", "c"], embeddings=[[0.0, 1.0]] * 3, metadatas=[{"n1": 1}] * 3)
+
+    assert embedded.count_documents("take5") == 3
+    assert embedded.collection_exists("take5") and not embedded.collection_exists("cash5")
+    snapshots = asyncio.run(embedded.async_get_collections_snapshot(["take5", "cash5"], refresh=True))
+    assert [(snap["name"], snap["count"]) for snap in snapshots] == [("take5", 3), ("cash5", 0)]
+    assert embedded.get_chroma_status()["status"] == "ok"
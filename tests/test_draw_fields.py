@@ -0,0 +1,82 @@
+"""Tests for typed number fields and their bulk backfill."""
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services import draw_fields_backfill as backfill_module
+from utils.draw_numbers import (
+    COUNT_FIELD,
+    ORDINAL_FIELD,
+    extract_record_sequence,
+    game_rules,
+    typed_fields,
+)
+
+
+class MergingCollection:
+    """Chroma-like collection whose update() merges metadata keys."""
+
+    def __init__(self, metadatas):
+        self.rows = {f"id-{index}": dict(meta) for index, meta in enumerate(metadatas)}
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def count(self):
+        return len(self.rows)
+
+    def get(self, include=None, limit=None, offset=0):
+        items = list(self.rows.items())[offset:offset + limit]
+        return {"ids": [key for key, _ in items], "metadatas": [dict(meta) for _, meta in items]}
+
+    def update(self, ids, metadatas):
+        with self._lock:
+            self.updates += len(ids)
+            for record_id, fields in zip(ids, metadatas):
+                self.rows[record_id].update(fields)
+
+
+def _megamillions(day):
+    return {
+        "draw_date": f"2024-02-{day:02d}T00:00:00.000",
+        "winning_numbers": f"0{day % 9 + 1} 12 23 34 45",
+        "mega_ball": "07",
+    }
+
+
+def test_typed_fields_round_trip_through_the_parser():
+    meta = _megamillions(3)
+    fields = typed_fields(meta, "megamillions")
+    assert fields[COUNT_FIELD] == 6
+    assert [fields[f"n{i}"] for i in range(1, 6)] == [4, 12, 23, 34, 45]
+    assert fields["bonus1"] == 7
+
+    parsed = extract_record_sequence(meta, "megamillions")
+    # Typed records are read back without touching the raw strings.
+    typed_only = {**fields, "winning_numbers": "garbage"}
+    assert extract_record_sequence(typed_only, "megamillions", game_rules("megamillions")) == parsed
+
+    unparseable = typed_fields({"draw_date": "2024-02-01T00:00:00", "winning_numbers": "1 2"}, "megamillions")
+    assert unparseable[COUNT_FIELD] == 0
+    assert extract_record_sequence(unparseable, "megamillions") == []
+
+
+def test_backfill_migrates_pages_in_parallel_once(monkeypatch):
+    recorded = {}
+    monkeypatch.setattr(backfill_module, "update_draw_ordinals", lambda game, **kwargs: recorded.update(kwargs))
+    collection = MergingCollection([_megamillions(day) for day in range(1, 26)])
+
+    result = backfill_module.backfill_draw_fields("megamillions", collection, page_size=4, workers=3)
+
+    assert result["scanned"] == 25 and result["updated"] == 25 and result["complete"]
+    assert all(COUNT_FIELD in meta and ORDINAL_FIELD in meta for meta in collection.rows.values())
+    ordinals = [meta[ORDINAL_FIELD] for meta in collection.rows.values()]
+    assert recorded == {"low": min(ordinals), "high": max(ordinals), "complete": True}
+
+    again = backfill_module.backfill_draw_fields("megamillions", collection, page_size=4, workers=3)
+    assert again["updated"] == 0 and collection.updates == 25
@@ -0,0 +1,73 @@
+"""Tests for draw ordinals and newest-N range queries."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from utils.draw_numbers import ORDINAL_FIELD, draw_ordinal
+
+pytest.importorskip("chromadb")
+
+from services import chroma_client as chroma_module
+
+
+class RangeCollection:
+    def __init__(self, metadatas):
+        self.rows = [(meta, f"id-{index}") for index, meta in enumerate(metadatas)]
+        self.queries = []
+
+    def get(self, where=None, include=None, **_):
+        lower = where[ORDINAL_FIELD]["$gte"]
+        self.queries.append(lower)
+        hits = [(meta, record_id) for meta, record_id in self.rows if meta[ORDINAL_FIELD] >= lower]
+        return {"metadatas": [meta for meta, _ in hits], "ids": [record_id for _, record_id in hits]}
+
+
+def _take5(day):
+    # Stored out of date order, as Chroma returns rows in insertion order.
+    meta = {"draw_date": f"2024-03-{day:02d}T00:00:00.000", "winning_numbers": f"{day} 2 3 4 5"}
+    return {**meta, ORDINAL_FIELD: draw_ordinal(meta)}
+
+
+def test_ordinals_order_sessions_and_intraday_draws():
+    day = "2024-01-01T00:00:00"
+    midday = draw_ordinal({"draw_date": day, "draw_session": "midday"})
+    evening = draw_ordinal({"draw_date": day, "draw_session": "evening"})
+    early = draw_ordinal({"draw_date": day, "draw_time": "09:04:00"})
+    late = draw_ordinal({"draw_date": day, "draw_time": "23:56:00"})
+    next_day = draw_ordinal({"draw_date": "2024-01-02T00:00:00"})
+    assert midday < evening < early < late < next_day
+    assert draw_ordinal({"winning_numbers": "1 2 3"}) is None
+
+
+def test_latest_draws_widen_the_window_until_enough_rows(monkeypatch):
+    metadatas = [_take5(day) for day in (30, 2, 15, 1, 29, 20, 10)]
+    ordinals = [meta[ORDINAL_FIELD] for meta in metadatas]
+    monkeypatch.setattr(
+        chroma_module, "get_draw_ordinals",
+        lambda game: {"min": min(ordinals), "max": max(ordinals), "complete": True},
+    )
+    collection = RangeCollection(metadatas)
+
+    result = chroma_module.chroma_client.get_latest_draws("take5", 4, collection=collection)
+    assert result is not None
+    latest, ids = result
+    assert [meta["draw_date"][8:10] for meta in latest] == ["15", "20", "29", "30"]
+    assert ids == ["id-2", "id-5", "id-4", "id-0"]
+    assert len(collection.queries) > 1  # a 2-day window holds too few draws
+
+    everything, _ = chroma_module.chroma_client.get_latest_draws("take5", 50, collection=collection)
+    assert len(everything) == len(metadatas)
+
+
+def test_collections_without_complete_ordinals_fall_back(monkeypatch):
+    monkeypatch.setattr(
+        chroma_module, "get_draw_ordinals", lambda game: {"min": 1, "max": 2, "complete": False}
+    )
+    assert chroma_module.chroma_client.get_latest_draws("take5", 5, collection=RangeCollection([])) is None
@@ -0,0 +1,135 @@
+"""Tests for the local columnar draw store."""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from state.draw_store import DrawStore, read_collection_draws, sequences_from_numbers
+from utils.draw_numbers import extract_winning_sequences
+
+
+def _powerball(day, numbers):
+    return {"draw_date": f"2024-01-{day:02d}T00:00:00.000", "winning_numbers": numbers}
+
+
+class _Collection:
+    def __init__(self, metadatas, ids):
+        self.metadatas = metadatas
+        self.ids = ids
+
+    def count(self):
+        return len(self.ids)
+
+    def get(self, include=None, limit=None, offset=0):
+        return {"ids": self.ids[offset:offset + limit], "metadatas": self.metadatas[offset:offset + limit]}
+
+
+class _SlowCollection(_Collection):
+    """Pages take a random time, so they complete out of order."""
+
+    def __init__(self, metadatas, ids):
+        super().__init__(metadatas, ids)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, include=None, limit=None, offset=0):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(random.uniform(0.005, 0.02))
+        with self._lock:
+            self.active -= 1
+        return super().get(include=include, limit=limit, offset=offset)
+
+
+def test_rows_are_sorted_deduped_and_padded(tmp_path):
+    store = DrawStore("powerball", root=tmp_path)
+    store.add([_powerball(3, "01 02 03 04 05 06"), _powerball(1, "10 11 12 13 14")], ["c", "a"])
+    store.add([_powerball(2, "20 21 22 23 24 25"), _powerball(3, "31 32 33 34 35 07")], ["b", "c"])
+
+    numbers, dates, ids = store.read()
+    assert ids.tolist() == ["a", "b", "c"]
+    assert numbers.tolist() == [
+        [10, 11, 12, 13, 14, -1],
+        [20, 21, 22, 23, 24, 25],
+        [31, 32, 33, 34, 35, 7],
+    ]
+    assert list(dates) == sorted(dates)
+    assert store.sequences(limit=2) == [[20, 21, 22, 23, 24, 25], [31, 32, 33, 34, 35, 7]]
+
+
+def test_log_survives_restart_and_matches_trainer_parsing(tmp_path):
+    metadatas = [
+        {"draw_date": "2024-01-01T00:00:00", "midday_daily": "472", "evening_daily": "019"},
+        {"draw_date": "2024-01-02T00:00:00", "winning_numbers": "5 5 1"},
+    ]
+    DrawStore("pick3", root=tmp_path).add(metadatas, ["x", "y"])
+
+    reloaded = DrawStore("pick3", root=tmp_path)
+    assert len(reloaded) == 3
+    assert reloaded.sequences() == extract_winning_sequences(metadatas, "pick3")
+    assert reloaded.read()[2].tolist() == ["x:midday", "x:evening", "y"]
+
+
+def test_sync_builds_from_collection_once_and_clears_when_empty(tmp_path):
+    collection = _Collection([_powerball(day, f"{day} 20 30 40 50 9") for day in range(1, 8)],
+                             [f"id-{day}" for day in range(1, 8)])
+    store = DrawStore("powerball", root=tmp_path)
+    store.sync_with_collection(collection, stored_count=7, page_size=3)
+    assert store.built and len(store) == 7
+
+    collection.ids = []
+    store.sync_with_collection(collection, stored_count=7)
+    assert len(store) == 7  # built stores are kept up to date by ingest, not re-read
+
+    store.sync_with_collection(collection, stored_count=0)
+    assert not store.built and len(store) == 0
+
+
+def test_parallel_collection_read_returns_chronological_arrays():
+    days = list(range(1, 29))
+    random.Random(7).shuffle(days)
+    metadatas = [_powerball(day, f"{day} 40 41 42 43 {day % 26 + 1}") for day in days]
+    collection = _SlowCollection(metadatas, [f"id-{day}" for day in days])
+
+    numbers, dates, ids = read_collection_draws(collection, "powerball", page_size=4, workers=4)
+
+    assert collection.peak > 1
+    assert ids.tolist() == [f"id-{day}" for day in range(1, 29)]
+    assert list(dates) == sorted(dates)
+    assert sequences_from_numbers(numbers)[:2] == [[1, 40, 41, 42, 43, 2], [2, 40, 41, 42, 43, 3]]
+
+
+def test_same_day_draws_follow_draw_time_and_session_not_arrival(tmp_path):
+    numbers = " ".join(str(value) for value in range(1, 21))
+    quickdraw = [
+        {"draw_date": "2024-01-01T00:00:00", "draw_time": time_, "winning_numbers": numbers}
+        for time_ in ("10:08", "10:04", "09:56")
+    ]
+    store = DrawStore("quickdraw", root=tmp_path)
+    store.add(quickdraw[:2], ["b", "a"])
+    store.add(quickdraw[2:], ["first"])
+    assert store.read()[2].tolist() == ["first", "a", "b"]
+
+    pick3 = [
+        {"draw_date": "2024-01-01T00:00:00", "draw_session": "evening", "winning_numbers": "1 2 3"},
+        {"draw_date": "2024-01-01T00:00:00", "draw_session": "midday", "winning_numbers": "4 5 6"},
+    ]
+    _, _, ids = read_collection_draws(_Collection(pick3, ["eve", "mid"]), "pick3", page_size=1, workers=2)
+    assert ids.tolist() == ["mid", "eve"]
+
+
+def test_stores_without_ordinals_are_rebuilt(tmp_path):
+    store = DrawStore("powerball", root=tmp_path)
+    store.add([_powerball(1, "1 2 3 4 5 6")], ["a"])
+    store.compact()
+    (tmp_path / "powerball" / "meta.json").write_text('{"rows": 1, "width": 6}')
+    assert not DrawStore("powerball", root=tmp_path).built
@@ -0,0 +1,53 @@
+"""Tests for deferred ingest embeddings."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.embedding_backfill import EmbeddingBackfill, placeholder_embeddings
+
+
+class _Collection:
+    def __init__(self, pending):
+        self.rows = {record_id: {"embedding_pending": True} for record_id in pending}
+        self.embeddings = {}
+
+    def get(self, where=None, include=None, limit=None):
+        ids = [record_id for record_id, meta in self.rows.items() if meta.get("embedding_pending")][:limit]
+        return {"ids": ids, "documents": [f"doc {record_id}" for record_id in ids]}
+
+    def update(self, ids, embeddings, metadatas):
+        for record_id, vector, meta in zip(ids, embeddings, metadatas):
+            self.embeddings[record_id] = vector
+            self.rows[record_id].update(meta)
+
+
+def test_placeholder_embeddings_are_deterministic_and_distinct():
+    first = placeholder_embeddings(["a", "b"], 8)
+    assert first == placeholder_embeddings(["a", "b"], 8)
+    assert first[0] != first[1]
+    assert len(first[0]) == 8
+
+
+def test_backfill_embeds_pending_rows_in_batches(monkeypatch):
+    collection = _Collection([f"id{i}" for i in range(5)])
+
+    class _Chroma:
+        def get_or_create_collection(self, name):
+            return collection
+
+    import services.chroma_client as chroma_module
+    monkeypatch.setattr(chroma_module, "chroma_client", _Chroma())
+
+    backfill = EmbeddingBackfill()
+    backfill.batch_size = 2
+    backfill._embedding_function = lambda documents: [[1.0, 0.0] for _ in documents]
+    backfill._run("take5")
+
+    assert backfill.status("take5")["embedded"] == 5
+    assert set(collection.embeddings) == set(collection.rows)
+    assert not any(meta["embedding_pending"] for meta in collection.rows.values())
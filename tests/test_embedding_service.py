@@ -0,0 +1,60 @@
+"""Tests for the shared embedding service and its content-hash cache."""
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.embedding_service import EmbeddingService, SharedEmbeddingFunction
+
+
+class _CountingModel:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, documents):
+        with self.lock:
+            self.calls.append(list(documents))
+        return [[float(len(doc)), 1.0] for doc in documents]
+
+
+def test_cache_skips_repeated_documents(tmp_path):
+    model = _CountingModel()
+    service = EmbeddingService(workers=0, cache_path=tmp_path / "cache.sqlite3", embed_fn=model)
+
+    first = service.embed(["a", "bb", "a"])
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert sum(len(call) for call in model.calls) == 2
+
+    restarted = EmbeddingService(workers=0, cache_path=tmp_path / "cache.sqlite3", embed_fn=model)
+    assert restarted.embed(["bb", "a"]) == [[2.0, 1.0], [1.0, 1.0]]
+    assert sum(len(call) for call in model.calls) == 2
+
+
+def test_concurrent_callers_share_batches(tmp_path):
+    model = _CountingModel()
+    service = EmbeddingService(workers=0, cache_path=tmp_path / "cache.sqlite3", embed_fn=model)
+    service.batch_wait_s = 0.05
+    results = {}
+
+    def caller(name, documents):
+        results[name] = SharedEmbeddingFunction(service)(documents)
+
+    threads = [
+        threading.Thread(target=caller, args=(game, [f"{game}-{i}" for i in range(5)] + ["shared"]))
+        for game in ("take5", "pick3", "quickdraw")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    embedded = [doc for call in model.calls for doc in call]
+    assert sorted(embedded) == sorted(set(embedded))
+    assert len(embedded) == 16
+    assert all(len(vectors) == 6 for vectors in results.values())
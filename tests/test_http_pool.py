@@ -0,0 +1,48 @@
+"""Tests for the shared ingest HTTP pool."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.http_pool import HttpPool
+
+
+def _peak_concurrency(pool, urls):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def hit(url):
+        nonlocal active, peak
+        with pool.slot(url):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=hit, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return peak
+
+
+def test_per_host_cap_limits_single_origin():
+    pool = HttpPool(max_concurrency=8, max_per_host=2)
+    assert _peak_concurrency(pool, ["https://data.ny.gov/a"] * 6) == 2
+
+
+def test_global_cap_limits_all_hosts():
+    pool = HttpPool(max_concurrency=3, max_per_host=3)
+    urls = [f"https://host{i}.example/rows.json" for i in range(6)]
+    assert _peak_concurrency(pool, urls) == 3
+    assert pool.stats()["active"] == 0
@@ -0,0 +1,63 @@
+"""Tests for the persistent ingest id index."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from state.id_index import IdIndex, KnownIds
+
+
+def _ids(start, stop):
+    return [hashlib.md5(f"row-{i}".encode()).hexdigest() for i in range(start, stop)]
+
+
+class _Collection:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def get(self, include=None, limit=None, offset=0):
+        return {"ids": self.ids[offset:offset + limit]}
+
+
+def test_index_persists_log_and_compacted_base(tmp_path):
+    index = IdIndex("quickdraw", root=tmp_path)
+    index.add(_ids(0, 100))
+    index.compact()
+    index.add(_ids(100, 150))
+
+    reloaded = IdIndex("quickdraw", root=tmp_path)
+    assert len(reloaded) == 150
+    assert all(reloaded.contains_many(_ids(0, 150)))
+    assert not any(reloaded.contains_many(_ids(150, 200)))
+    assert "not-a-hex-id" not in reloaded
+
+
+def test_sync_rebuilds_missing_or_oversized_index(tmp_path):
+    collection = _Collection(_ids(0, 25))
+    index = IdIndex("take5", root=tmp_path)
+
+    index.sync_with_collection(collection, stored_count=25, page_size=10)
+    assert len(index) == 25
+
+    collection.ids = _ids(0, 5)
+    index.sync_with_collection(collection, stored_count=5, page_size=10)
+    assert len(index) == 5
+
+    collection.ids = _ids(0, 30)  # rows stored while the index was not updated
+    index.sync_with_collection(collection, stored_count=30, page_size=10)
+    assert len(index) == 30 and all(index.contains_many(_ids(0, 30)))
+
+    index.sync_with_collection(collection, stored_count=0)
+    assert len(index) == 0
+
+
+def test_known_ids_combines_index_and_run_extras(tmp_path):
+    index = IdIndex("pick3", root=tmp_path)
+    known = KnownIds(index, extra=["boundary"])
+    known.update(_ids(0, 2))
+    assert known.contains_many(_ids(0, 3) + ["boundary"]) == [True, True, False, True]
@@ -0,0 +1,224 @@
+"""Tests for resumable ingest checkpoints."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+pytest.importorskip("chromadb")
+
+from services import ingest as ingest_module
+from services.ingest import IngestCancelled, IngestService, _IngestRun
+from state import ingest_state
+
+COLUMNS = ["draw_date", "winning_numbers"]
+ROWS = [[f"2024-01-{day:02d}T00:00:00", f"{day} {day + 1}"] for day in range(1, 11)]
+ENDPOINT = "https://example.test/api/views/abcd-1234/rows.json"
+
+
+class FakeCollection:
+    def __init__(self, fail_on: set[str] = frozenset()):
+        self.fail_on = set(fail_on)
+        self.upserted: list[str] = []
+
+    def upsert(self, documents, metadatas, ids, **_):
+        if any(meta["draw_date"] in self.fail_on for meta in metadatas):
+            raise RuntimeError("chroma unavailable")
+        self.upserted.extend(meta["draw_date"] for meta in metadatas)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_state, "_ingest_state_file", tmp_path / "ingest_state.json")
+    monkeypatch.setattr(ingest_state, "ingest_checkpoints", {})
+    monkeypatch.setattr(ingest_state, "manual_ingest_state", {})
+    monkeypatch.setattr(ingest_module, "update_watermark", lambda *args, **kwargs: {})
+    svc = IngestService()
+    svc.batch_size = 2
+    svc.batch_max_retries = 1
+    svc.pipeline_enabled = False
+    svc.defer_embeddings = False
+    yield svc
+    # Write out any debounced save while the state file still points at tmp_path.
+    ingest_state._flush_manual_ingest_state()
+
+
+def _run(service, collection, fingerprint="etag-1"):
+    service._open_endpoint_rows = lambda endpoint, stack: (
+        list(ROWS), (lambda: COLUMNS), (lambda: len(ROWS)), (lambda: fingerprint)
+    )
+    run = _IngestRun(rows_before=0, existing_ids=set())
+    service._process_endpoint("take5", ENDPOINT, "1/1", collection, list(COLUMNS), set(), run)
+    return run
+
+
+def test_failed_batch_keeps_checkpoint_and_rerun_resumes_after_it(service):
+    failing = FakeCollection(fail_on={ROWS[6][0]})
+    _run(service, failing)
+    checkpoint = ingest_state.get_ingest_checkpoint("take5", ENDPOINT)
+    assert checkpoint["offset"] == 6
+    assert checkpoint["fingerprint"] == "etag-1"
+
+    healthy = FakeCollection()
+    run = _run(service, healthy)
+    assert healthy.upserted == [row[0] for row in ROWS[6:]]
+    assert run.rows_processed == len(ROWS)
+    assert ingest_state.get_ingest_checkpoint("take5", ENDPOINT) == {}
+
+
+def test_changed_payload_discards_checkpoint(service):
+    _run(service, FakeCollection(fail_on={ROWS[4][0]}))
+    assert ingest_state.get_ingest_checkpoint("take5", ENDPOINT)["offset"] == 4
+
+    healthy = FakeCollection()
+    _run(service, healthy, fingerprint="etag-2")
+    assert healthy.upserted == [row[0] for row in ROWS]
+    assert not ingest_state.has_ingest_checkpoint("take5")
+
+
+def test_checkpoints_persist_next_to_manual_ingest_state(service):
+    ingest_state.set_ingest_checkpoint("take5", ENDPOINT, offset=8, fingerprint="etag-1")
+    ingest_state._flush_manual_ingest_state()
+
+    ingest_state.ingest_checkpoints.clear()
+    ingest_state._load_manual_ingest_state()
+    assert ingest_state.get_ingest_checkpoint("take5", ENDPOINT)["offset"] == 8
+    assert "_checkpoints" not in ingest_state.manual_ingest_state
+
+
+def test_cancel_stops_at_batch_boundary_and_keeps_checkpoint(service):
+    cancel = threading.Event()
+
+    class CancellingCollection(FakeCollection):
+        def upsert(self, documents, metadatas, ids, **kwargs):
+            super().upsert(documents, metadatas, ids, **kwargs)
+            if len(self.upserted) >= 4:
+                cancel.set()
+
+    collection = CancellingCollection()
+    service._open_endpoint_rows = lambda endpoint, stack: (
+        list(ROWS), (lambda: COLUMNS), (lambda: len(ROWS)), (lambda: "etag-1")
+    )
+    run = _IngestRun(rows_before=0, existing_ids=set(), cancel_event=cancel)
+    with pytest.raises(IngestCancelled):
+        service._process_endpoint("take5", ENDPOINT, "1/1", collection, list(COLUMNS), set(), run)
+
+    assert collection.upserted == [row[0] for row in ROWS[:4]]
+    assert ingest_state.get_ingest_checkpoint("take5", ENDPOINT)["offset"] == 4
+
+
+def test_full_reingest_after_delta_sync_adds_no_duplicates(service):
+    class IdCollection:
+        def __init__(self):
+            self.ids: list[str] = []
+
+        def upsert(self, documents, metadatas, ids, **_):
+            self.ids.extend(ids)
+
+    collection = IdCollection()
+    stored: set[str] = set()
+    # The first seven draws came from a full download, the last three from a SoQL delta.
+    _, full_ids, _, _ = service._build_batch_records("take5", [list(row) for row in ROWS[:7]], COLUMNS, set())
+    stored.update(full_ids)
+    delta = {"since": ROWS[6][0], "field": "draw_date", "select": list(COLUMNS)}
+    service._open_delta_rows = lambda endpoint, plan, stack: (
+        [{"draw_date": f"{date}.000", "winning_numbers": numbers} for date, numbers in ROWS[7:]],
+        (lambda: COLUMNS), (lambda: None), (lambda: None),
+    )
+    run = _IngestRun(rows_before=7, existing_ids=stored)
+    service._process_endpoint("take5", ENDPOINT, "1/1", collection, list(COLUMNS), stored, run, delta=delta)
+    assert len(collection.ids) == 3
+    stored.update(collection.ids)
+
+    service._open_endpoint_rows = lambda endpoint, stack: (
+        [list(row) for row in ROWS], (lambda: COLUMNS), (lambda: len(ROWS)), (lambda: "etag-1")
+    )
+    run = _IngestRun(rows_before=10, existing_ids=stored)
+    service._process_endpoint("take5", ENDPOINT, "1/1", collection, list(COLUMNS), stored, run)
+    assert len(collection.ids) == 3 and len(stored) == len(ROWS)
+
+
+def test_force_reingest_of_a_populated_collection_keeps_its_ingest_state(service, tmp_path, monkeypatch):
+    import hashlib
+
+    from services import chroma_client as chroma_module
+    from state import draw_counts, id_index, ingest_watermarks
+
+    monkeypatch.setattr(ingest_watermarks, "_watermarks_file", tmp_path / "ingest_watermarks.json")
+    monkeypatch.setattr(ingest_watermarks, "_watermarks", {})
+    monkeypatch.setattr(ingest_watermarks, "_loaded", True)
+    monkeypatch.setattr(id_index, "_indexes", {"take5": id_index.IdIndex("take5", root=tmp_path)})
+    monkeypatch.setattr(draw_counts, "invalidate_draw_count", lambda game: None)
+    monkeypatch.setattr(draw_counts, "get_draw_count", lambda game, default=0: default)
+    monkeypatch.setenv("DRAW_STORE", "0")
+
+    ids = [hashlib.md5(str(row).encode()).hexdigest() for row in ROWS]
+
+    class PopulatedCollection:
+        def count(self):
+            return len(ids)
+
+        def get(self, include=None, limit=None, offset=0, **_):
+            return {"ids": ids[offset:offset + limit]}
+
+    collection = PopulatedCollection()
+
+    class FakeClient:
+        def get_or_create_collection(self, name, **_):
+            return collection
+
+    monkeypatch.setattr(type(chroma_module.chroma_client), "client", property(lambda self: FakeClient()))
+    ingest_watermarks.update_watermark("take5", "abcd-1234", field="draw_date", value=ROWS[-1][0])
+    ingest_watermarks.set_row_id_scheme("take5", "legacy")
+    ingest_watermarks.update_draw_ordinals("take5", low=1, high=9)
+    ingest_state.set_ingest_checkpoint("take5", ENDPOINT, offset=4, fingerprint="etag-1")
+    synced = {}
+    service._resolve_game_endpoints = lambda game: [ENDPOINT]
+    service._finish_sync = lambda game, collection, endpoints, **kwargs: synced.update(kwargs) or {}
+
+    service.fetch_and_sync("take5", force=True)
+
+    assert synced["existing_count"] == len(ROWS) and synced["row_id_scheme"] == "legacy"
+    assert all(synced["existing_ids"].contains_many(ids))
+    assert ingest_watermarks.get_watermark("take5", "abcd-1234")["value"] == ROWS[-1][0]
+    assert ingest_watermarks.get_draw_ordinals("take5") == {"min": 1, "max": 9, "complete": False}
+    assert ingest_state.get_ingest_checkpoint("take5", ENDPOINT)["offset"] == 4
+
+
+def test_row_id_scheme_survives_watermark_resets_and_populated_collections_stay_legacy(service, tmp_path, monkeypatch):
+    from state import ingest_watermarks
+
+    monkeypatch.setattr(ingest_watermarks, "_watermarks_file", tmp_path / "ingest_watermarks.json")
+    monkeypatch.setattr(ingest_watermarks, "_watermarks", {})
+    monkeypatch.setattr(ingest_watermarks, "_loaded", True)
+
+    assert service._resolve_row_id_scheme("take5", collection_empty=False) == "legacy"
+    ingest_watermarks.clear_watermarks("take5")
+    assert ingest_watermarks.get_row_id_scheme("take5") == "legacy"
+    assert service._resolve_row_id_scheme("take5", collection_empty=False) == "legacy"
+    assert service._resolve_row_id_scheme("pick3", collection_empty=True) == "fast"
+
+
+def test_storing_rows_without_ordinals_withdraws_ordinal_completeness(service, tmp_path, monkeypatch):
+    from state import ingest_watermarks
+
+    monkeypatch.setattr(ingest_watermarks, "_watermarks_file", tmp_path / "ingest_watermarks.json")
+    monkeypatch.setattr(ingest_watermarks, "_watermarks", {})
+    monkeypatch.setattr(ingest_watermarks, "_loaded", True)
+    monkeypatch.setenv("DRAW_STORE", "0")
+    ingest_watermarks.update_draw_ordinals("take5", complete=True)
+    rows = [list(row) for row in ROWS[:3]] + [["not a date", "1 2"]]
+    service._open_endpoint_rows = lambda endpoint, stack: (
+        rows, (lambda: COLUMNS), (lambda: len(rows)), (lambda: "etag-1")
+    )
+
+    service._process_endpoints("take5", [ENDPOINT], FakeCollection(), list(COLUMNS), 0)
+
+    ordinals = ingest_watermarks.get_draw_ordinals("take5")
+    assert ordinals["complete"] is False and ordinals["min"] is not None
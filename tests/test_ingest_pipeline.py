@@ -0,0 +1,46 @@
+"""Tests for the staged ingest pipeline."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.ingest_pipeline import IngestPipeline
+
+
+@pytest.mark.parametrize("threaded", [True, False])
+def test_pipeline_delivers_every_batch(threaded):
+    batches = [[i] * 10 for i in range(25)]
+    written = []
+    lock = threading.Lock()
+
+    def normalize(batch, index):
+        return index, [value * 2 for value in batch]
+
+    def write(bundle, index):
+        with lock:
+            written.append(bundle)
+
+    pipeline = IngestPipeline(queue_depth=1, writers=3, threaded=threaded)
+    stats = pipeline.run(batches, normalize, write)
+
+    assert sorted(index for index, _ in written) == list(range(25))
+    assert all(values == [index * 2] * 10 for index, values in written)
+    assert stats["stages"]["writer"]["rows"] == 250
+    assert stats["stages"]["reader"]["batches"] == 25
+
+
+def test_pipeline_reraises_stage_errors():
+    def batches():
+        yield [1]
+        raise ConnectionError("socket closed")
+
+    pipeline = IngestPipeline(queue_depth=1, writers=2)
+    with pytest.raises(ConnectionError):
+        pipeline.run(batches(), lambda batch, index: batch, lambda bundle, index: None)
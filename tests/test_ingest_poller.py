@@ -0,0 +1,98 @@
+"""Tests for the schedule-aware ingest poller."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from state.ingest_poller import IngestPoller, scheduled_draws
+
+NY = ZoneInfo("America/New_York")
+
+
+class Harness:
+    def __init__(self, games, start):
+        self.now = start
+        self.seq = 0
+        self.jobs: list[tuple[str, datetime]] = []
+        self.states: dict[str, dict] = {}
+        self.poller = IngestPoller(
+            games=games,
+            now_fn=lambda: self.now,
+            enqueue_fn=self.enqueue,
+            job_state_fn=lambda game: self.states.get(game, {}),
+            populated_fn=lambda game: True,
+        )
+        self.poller.lag = timedelta(minutes=30)
+        self.poller.retry_s = 900
+        self.poller.retry_max_s = 3600
+        self.poller.catchup = timedelta(hours=12)
+        self.poller.rolling_s = 600
+
+    def enqueue(self, game):
+        self.seq += 1
+        self.jobs.append((game, self.now))
+        return {"seq": self.seq}
+
+    def finish(self, game, added):
+        self.states[game] = {"status": "completed", "added": added, "seq": self.seq}
+
+    def advance(self, **delta):
+        self.now += timedelta(**delta)
+        return self.poller.tick()
+
+
+def test_scheduled_draws_follow_weekdays():
+    # 2024-01-01 is a Monday: powerball draws Mon/Wed/Sat.
+    start = datetime(2024, 1, 1, tzinfo=NY)
+    draws = scheduled_draws("powerball", start, start + timedelta(days=7), NY)
+    assert [draw.strftime("%a %H:%M") for draw in draws] == ["Mon 22:59", "Wed 22:59", "Sat 22:59"]
+    assert len(scheduled_draws("take5", start, start + timedelta(days=1), NY)) == 2
+    assert scheduled_draws("quickdraw", start, start + timedelta(days=1), NY) == []
+
+
+def test_polls_after_draw_then_backs_off_until_rows_arrive():
+    # Monday 23:00, just after the 22:59 powerball draw.
+    harness = Harness(["powerball"], datetime(2024, 1, 1, 23, 0, tzinfo=NY))
+    assert harness.poller.tick() == []  # within the publishing lag
+
+    assert harness.advance(minutes=30) == ["powerball"]
+    harness.finish("powerball", added=0)
+    assert harness.advance(minutes=10) == []  # first retry waits 15 minutes
+    assert harness.advance(minutes=5) == ["powerball"]
+    harness.finish("powerball", added=1)
+
+    # Draw is in: nothing more until Wednesday's draw, however often we tick.
+    assert harness.advance(hours=6) == []
+    assert harness.advance(hours=20) == []
+    harness.now = datetime(2024, 1, 3, 23, 30, tzinfo=NY)
+    assert harness.poller.tick() == ["powerball"]
+    assert len(harness.jobs) == 3
+
+
+def test_gives_up_after_catchup_window_and_skips_days_without_draws():
+    harness = Harness(["megamillions"], datetime(2024, 1, 2, 23, 31, tzinfo=NY))  # Tuesday draw
+    assert harness.poller.tick() == ["megamillions"]
+    for _ in range(20):
+        harness.finish("megamillions", added=0)
+        harness.advance(minutes=30)
+    attempts = len(harness.jobs)
+    assert attempts < 20  # exponential backoff, capped at an hour
+    # Past the catch-up window nothing is polled until Friday's draw.
+    harness.now = datetime(2024, 1, 4, 12, 0, tzinfo=NY)
+    harness.finish("megamillions", added=0)
+    assert harness.poller.tick() == []
+    assert harness.poller.status()["games"]["megamillions"]["next_draw"].startswith("2024-01-05T23:00")
+
+
+def test_rolling_game_polls_on_fixed_interval():
+    harness = Harness(["quickdraw"], datetime(2024, 1, 1, 12, 0, tzinfo=NY))
+    assert harness.poller.tick() == ["quickdraw"]
+    harness.finish("quickdraw", added=3)
+    assert harness.advance(minutes=5) == []
+    assert harness.advance(minutes=5) == ["quickdraw"]
@@ -0,0 +1,82 @@
+"""Tests for the adaptive upsert batch size / writer controller."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.ingest_tuning import AimdController
+
+
+def _controller(**overrides):
+    settings = dict(
+        batch_size=1000, writers=2, min_batch_size=250, max_batch_size=2000,
+        min_writers=1, max_writers=4, target_latency_s=1.0, decrease=0.5, batch_step=250, adaptive=True,
+    )
+    settings.update(overrides)
+    return AimdController(**settings)
+
+
+def test_fast_upserts_grow_batch_and_writers_up_to_bounds():
+    tuner = _controller()
+    for _ in range(20):
+        tuner.record(rows=tuner.current_batch_size(), latency_s=0.1)
+    snapshot = tuner.snapshot()
+    assert snapshot["batch_size"] == 2000
+    assert snapshot["writers"] == 4
+    assert snapshot["errors"] == 0
+
+
+def test_slow_upsert_halves_batch_but_keeps_writers():
+    tuner = _controller()
+    tuner.record(rows=1000, latency_s=1.5)
+    assert tuner.current_batch_size() == 500
+    assert tuner.writers == 2
+
+
+def test_errors_shrink_batch_and_writers_to_minimum():
+    tuner = _controller(writers=4)
+    for _ in range(5):
+        tuner.record(rows=1000, latency_s=0.2, ok=False)
+    snapshot = tuner.snapshot()
+    assert snapshot["batch_size"] == 250
+    assert snapshot["writers"] == 1
+    assert snapshot["error_rate"] == 1.0
+
+
+def test_non_adaptive_controller_keeps_initial_settings():
+    tuner = _controller(adaptive=False)
+    tuner.record(rows=1000, latency_s=0.1)
+    tuner.record(rows=1000, latency_s=5.0, ok=False)
+    assert tuner.current_batch_size() == 1000
+    assert tuner.writers == 2
+    assert tuner.snapshot()["upserts"] == 2
+
+
+def test_writer_slots_limit_concurrent_upserts():
+    tuner = _controller(writers=1, max_writers=1)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def upsert():
+        nonlocal active, peak
+        with tuner.writer_slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=upsert) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 1
@@ -0,0 +1,135 @@
+"""Tests for the manual ingest worker pool, job coalescing and cancellation."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+pytest.importorskip("chromadb")
+
+from services.ingest import IngestCancelled
+from state import ingest_state
+from state import manual_ingest_worker as worker
+
+
+class FakeIngest:
+    """Stands in for ingest_service.fetch_and_sync; each call blocks until released or cancelled."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.active: dict[str, int] = {}
+        self.peak_total = 0
+        self.peak_per_game = 0
+        self.calls: list[tuple[str, bool]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, game, progress_callback=None, force=False, cancel_event=None, delta_only=False):
+        with self._lock:
+            self.calls.append((game, force))
+            self.active[game] = self.active.get(game, 0) + 1
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+            self.peak_per_game = max(self.peak_per_game, self.active[game])
+        try:
+            while not self.release.wait(0.01):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise IngestCancelled("ingest cancelled")
+            return {"total": 1, "added": 1}
+        finally:
+            with self._lock:
+                self.active[game] -= 1
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    states: dict[str, dict] = {}
+    ingest_state.manual_ingest_queue.clear()
+    ingest_state.manual_ingest_running.clear()
+    fake_ingest = FakeIngest()
+    monkeypatch.setattr(worker, "_max_workers", 3)
+    monkeypatch.setattr(worker, "set_manual_ingest_state", lambda game, state: states.__setitem__(game, state))
+    monkeypatch.setattr(worker.ingest_service, "fetch_and_sync", fake_ingest)
+    fake_ingest.states = states
+    yield fake_ingest
+    fake_ingest.release.set()
+    _wait_for(lambda: not ingest_state.manual_ingest_running and worker._active_workers == 0)
+    ingest_state.manual_ingest_queue.clear()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_duplicate_queued_jobs_merge_and_force_upgrades(fake):
+    first = ingest_state.enqueue_manual_ingest("take5")
+    second = ingest_state.enqueue_manual_ingest("take5", force=True)
+
+    assert not first["merged"]
+    assert second["merged"] and second["seq"] == first["seq"]
+    assert second["force"] is True
+    assert len(ingest_state.manual_ingest_queue) == 1
+
+
+def test_pool_runs_games_in_parallel_but_never_the_same_game_twice(fake):
+    for game in ("take5", "pick3", "lotto"):
+        ingest_state.enqueue_manual_ingest(game)
+    worker._start_manual_ingest_worker_if_needed()
+    assert _wait_for(lambda: sum(fake.active.values()) == 3)
+
+    # A running non-force job absorbs duplicates; a force request queues one follow-up.
+    assert ingest_state.enqueue_manual_ingest("take5")["state"] == "running"
+    follow_up = ingest_state.enqueue_manual_ingest("take5", force=True)
+    assert follow_up["state"] == "queued"
+    worker._start_manual_ingest_worker_if_needed()
+
+    fake.release.set()
+    assert _wait_for(lambda: len(fake.calls) == 4 and not ingest_state.manual_ingest_running)
+    assert fake.peak_total == 3
+    assert fake.peak_per_game == 1
+    assert fake.calls[-1] == ("take5", True)
+
+
+def test_cancel_stops_running_job_and_drops_queued_one(fake):
+    ingest_state.enqueue_manual_ingest("take5")
+    worker._start_manual_ingest_worker_if_needed()
+    assert _wait_for(lambda: "take5" in ingest_state.manual_ingest_running)
+    ingest_state.enqueue_manual_ingest("take5", force=True)
+
+    assert ingest_state.cancel_manual_ingest("take5") == "cancelling"
+    assert not ingest_state.manual_ingest_queue
+    assert _wait_for(lambda: fake.states.get("take5", {}).get("status") == "cancelled")
+    assert ingest_state.cancel_manual_ingest("take5") is None
+
+
+def test_startup_ingest_shares_the_per_game_slot_with_resumed_jobs(fake):
+    from state import ingestion_worker
+
+    # A resumed job already holds take5: the startup pass leaves it alone.
+    ingest_state.enqueue_manual_ingest("take5")
+    ingestion_worker._ingest_single_game("take5", 1, 1, existing_draws=0)
+    assert fake.calls == []
+
+    # While the startup pass runs pick3, a manual pick3 job waits behind it.
+    startup = threading.Thread(target=ingestion_worker._ingest_single_game, args=("pick3", 1, 1, 0))
+    startup.start()
+    assert _wait_for(lambda: fake.active.get("pick3") == 1)
+    assert ingest_state.enqueue_manual_ingest("pick3", force=True)["state"] == "queued"
+    worker._start_manual_ingest_worker_if_needed()
+    time.sleep(0.1)
+    assert fake.peak_per_game == 1
+
+    fake.release.set()
+    startup.join(5)
+    assert _wait_for(lambda: ("pick3", True) in fake.calls and not ingest_state.manual_ingest_running)
+    assert fake.peak_per_game == 1
@@ -0,0 +1,51 @@
+"""Tests for the on-disk Socrata payload cache."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.payload_cache import PayloadCache
+
+URL = "https://data.ny.gov/api/views/abcd-1234/rows.json?accessType=DOWNLOAD"
+
+
+def test_tee_commits_body_and_validators(tmp_path):
+    cache = PayloadCache(root=tmp_path, enabled=True)
+    headers = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"}
+
+    assert b"".join(cache.tee(URL, headers, [b'{"data": ', b"[]}"])) == b'{"data": []}'
+    assert cache.read_body(URL) == b'{"data": []}'
+    assert cache.request_headers(URL) == {
+        "Accept-Encoding": "gzip",
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Tue, 01 Oct 2024 00:00:00 GMT",
+    }
+
+
+def test_interrupted_tee_keeps_previous_body(tmp_path):
+    cache = PayloadCache(root=tmp_path, enabled=True)
+    cache.store_body(URL, {"ETag": '"v1"'}, b"old")
+
+    def failing_chunks():
+        yield b"new"
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        list(cache.tee(URL, {"ETag": '"v2"'}, failing_chunks()))
+    assert cache.read_body(URL) == b"old"
+    assert cache.get_meta(URL)["etag"] == '"v1"'
+
+
+def test_json_entries_expire(tmp_path):
+    cache = PayloadCache(root=tmp_path, enabled=True)
+    cache.store_json("catalog:pick3", ["https://example/rows.json"])
+
+    reloaded = PayloadCache(root=tmp_path, enabled=True)
+    assert reloaded.load_json("catalog:pick3", max_age_s=60) == ["https://example/rows.json"]
+    assert reloaded.load_json("catalog:pick3", max_age_s=0) is None
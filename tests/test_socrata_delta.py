@@ -0,0 +1,37 @@
+"""Tests for SoQL delta-fetch helpers."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services import socrata_delta
+
+VIEW_URL = "https://data.ny.gov/api/views/7sqk-ycpk/rows.json?accessType=DOWNLOAD"
+
+
+def test_resource_url_from_rows_download():
+    assert socrata_delta.dataset_id(VIEW_URL) == "7sqk-ycpk"
+    assert socrata_delta.resource_url(VIEW_URL) == "https://data.ny.gov/resource/7sqk-ycpk.json"
+    assert socrata_delta.resource_url("https://example.com/draws.csv") is None
+
+
+def test_parser_columns_drop_system_and_unrelated_fields():
+    columns = [":sid", ":id", "draw_date", "draw_time", "draw_number", "winning_numbers",
+               "extra_multiplier", "notes", "cash_ball"]
+    assert socrata_delta.parser_columns(columns, ["cash_ball"]) == [
+        "draw_date", "draw_time", "draw_number", "winning_numbers", "extra_multiplier", "cash_ball",
+    ]
+    assert socrata_delta.date_field(columns) == "draw_date"
+
+
+def test_content_digest_matches_across_payload_formats():
+    columns = ["draw_date", "winning_numbers", "mega_ball"]
+    from_rows_json = {":sid": "41", "draw_date": "2024-03-01T00:00:00", "winning_numbers": "01 02 03 04 05",
+                      "mega_ball": "07", "multiplier": ""}
+    from_soda = {"draw_date": "2024-03-01T00:00:00.000", "winning_numbers": "01 02 03 04 05", "mega_ball": "07"}
+    assert socrata_delta.content_digest("megamillions", from_rows_json, columns) == \
+        socrata_delta.content_digest("megamillions", from_soda, columns)
@@ -0,0 +1,61 @@
+"""Tests for the incremental Socrata rows.json parser."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.socrata_stream import SocrataRowStream
+
+
+def _chunked(payload: str, size: int):
+    raw = payload.encode("utf-8")
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def _rows_json(rows):
+    return json.dumps({
+        "meta": {
+            "view": {
+                "columns": [
+                    {"fieldName": "draw_date", "cachedContents": {"non_null": str(len(rows)), "null": "0"}},
+                    {"fieldName": "winning_numbers"},
+                ]
+            }
+        },
+        "data": rows,
+    })
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_stream_yields_rows_and_columns(chunk_size):
+    rows = [["2024-01-0%dT00:00:00" % i, "01 02 03 04 05 é"] for i in range(1, 6)]
+    stream = SocrataRowStream(_chunked(_rows_json(rows), chunk_size))
+
+    assert list(stream) == rows
+    assert stream.columns == ["draw_date", "winning_numbers"]
+    assert stream.row_count_hint == 5
+    assert stream.rows_yielded == 5
+
+
+def test_stream_handles_flat_list_and_trailing_numbers():
+    payload = json.dumps([{"a": 1234567}, {"a": None}, {"a": [1, 2]}])
+    assert list(SocrataRowStream(_chunked(payload, 3))) == [{"a": 1234567}, {"a": None}, {"a": [1, 2]}]
+
+
+def test_stream_marks_empty_body():
+    stream = SocrataRowStream([b"", b"  "])
+    assert list(stream) == []
+    assert stream.empty is True
+
+
+def test_stream_rejects_truncated_payload():
+    payload = _rows_json([["2024-01-01", "1 2 3"]])[:-10]
+    with pytest.raises(ValueError):
+        list(SocrataRowStream(_chunked(payload, 16)))
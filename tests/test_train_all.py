@@ -0,0 +1,108 @@
+"""Tests for concurrent train_all across games."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.trainer import TrainerService
+from state import draw_counts
+
+
+def test_small_games_finish_first_on_isolated_trainers(monkeypatch):
+    sizes = {"quickdraw": 900_000, "pick3": 12_000, "take5": 9_000, "unknown": -1}
+    monkeypatch.setattr(draw_counts, "get_draw_count", lambda game, default=0: sizes.get(game, default))
+    monkeypatch.setenv("TRAIN_ALL_WORKERS", "2")
+    seen = {}
+    lock = threading.Lock()
+
+    def fake_train(self, game, **_):
+        self.n_estimators = len(game)  # per-game tuning must not leak
+        time.sleep(0.3 if game == "quickdraw" else 0.05)
+        with lock:
+            seen[game] = self
+        return {"status": "success", "game": game}
+
+    monkeypatch.setattr(TrainerService, "train", fake_train)
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.n_estimators = 250
+    trainer._progress_callback = trainer._cancel_event = None
+
+    report = trainer.train_all_games(["quickdraw", "pick3", "take5", "unknown"])
+
+    assert [item["game"] for item in report["results"]] == ["quickdraw", "pick3", "take5", "unknown"]
+    assert report["finish_order"][-1] == "quickdraw"
+    assert set(report["finish_order"][:2]) == {"take5", "pick3"}
+    assert report["workers"] == 2 and trainer.n_estimators == 250
+    assert len({id(item) for item in seen.values()}) == 4 and trainer not in seen.values()
+    assert report["wall_time_s"] < 0.3 + 0.05 * 3
+    assert report["cpu_time_s"] >= 0 and all("wall_time_s" in item for item in report["results"])
+
+
+def test_games_run_one_at_a_time_when_memory_is_short(monkeypatch):
+    from services import trainer as trainer_module
+
+    monkeypatch.setattr(draw_counts, "get_draw_count", lambda game, default=0: 1)
+    monkeypatch.delenv("TRAIN_ALL_WORKERS", raising=False)
+    monkeypatch.setattr(trainer_module.fit_pool, "workers", 4)
+    monkeypatch.setattr(trainer_module, "available_memory_bytes", lambda: 1)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_train(self, game, **_):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return {"status": "success", "game": game}
+
+    monkeypatch.setattr(TrainerService, "train", fake_train)
+    trainer = TrainerService.__new__(TrainerService)
+    trainer._progress_callback = trainer._cancel_event = None
+
+    report = trainer.train_all_games(["pick3", "take5", "powerball"])
+
+    assert report["workers"] == 3 and peak[0] == 1
+    assert all(item["cpu_time_s"] >= 0 for item in report["results"])
+
+
+def test_measured_footprint_is_scaled_by_draw_count(monkeypatch):
+    import numpy as np
+
+    from services import trainer as trainer_module
+
+    sizes = {"pick3": 1_000, "take5": 1_000, "powerball": 1_000, "quickdraw": 100_000}
+    monkeypatch.setattr(draw_counts, "get_draw_count", lambda game, default=0: sizes[game])
+    monkeypatch.setenv("TRAIN_ALL_WORKERS", "4")
+    monkeypatch.setattr(trainer_module, "available_memory_bytes", lambda: 2**30)
+    running, overlaps = set(), {}
+    lock = threading.Lock()
+
+    def fake_train(self, game, **_):
+        with lock:
+            running.add(game)
+            for other in running:
+                overlaps.setdefault(other, set()).update(running - {other})
+        held = np.ones(5_000_000)  # 40 MB for a 1,000-draw game
+        time.sleep(0.15)
+        del held
+        with lock:
+            running.discard(game)
+        return {"status": "success", "game": game}
+
+    monkeypatch.setattr(TrainerService, "train", fake_train)
+    trainer = TrainerService.__new__(TrainerService)
+    trainer._progress_callback = trainer._cancel_event = None
+
+    trainer.train_all_games(list(sizes))
+
+    # 40 MB per 1,000 draws puts quickdraw near 4 GB, so it never shares the 0.7 GB budget.
+    assert not overlaps.get("quickdraw")
+    assert any(overlaps.get(game) for game in ("take5", "powerball"))
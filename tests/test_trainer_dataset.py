@@ -0,0 +1,68 @@
+"""Tests for the trainer's vectorized supervised dataset."""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.trainer import TrainerService
+
+
+def _loop_dataset(sequences, window):
+    """The original nested-loop construction, kept as the reference."""
+    output_len = max(len(seq) for seq in sequences)
+    X, y = [], []
+    for index in range(window, len(sequences)):
+        features = []
+        for seq in sequences[index - window:index]:
+            features.extend(list(seq[:output_len]) + [0] * (output_len - len(seq)))
+        X.append(features)
+        y.append(list(sequences[index]) + [0] * (output_len - len(sequences[index])))
+    return np.array(X), np.array(y)
+
+
+def test_lagged_views_match_loop_construction_without_copying():
+    rng = random.Random(3)
+    sequences = [[rng.randint(1, 69) for _ in range(rng.choice((5, 6)))] for _ in range(60)]
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.window_size = 3
+
+    for window in (1, 3, 8):
+        X, y, feature_len, output_len = trainer._build_supervised_dataset(sequences, window)
+        expected_X, expected_y = _loop_dataset(sequences, window)
+        assert X.dtype == np.float32 and (feature_len, output_len) == (6 * window, 6)
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+        assert np.shares_memory(X, y) and not X.flags.writeable
+
+        X_train, X_val, _, _ = trainer._chronological_split(X, y, 0.25)
+        assert np.shares_memory(X_train, X) and np.shares_memory(X_val, X)
+
+
+def test_feature_vector_pads_missing_history_at_the_front():
+    vector = TrainerService.build_feature_vector([[1, 2, 3], [4, 5]], window_size=3, feature_len=9)
+    assert vector.tolist() == [0, 0, 0, 1, 2, 3, 4, 5, 0]
+    assert TrainerService.build_feature_vector([], 3, 9).size == 0
+
+
+def test_warm_start_attempts_grow_one_forest_and_score_like_predict():
+    rng = np.random.default_rng(0)
+    X = rng.random((3200, 12), dtype=np.float32)
+    y = rng.random((3200, 2))
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.n_estimators, trainer.max_depth, trainer.random_state = 50, 30, 42  # depth capped at 16
+
+    attempts = list(trainer._warm_start_attempts(X[:3000], y[:3000], X[3000:], y[3000:], y, 4))
+
+    assert [attempt for attempt, *_ in attempts] == [1, 2, 3, 4]
+    assert [model.n_estimators for _, model, *_ in attempts] == [50, 70, 90, 110]
+    first, last = attempts[0][1], attempts[-1][1]
+    assert last.estimators_[:50] == first.estimators_  # later attempts only added trees
+    for _, model, _, _, predictions in attempts:
+        np.testing.assert_allclose(model.predict(X[3000:]), predictions, rtol=1e-6)
@@ -0,0 +1,137 @@
+"""Tests for background training jobs: progress, persistence and cancellation."""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.trainer import TrainerService
+from services.training_search import successive_halving
+from state import training_jobs
+
+
+def _isolate(monkeypatch, tmp_path):
+    monkeypatch.setattr(training_jobs, "_jobs_file", tmp_path / "training_jobs.json")
+    monkeypatch.setattr(training_jobs, "_jobs", {})
+    monkeypatch.setattr(training_jobs, "_cancel_events", {})
+    monkeypatch.setattr(training_jobs, "_loaded", True)
+
+
+def _wait_for(job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = training_jobs.get_training_job(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {statuses}: {job}")
+
+
+def test_job_reports_progress_and_cancels_at_the_next_attempt(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    reported = threading.Event()
+
+    def run(progress_callback, cancel_event):
+        attempt = 0
+        while not cancel_event.is_set():
+            attempt += 1
+            progress_callback({"phase": "search", "attempt": attempt, "total_attempts": 1000,
+                               "best_accuracy": 0.5, "eta_s": 3.0})
+            reported.set()
+            time.sleep(0.01)
+        return {"status": "success", "highest_accuracy": 0.5, "cancelled": True}
+
+    job = training_jobs.submit_training_job("pick3", run, params={"max_iterations": 40})
+    assert job["status"] == "queued" and job["params"] == {"max_iterations": 40}
+    assert reported.wait(5)
+
+    running = training_jobs.get_training_job(job["job_id"])
+    assert running["status"] == "running" and running["phase"] == "search"
+    assert running["attempt"] >= 1 and running["best_accuracy"] == 0.5 and running["eta_s"] == 3.0
+
+    assert training_jobs.cancel_training_job(job["job_id"]) == "cancelling"
+    finished = _wait_for(job["job_id"], ("cancelled",))
+    assert finished["result"]["highest_accuracy"] == 0.5  # best candidate is kept
+    assert training_jobs.cancel_training_job(job["job_id"]) == "finished"
+    assert training_jobs.cancel_training_job("missing") == "not_found"
+
+    saved = json.loads((tmp_path / "training_jobs.json").read_text())
+    assert saved[job["job_id"]]["status"] == "cancelled"
+    assert "result" not in training_jobs.list_training_jobs("pick3")[0]
+
+
+def test_jobs_left_running_load_as_interrupted(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    (tmp_path / "training_jobs.json").write_text(json.dumps({
+        "a1": {"job_id": "a1", "game": "pick3", "status": "running"},
+        "b2": {"job_id": "b2", "game": "pick3", "status": "completed"},
+    }))
+    monkeypatch.setattr(training_jobs, "_loaded", False)
+
+    assert training_jobs.get_training_job("a1")["status"] == "error"
+    assert training_jobs.get_training_job("b2")["status"] == "completed"
+
+
+def test_search_stops_when_asked_and_reports_each_fit():
+    rng = np.random.default_rng(5)
+    X = rng.integers(1, 40, (300, 12)).astype(np.float32)
+    y = np.column_stack([X[:, -4], X[:, -3]]).astype(float)
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.n_estimators, trainer.max_depth, trainer.random_state = 50, 8, 42
+    updates = []
+
+    result = successive_halving(
+        trainer, X, y, [0.25, 0.33], max_attempts=6,
+        progress=updates.append, should_stop=lambda: len(updates) >= 4,
+    )
+
+    # The rung leader is finished as one full fit, so the cancel still yields a model.
+    assert result["summary"]["stopped"] == "cancelled" and result["summary"]["fits"] == 5
+    finalists = [item for group in result["candidates"].values() for item in group]
+    assert len(finalists) == 1 and finalists[0]["resource"] == 1.0
+    assert [update["attempt"] for update in updates] == [1, 2, 3, 4, 5]
+    assert all(update["total_attempts"] >= 12 and update["eta_s"] >= 0 for update in updates)
+
+
+def test_job_keeps_its_hooks_while_a_sync_train_runs(monkeypatch):
+    from routes import training as training_routes
+
+    job_started, sync_done = threading.Event(), threading.Event()
+    updates = []
+
+    def fake_train(self, game, progress_callback=None, cancel_event=None, **overrides):
+        self._progress_callback, self._cancel_event = progress_callback, cancel_event
+        try:
+            if progress_callback is not None:
+                job_started.set()
+                assert sync_done.wait(5)
+                self._report_progress("search", attempt=1)
+                return {"status": "cancelled" if self._cancel_requested() else "error", "message": "done"}
+            return {"status": "error", "message": "sync"}
+        finally:
+            self._progress_callback = self._cancel_event = None
+
+    monkeypatch.setattr(TrainerService, "train", fake_train)
+    request = training_routes.TrainingRequest(game="pick3")
+    cancel_event = threading.Event()
+    cancel_event.set()
+    outcome = {}
+    job = threading.Thread(target=lambda: outcome.update(
+        training_routes._execute_training(request, "pick3", updates.append, cancel_event)
+    ))
+    job.start()
+    assert job_started.wait(5)
+    training_routes._execute_training(request, "pick3")  # a sync /api/train on the singleton
+    sync_done.set()
+    job.join(5)
+
+    assert updates == [{"phase": "search", "attempt": 1}]
+    assert outcome["status"] == "cancelled"
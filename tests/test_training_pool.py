@@ -0,0 +1,147 @@
+"""Tests for process-pool forest fits over memory-mapped training data."""
+
+import os
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.trainer import TrainerService
+from services.training_pool import FitPool, fit_forest
+from services.training_search import successive_halving
+
+
+def _dataset(rows=300):
+    rng = np.random.default_rng(11)
+    X = rng.integers(1, 40, (rows, 12)).astype(np.float32)
+    y = np.column_stack([X[:, -4], X[:, -3] + rng.integers(0, 3, rows)]).astype(float)
+    return X, y
+
+
+def _task(seed):
+    params = {"n_estimators": 12, "max_depth": 6, "random_state": seed, "n_jobs": 1}
+    return {"seed": seed, "params": params, "train": (0, 240), "val": (240, 300)}
+
+
+def test_pool_fits_match_in_process_fits_and_measure_memory(tmp_path):
+    X, y = _dataset()
+    pool = FitPool(workers=2, memory_fraction=0.5)
+    pool.shared_dir = str(tmp_path)
+    try:
+        with pool.share(X, y) as dataset:
+            assert all(os.path.exists(path) for path in dataset.paths)
+            outcomes = {task["seed"]: result for task, result in pool.fit_many(dataset, [_task(s) for s in (1, 2, 3)])}
+        assert not any(tmp_path.iterdir())  # shared files are removed with the block
+
+        assert sorted(outcomes) == [1, 2, 3]
+        for seed, outcome in outcomes.items():
+            expected = fit_forest(X, y, _task(seed))["predictions"]
+            np.testing.assert_allclose(outcome["predictions"], expected)
+        assert pool.peak_rss > 0 and 1 <= pool.concurrency() <= 2
+    finally:
+        pool._reset_executor()
+
+
+def test_admission_stops_new_fits_and_search_runs_on_the_pool(tmp_path):
+    X, y = _dataset()
+    serial = FitPool(workers=1)
+    with serial.share(X, y) as dataset:
+        assert dataset.paths is None
+        seen = [task["seed"] for task, _ in serial.fit_many(dataset, [_task(s) for s in (1, 2, 3)],
+                                                            admit=lambda task: task["seed"] < 3)]
+    assert seen == [1, 2]
+
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.n_estimators, trainer.max_depth, trainer.random_state = 50, 8, 42
+    pool = FitPool(workers=2)
+    pool.shared_dir = str(tmp_path)
+    try:
+        result = successive_halving(trainer, X, y, [0.25, 0.33], max_attempts=6, pool=pool)
+    finally:
+        pool._reset_executor()
+    assert result["summary"]["fits"] >= 12
+    assert result["candidates"]
+
+
+def test_concurrent_callers_share_the_fit_slots():
+    import threading
+
+    X, y = _dataset()
+    pool = FitPool(workers=1)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    original = pool._acquire_slot
+
+    def tracking_acquire(block):
+        claimed = original(block)
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        return claimed
+
+    def tracking_release():
+        with lock:
+            active[0] -= 1
+        FitPool._release_slot(pool)
+
+    pool._acquire_slot, pool._release_slot = tracking_acquire, tracking_release
+
+    def search():
+        with pool.share(X, y) as dataset:
+            list(pool.fit_many(dataset, [_task(s) for s in (1, 2)]))
+
+    threads = [threading.Thread(target=search) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 1 and pool._in_flight == 0
+
+
+def test_broken_pool_falls_back_for_one_call_and_recovers(tmp_path):
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenExecutor:
+        def submit(self, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, **kwargs):
+            pass
+
+    X, y = _dataset()
+    pool = FitPool(workers=2)
+    pool.shared_dir = str(tmp_path)
+    pool._executor = BrokenExecutor()
+    try:
+        with pool.share(X, y) as dataset:
+            fallback = {task["seed"]: result for task, result in pool.fit_many(dataset, [_task(s) for s in (1, 2, 3)])}
+            assert sorted(fallback) == [1, 2, 3] and all(fallback.values())
+            assert pool.workers == 2 and pool._executor is None and pool._in_flight == 0
+
+            recovered = list(pool.fit_many(dataset, [_task(4)]))
+        assert recovered[0][1]["peak_rss"] > 0 and pool._executor is not None
+    finally:
+        pool._reset_executor()
+
+
+def test_rss_sampler_measures_the_block_not_the_process_lifetime_peak():
+    from services.training_pool import RssSampler
+
+    earlier = np.ones(40_000_000)  # 320 MB, freed before the block
+    del earlier
+    with RssSampler(interval_s=0.01) as idle:
+        time.sleep(0.05)
+    with RssSampler(interval_s=0.01) as busy:
+        held = np.ones(10_000_000)  # 80 MB
+        time.sleep(0.05)
+    del held
+    assert idle.peak < 50 * 2**20 and busy.peak >= 60 * 2**20
@@ -0,0 +1,70 @@
+"""Tests for the successive-halving training search."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from services.trainer import TrainerService
+from services.training_search import _rung_resources, successive_halving
+
+
+def _trainer():
+    trainer = TrainerService.__new__(TrainerService)
+    trainer.n_estimators, trainer.max_depth, trainer.random_state = 50, 8, 42
+    return trainer
+
+
+def _dataset(rows=400):
+    rng = np.random.default_rng(5)
+    X = rng.integers(1, 40, (rows, 12)).astype(np.float32)
+    y = np.column_stack([X[:, -4] + rng.integers(0, 3, rows), X[:, -3]]).astype(float)
+    return X, y
+
+
+def test_rungs_end_at_full_resource_with_finalists_left():
+    assert _rung_resources(160, 3) == [1 / 81, 1 / 27, 1 / 9, 1 / 3, 1.0]
+    assert _rung_resources(3, 3) == [1.0]
+
+
+def test_search_promotes_few_configs_to_full_fits():
+    X, y = _dataset()
+    result = successive_halving(_trainer(), X, y, [0.25, 0.33], max_attempts=12, plateau_tol=-1.0)
+    summary = result["summary"]
+
+    assert summary["configs"] == 24
+    assert summary["fits"] < 24 * 2
+    assert [rung["configs"] for rung in summary["rungs"]] == [24, 8, 3]
+    assert summary["rungs"][-1]["resource"] == 1.0
+    finalists = [item for group in result["candidates"].values() for item in group]
+    assert len(finalists) == 3 and all(item["resource"] == 1.0 for item in finalists)
+    for group in result["candidates"].values():
+        accuracies = [item["accuracy"] for item in group]
+        assert accuracies == sorted(accuracies, reverse=True)
+
+
+def test_search_stops_at_target_and_within_the_time_budget():
+    X, y = _dataset()
+    reached = successive_halving(_trainer(), X, y, [0.25], max_attempts=9, target_accuracy=0.1)
+    # The config that hit the target is promoted to a full fit before it is returned.
+    assert reached["summary"]["stopped"] == "target" and reached["summary"]["fits"] == 2
+    finalist = reached["candidates"][0.25][0]
+    assert finalist["resource"] == 1.0
+
+    budgeted = successive_halving(_trainer(), X, y, [0.25, 0.33], max_attempts=40, time_budget_s=1.0)
+    assert budgeted["summary"]["stopped"] == "time_budget"
+    assert budgeted["summary"]["elapsed_s"] <= 1.0
+    finalists = [item for group in budgeted["candidates"].values() for item in group]
+    assert all(item["resource"] == 1.0 for item in finalists)
+
+
+def test_search_with_no_time_for_a_full_fit_returns_no_candidates():
+    X, y = _dataset()
+    result = successive_halving(_trainer(), X, y, [0.25], max_attempts=9, time_budget_s=1e-6)
+    assert result["summary"]["stopped"] == "time_budget"
+    assert result["summary"]["fits"] == 0 and result["candidates"] == {}